@@ -5,7 +5,8 @@ a = Analysis(
     ['src/main.py'],
     pathex=[],
     binaries=[],
-    datas=[('audio', 'audio'), ('images', 'images'), ('font', 'font'), ('shaders', 'shaders')],
+    # images ship pre-scaled in one file, build it first with `uv run src/bundle.py`
+    datas=[('audio', 'audio'), ('images.bundle', '.'), ('font', 'font'), ('shaders', 'shaders')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
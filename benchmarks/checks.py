@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# Correctness checks, run before the benchmarks and in CI. Each one raises AssertionError when it fails.
+#   uv run benchmarks/checks.py
+import os, sys
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import time, traceback
+import numpy as np
+from typing import Callable
+from gravity import force_errors
+import phybody
+from match import Match
+from batch import Bot
+from headless import run_match
+from replay import Replay, play
+
+def bots_play(match: Match, game_time: int):
+    left, right = Bot(True), Bot(False)
+    run_match(game_time, controller=lambda match: left(match) + right(match), match=match)
+
+def check_replay_after_reset():
+    # the game window resets its match between games, a replay always starts from a new one.
+    # the first match has the bots use their power ups, so clones and coins are left over for reset to clear
+    match = Match(60, seed=1)
+    bots_play(match, 60)
+    assert match.world.free_rows, "the first match should leave freed clone rows behind"
+
+    match.reset(seed=2)
+    recording = Replay(match.seed, {"game_time": 60, "physics_hz": 120})
+    match.record = recording.record
+    bots_play(match, 60)
+    recording.steps = match.steps
+
+    replayed = play(Replay.from_bytes(recording.to_bytes()))
+    assert (replayed.gameplay.left_score, replayed.gameplay.right_score) == (match.gameplay.left_score, match.gameplay.right_score), "scores differ"
+    assert replayed.world.count == match.world.count, "world rows differ"
+    assert np.array_equal(replayed.world.pos[:replayed.world.count], match.world.pos[:match.world.count]), "body positions differ"
+
+def check_scalar_step():
+    # a handful of bodies are stepped in plain floats, the same match with only the array code has to end the same
+    # to the last bit. the bots' power ups bring in clones, so both paths take turns during the match
+    def world_after() -> bytes:
+        match = Match(60, seed=3)
+        bots_play(match, 60)
+        return match.world.pos[:match.world.count].tobytes() + match.world.velocity[:match.world.count].tobytes()
+
+    scalar = world_after()
+    limit, phybody.SCALAR_LIMIT = phybody.SCALAR_LIMIT, 0
+    try:
+        arrays = world_after()
+    finally:
+        phybody.SCALAR_LIMIT = limit
+    assert scalar == arrays, "the plain float step and the array step ended the match apart"
+
+def check_barnes_hut_accuracy():
+    # a cell that isn't opened pulls as one point mass per sign at that sign's centre of mass, so the first order
+    # term of the error cancels and what is left shrinks with (cell size / distance)^2 < theta^2, in proportion to
+    # the cell's pull. summed over the cells the error stays below some c * theta^2 * sum of |m| / d^2
+    thetas = (0.7, 0.5, 0.3, 0.2)
+    errors = force_errors(thetas)
+
+    # c sits at 0.03 to 0.05 for the 99th percentile
+    for theta in thetas:
+        p99 = float(np.quantile(errors[theta], 0.99))
+        assert p99 <= theta ** 2 / 10, f"p99 error {p99:.2e} at theta {theta} is above theta^2 / 10"
+
+    # and it has to fall at least that fast as theta shrinks (it does with theta^2.4 to theta^2.6). an error that is
+    # first order, like a centre of mass 2% of a cell off, drags that below 2
+    for wide, narrow in zip(thetas, thetas[1:]):
+        order = np.log(np.median(errors[wide]) / np.median(errors[narrow])) / np.log(wide / narrow)
+        assert order >= 2, f"median error falls with theta^{order:.2f} from theta {wide} to {narrow}, expected about theta^2"
+
+CHECKS: list[Callable[[], None]] = [
+    check_barnes_hut_accuracy,
+    check_replay_after_reset,
+    check_scalar_step,
+]
+
+def run_checks() -> list[str]:
+    # names of the checks that failed, each one's traceback is printed as it fails
+    failed = []
+    for check in CHECKS:
+        start = time.perf_counter()
+        try:
+            check()
+        except AssertionError:
+            traceback.print_exc()
+            failed.append(check.__name__)
+            print(f"{check.__name__:<28} FAILED")
+            continue
+        print(f"{check.__name__:<28} ok   {time.perf_counter() - start:6.2f} s")
+    return failed
+
+if __name__ == "__main__":
+    sys.exit(1 if run_checks() else 0)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# Drives GravClient through scripted scenarios with no window and no sound, and compares frame times to a baseline.
+#   uv run benchmarks/run.py                      run the checks and everything, fail on a failed check or regression
+#   uv run benchmarks/run.py --update-baseline    store this machine's numbers as the new baseline
+#   uv run benchmarks/run.py --scenario match --render-threads 0,1,2,3    speedup of drawing the viewports on threads
+# Baselines only mean something on the machine they were recorded on. A new one is recorded on committed code and
+# goes in a commit of its own that says why, never in the commit whose speed it measures.
+import os, sys
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+os.environ['SDL_VIDEODRIVER'] = "dummy"
+os.environ['SDL_AUDIODRIVER'] = "dummy"
+
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame, json, time, random, argparse, subprocess
+import numpy as np
+from typing import Callable, NamedTuple
+from main import GravClient, States
+from gameplay import PowerUp
+from eventbus import SimEvent
+from profiler import FrameProfiler
+from checks import run_checks
+import userevents
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+PHASE_FLOOR = 0.2 # ms, phases shorter than this on average are mostly timer noise
+
+CONFIG = {
+    "color": [228, 93, 37],
+    "opposite_color": [37, 140, 228],
+    "postprocess": 0, # the dummy driver has no GL context
+    "volume": 0.0,
+    "game_time": 1200,
+    "physics_hz": 120,
+    "minimap_hz": 0,
+    "record_replays": 0
+}
+
+DT = 1 / 60 # every frame advances the game by the same amount, so runs are comparable
+WARMUP = 30
+
+class Scenario(NamedTuple):
+    name: str
+    frames: int
+    setup: Callable[[GravClient], None]
+    per_frame: Callable[[GravClient, int], None]
+
+def key(key: int, down: bool):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN if down else pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+
+def start_match(client: GravClient):
+    client.change_state(States.GAME_SCREEN_S)
+    key(pygame.K_d, True)
+    key(pygame.K_UP, True)
+
+def steer(client: GravClient, frame: int):
+    # both players switch direction every two seconds so the ball keeps moving between them
+    if frame % 120 == 0 and frame:
+        forward = (frame // 120) % 2 == 0
+        key(pygame.K_d, forward)
+        key(pygame.K_a, not forward)
+        key(pygame.K_UP, forward)
+        key(pygame.K_DOWN, not forward)
+
+def start_quantum(client: GravClient):
+    start_match(client)
+    for left_player in (True, False):
+        if left_player:
+            client.gameplay.left_power = PowerUp.Quantum, client.gameplay.timer
+        else:
+            client.gameplay.right_power = PowerUp.Quantum, client.gameplay.timer
+        client.match.bus.post(SimEvent(userevents.POWER_UP_GAIN_EVENT, left_player=left_player, power=PowerUp.Quantum))
+
+def scroll_about(client: GravClient, frame: int):
+    pygame.event.post(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1 if (frame // 20) % 2 == 0 else 1, flipped=False))
+
+SIZES = ((1300, 700), (1000, 600), (1600, 900))
+
+def resize(client: GravClient, frame: int):
+    if frame % 15 == 0:
+        size = SIZES[(frame // 15) % len(SIZES)]
+        pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, size=size, w=size[0], h=size[1]))
+
+SCENARIOS = (
+    Scenario("main_menu", 600, lambda client: None, lambda client, frame: None),
+    Scenario("match", 1200, start_match, steer),
+    Scenario("quantum", 360, start_quantum, steer), # inside the 10 s Quantum window, 70 clones per player
+    Scenario("about_scroll", 600, lambda client: client.change_state(States.ABOUT_S), scroll_about),
+    Scenario("resize", 300, start_match, resize),
+)
+
+def run(scenario: Scenario, render_threads: int = 0) -> dict:
+    random.seed(0)
+    pygame.event.clear()
+
+    client = GravClient(SET_FPS=0, config=CONFIG | {"render_threads": render_threads})
+    client.delta = DT
+    scenario.setup(client)
+
+    for frame in range(WARMUP):
+        scenario.per_frame(client, frame)
+        client.frame()
+        client.delta = DT
+
+    client.profiler = FrameProfiler(capacity=scenario.frames)
+    client.world.lap = client.profiler.lap
+
+    times = np.zeros(scenario.frames)
+    for frame in range(scenario.frames):
+        scenario.per_frame(client, WARMUP + frame)
+        start = time.perf_counter()
+        client.frame()
+        times[frame] = (time.perf_counter() - start) * 1000
+        client.delta = DT
+    if client.render_pool is not None:
+        client.render_pool.shutdown()
+
+    p50, p95, p99 = np.percentile(times, (50, 95, 99))
+    phases = client.profiler.summary()
+    return {
+        "frames": scenario.frames,
+        "fps": round(scenario.frames / (times.sum() / 1000), 1),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "phases": {name: stats["mean"] for name, stats in phases.items() if name != "frame" and stats["mean"] > 0}
+    }
+
+def thread_counts(text: str) -> list[int]:
+    # "0,2,4" -> [0, 2, 4]
+    try:
+        counts = [int(count) for count in text.split(",")]
+    except ValueError:
+        counts = []
+    if not counts or min(counts) < 0:
+        raise argparse.ArgumentTypeError("expected comma separated thread counts, 0 draws on the main thread")
+    return counts
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    failed = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for stat in ("p50", "p95"):
+            limit = baseline[name][stat] * (1 + tolerance)
+            if result[stat] > limit:
+                failed.append(f"{name} {stat} {result[stat]:.2f} ms > {limit:.2f} ms (baseline {baseline[name][stat]:.2f} ms + {tolerance:.0%})")
+
+        # drawing takes most of a frame, a physics step twice as slow can still fit in the frame times
+        for phase, mean in baseline[name]["phases"].items():
+            limit = mean * (1 + tolerance)
+            if mean >= PHASE_FLOOR and result["phases"].get(phase, 0) > limit:
+                failed.append(f"{name} {phase} {result['phases'][phase]:.2f} ms > {limit:.2f} ms (baseline {mean:.2f} ms + {tolerance:.0%})")
+    return failed
+
+def uncommitted_changes() -> list[str]:
+    # tracked files changed since the last commit, besides the baseline itself. empty outside a git checkout
+    root = BASELINE.parent.parent
+    status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True)
+    if status.returncode != 0:
+        return []
+    return [line[3:] for line in status.stdout.splitlines() if Path(line[3:]) != BASELINE.relative_to(root)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GravBall frame time benchmarks")
+    parser.add_argument("--scenario", action="append", choices=[scenario.name for scenario in SCENARIOS], help="run only these, can be repeated")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown over the baseline before failing")
+    parser.add_argument("--output", type=Path, help="write the results here as JSON")
+    parser.add_argument("--update-baseline", action="store_true", help=f"store the results in {BASELINE.name} instead of comparing")
+    parser.add_argument("--render-threads", type=thread_counts, default=[0], help="run every scenario with each of these render_threads values (comma separated), "
+                                                                                 "the ones after the first also print their speedup over it")
+    args = parser.parse_args()
+
+    if args.update_baseline and (changed := uncommitted_changes()):
+        print("commit these first, a new baseline goes in a commit of its own:", *changed, sep="\n  ")
+        sys.exit(1)
+
+    # frame times of a game that plays out wrong don't mean much
+    if run_checks():
+        sys.exit(1)
+
+    if len(args.render_threads) > 1:
+        gil = sys._is_gil_enabled() if hasattr(sys, "_is_gil_enabled") else True
+        print(f"{os.cpu_count()} cores, GIL {'enabled' if gil else 'disabled'}")
+
+    results = {}
+    for scenario in SCENARIOS:
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        first = None
+        for render_threads in args.render_threads:
+            # the first count keeps the scenario's own name, so it is the one compared to the baseline
+            name = scenario.name if first is None else f"{scenario.name}/{render_threads}t"
+            results[name] = result = run(scenario, render_threads)
+            speedup = f"   x{first['p50'] / result['p50']:.2f}" if first is not None else ""
+            print(f"{name:<14} {result['fps']:8.1f} fps   p50 {result['p50']:7.2f}   p95 {result['p95']:7.2f}   p99 {result['p99']:7.2f} ms{speedup}")
+            first = first or result
+
+    pygame.quit()
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+        baseline.update(results)
+        BASELINE.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"baseline written to {BASELINE}")
+        sys.exit(0)
+
+    if not BASELINE.exists():
+        print("no baseline yet, run with --update-baseline first")
+        sys.exit(0)
+
+    failed = regressions(results, json.loads(BASELINE.read_text()), args.tolerance)
+    for line in failed:
+        print("REGRESSION", line)
+    sys.exit(1 if failed else 0)
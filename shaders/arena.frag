@@ -0,0 +1,55 @@
+#version 330 core
+
+// what ArenaCache and the wall pulse in game_draw draw, worked out per pixel of one viewport
+
+// CameraSystem of the viewport: CAM_CENTER_ON, SCALE, (width//2, height//2) and where the viewport starts on the frame
+uniform vec2 camCenter;
+uniform float scale;
+uniform vec2 halfSize;
+uniform vec2 viewportStart;
+// the frame is drawn this much smaller than the window, everything above is in window pixels
+uniform float renderScale;
+
+uniform vec4 voids; // left, right, top, bottom
+uniform vec2 courtSizes; // left, right
+uniform vec2 pulse; // how far into the court the left and right pulse reach, world units
+uniform float pulseOpacity;
+
+uniform vec3 voidColor;
+uniform vec3 leftColor;
+uniform vec3 rightColor;
+uniform vec3 baseColor;
+
+out vec4 f_color;
+
+// calc_pos_x / calc_pos_y, truncated like the rectangles pygame fills
+float screenX(float x) {
+    return trunc((camCenter.x + x) * scale + halfSize.x);
+}
+
+float screenY(float y) {
+    return trunc((camCenter.y - y) * scale + halfSize.y);
+}
+
+void main() {
+    // rows run top to bottom, like the viewport surfaces
+    vec2 pixel = floor(gl_FragCoord.xy / renderScale) - viewportStart;
+
+    float leftWall = screenX(voids.x + courtSizes.x);
+    float rightWall = screenX(voids.y - courtSizes.y);
+
+    if (pixel.x < screenX(voids.x) || pixel.x >= screenX(voids.y) || pixel.y < screenY(voids.z) || pixel.y >= screenY(voids.w)) {
+        f_color = vec4(voidColor, 1.0);
+    } else if (pixel.x < leftWall) {
+        f_color = vec4(leftColor, 1.0);
+    } else if (pixel.x >= rightWall) {
+        f_color = vec4(rightColor, 1.0);
+    } else if (pixel.x < screenX(voids.x + courtSizes.x + pulse.x)) {
+        f_color = vec4(mix(baseColor, leftColor, pulseOpacity), 1.0);
+    } else if (pixel.x >= screenX(voids.y - courtSizes.y - pulse.y)) {
+        f_color = vec4(mix(baseColor, rightColor, pulseOpacity), 1.0);
+    } else {
+        // the court, whatever was drawn under it (the glows) stays
+        discard;
+    }
+}
@@ -0,0 +1,15 @@
+#version 330 core
+
+uniform float opacity;
+
+in vec2 local;
+in float circleRadius;
+in vec4 circleColor;
+out vec4 f_color;
+
+void main() {
+    if (dot(local, local) > circleRadius * circleRadius) {
+        discard;
+    }
+    f_color = vec4(circleColor.rgb, circleColor.a * opacity);
+}
@@ -0,0 +1,35 @@
+#version 330 core
+
+// CameraSystem of the viewport being drawn: CAM_CENTER_ON, SCALE and where its centre is on the frame
+uniform vec2 camCenter;
+uniform float scale;
+uniform vec2 origin;
+uniform vec2 frameSize;
+// the frame is drawn this much smaller than the window, positions and sizes above are in window pixels
+uniform float renderScale;
+
+in vec2 corner;
+
+// per circle
+in vec2 center;
+in float radius;
+in float minRadius;
+in vec4 color;
+
+out vec2 local;
+out float circleRadius;
+out vec4 circleColor;
+
+void main() {
+    // calc_pos_x / calc_pos_y
+    vec2 screen = (origin + vec2(camCenter.x + center.x, camCenter.y - center.y) * scale) * renderScale;
+    circleRadius = max(radius * scale, minRadius) * renderScale;
+
+    // a quad one pixel bigger than the circle, the fragment shader cuts the circle out of it
+    local = corner * (circleRadius + 1.0);
+    vec2 pixel = screen + local;
+
+    // rows top to bottom, like the layers
+    gl_Position = vec4(pixel / frameSize * 2.0 - 1.0, 0.0, 1.0);
+    circleColor = color;
+}
@@ -0,0 +1,33 @@
+#version 330 core
+#ifdef GL_ES
+   precision highp float;
+#endif
+
+// shader.frag with the curvature, scan lines and vignette read from the baked CRT mask, only the big scan line moves
+
+#define PI 3.14159265359
+
+uniform sampler2D tex;
+uniform sampler2D crtMask;
+uniform float bigScanLineOpacity;
+uniform float time;
+
+in vec2 uv;
+out vec4 f_color;
+
+vec4 bigScanLineIntensity(float uv_, float opacity)
+{
+    float intensity = sin(((uv_ * 2) * PI * 2.0) + 0.02 * time);
+    intensity = (intensity + 3)*0.25;
+    return vec4(vec3(intensity * (1 - opacity)), 1.0);
+}
+
+void main() {
+    // the mask was rendered with this quad into a framebuffer, so its rows run the other way
+    vec3 crt = texture(crtMask, vec2(uv.x, 1.0 - uv.y)).rgb;
+
+    vec4 baseColor = vec4(texture(tex, crt.rg).rgb * crt.b, 1.0);
+    baseColor *= bigScanLineIntensity(uv.y, bigScanLineOpacity);
+
+    f_color = baseColor;
+}
@@ -0,0 +1,58 @@
+#version 330 core
+#ifdef GL_ES
+   precision highp float;
+#endif
+
+// the parts of shader.frag that never change between frames, once per pixel of the CRT mask (see crt.py)
+
+#define PI 3.14159265359
+
+uniform vec2 curvature;
+uniform vec2 screenResolution;
+uniform vec2 scanLineOpacity;
+uniform float vignetteOpacity;
+uniform float brightness;
+uniform float vignetteRoundness;
+uniform float bigScanLineAverage; // 1.0 when the CRT pass draws the big scan line itself
+
+in vec2 uv;
+out vec4 f_color;
+
+float scanLineIntensity(float uv_, float resolution, float opacity)
+{
+    float intensity = sin(uv_ * resolution * PI * 2.0);
+    intensity = ((0.5 * intensity) + 0.5) * 0.9 + 0.1;
+    return pow(intensity, opacity);
+}
+
+vec2 curveRemapUV(vec2 uv_) {
+    // as we near the edge of our screen apply greater distortion using a cubic function
+    uv_ = uv_ * 2.0-1.0;
+    vec2 offset = abs(uv_.yx) / vec2(curvature.x, curvature.y);
+    uv_ = uv_ + uv_ * offset * offset;
+    uv_ = uv_ * 0.5 + 0.5;
+    return uv_;
+}
+
+float vignetteIntensity(vec2 uv_, vec2 resolution, float opacity, float roundness)
+{
+    float intensity = uv_.x * uv_.y * (1.0 - uv_.x) * (1.0 - uv_.y);
+    return clamp(pow((resolution.x / roundness) * intensity, opacity), 0.0, 1.0);
+}
+
+void main() {
+    vec2 remappedUV = curveRemapUV(vec2(uv.x, uv.y));
+
+    float intensity = scanLineIntensity(remappedUV.x, screenResolution.y, scanLineOpacity.x);
+    intensity *= scanLineIntensity(remappedUV.y, screenResolution.x, scanLineOpacity.y);
+    intensity *= vignetteIntensity(remappedUV, screenResolution, vignetteOpacity, vignetteRoundness);
+    intensity *= brightness * bigScanLineAverage;
+
+    // off the curved screen nothing comes through
+    if (remappedUV.x < 0.0 || remappedUV.y < 0.0 || remappedUV.x > 1.0 || remappedUV.y > 1.0) {
+        intensity = 0.0;
+    }
+
+    // rg: where the pixel samples the frame, b: how much of it comes through
+    f_color = vec4(remappedUV, intensity, 1.0);
+}
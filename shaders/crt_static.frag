@@ -0,0 +1,19 @@
+#version 330 core
+#ifdef GL_ES
+   precision highp float;
+#endif
+
+// crt.frag for the lowest CRT quality: the big scan line's average is baked into the mask too, nothing moves
+
+uniform sampler2D tex;
+uniform sampler2D crtMask;
+
+in vec2 uv;
+out vec4 f_color;
+
+void main() {
+    // the mask was rendered with this quad into a framebuffer, so its rows run the other way
+    vec3 crt = texture(crtMask, vec2(uv.x, 1.0 - uv.y)).rgb;
+
+    f_color = vec4(texture(tex, crt.rg).rgb * crt.b, 1.0);
+}
@@ -0,0 +1,12 @@
+#version 330 core
+
+uniform sampler2D tex;
+uniform float opacity;
+
+in vec2 uv;
+out vec4 f_color;
+
+void main() {
+    vec4 color = texture(tex, uv);
+    f_color = vec4(color.rgb, color.a * opacity);
+}
@@ -0,0 +1,10 @@
+#version 330 core
+
+in vec2 vert;
+out vec2 uv;
+
+void main() {
+    // row 0 of the texture goes to row 0 of the frame, both run top to bottom like the uploaded surfaces
+    uv = vert * 0.5 + 0.5;
+    gl_Position = vec4(vert, 0.0, 1.0);
+}
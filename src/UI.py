@@ -1,19 +1,23 @@
 import pygame
 from typing import Callable
 import audio_factory, helper
+from animation import Animation
+from assets import ASSETS
+import bundle
 
 SCREEN_SIZE = (1300, 700)
 
 button_width = 550
 button_height = 50
 
+# the main menu needs these two straight away, everything else in LAZY is made the first time it is used
 normal_font = pygame.font.Font(helper.resource_path('font/Broadway.ttf'), 30)
-semi_big_font = pygame.font.Font(helper.resource_path('font/Broadway.ttf'), 30 * 2)
 big_font = pygame.font.Font(helper.resource_path('font/Broadway.ttf'), 30 * 4)
-small_font = pygame.font.SysFont('Arial', 22)
+semi_big_font: pygame.font.Font
+small_font: pygame.font.Font
 
 NUMS: list[tuple[pygame.Surface, tuple[int, int]]] = []
-BIG_NUMS: list[tuple[pygame.Surface, tuple[int, int]]] = []
+BIG_NUMS: list[tuple[pygame.Surface, tuple[int, int]]]
 
 COLON_SYMB = normal_font.render(':' , True , (255, 255, 255))
 COLON_SYMB_SIZE = COLON_SYMB.get_size()
@@ -22,9 +26,14 @@ MAIN_TEXT = big_font.render('Grav Ball' , True , (255, 255, 255))
 PAUSED_TEXT = big_font.render('Paused' , True , (255, 255, 255))
 GAME_END_TEXT = big_font.render('Game Over' , True , (255, 255, 255))
 
-COLOR_WHEEL: pygame.Surface
-COLOR_WHEEL_RADIUS: int
-KEYS_IMAGE: dict[int, tuple[pygame.Surface, Callable[[], None], Callable[[], None]]] = {}
+IMAGES = bundle.IMAGES
+COLOR_WHEEL_SIZE = IMAGES["colorwheel.png"]
+COLOR_WHEEL_RADIUS = COLOR_WHEEL_SIZE[0]//2
+
+# pre-scaled pixels of IMAGES, None when it hasn't been built (the loose files are used then)
+BUNDLE = bundle.open_bundle(helper.resource_path(bundle.BUNDLE_FILE))
+# key -> (image asset, press, release)
+KEYS_IMAGE: dict[int, tuple[str, Callable[[], None], Callable[[], None]]] = {}
 
 set_anim_wall = 100
 set_anim_ball_revol_mainmenu = 300
@@ -36,13 +45,17 @@ OPENGL_BRIGHTNESS = 2
 
 class Sprite:
     def __init__(self, 
-                 image: pygame.Surface, 
+                 image: pygame.Surface|None, 
                  center_func: Callable[[float, float], tuple[float, float]],
                  width_height: tuple[float, float],
-                 is_text: bool
+                 is_text: bool,
+                 asset: str = "",
+                 size: tuple[int, int] = (0, 0)
                  ) -> None:
-        self.image: pygame.Surface = image
-        self.size = self.image.get_size()
+        # image None -> `asset` (of `size`) comes from the asset loader the first time the sprite is drawn
+        self.image: pygame.Surface|None = image
+        self.asset = asset
+        self.size = self.image.get_size() if self.image is not None else size
         self.center_func = center_func
         self.pos: tuple[float, float]
         self.is_text: bool = is_text
@@ -53,23 +66,26 @@ class Sprite:
     def import_image(
         cls,
         name: str,
-        width_height_image: tuple[int, int], 
         center_func: Callable[[float, float], tuple[float, float]],
         width_height: tuple[float, float],
         ) -> 'Sprite':
 
-        img = pygame.transform.scale(pygame.image.load(helper.resource_path(f"images/{name}")).convert_alpha(), width_height_image)
-        return cls(img, center_func, width_height, False)
+        return cls(None, center_func, width_height, False, image_asset(name), IMAGES[name])
+
+    def surface(self) -> pygame.Surface:
+        if self.image is None:
+            self.image = ASSETS.get(self.asset)
+        return self.image
 
     def resize(self, width: float, height: float):
         center_pos = self.center_func(width, height)
         self.pos = (center_pos[0] - self.size[0]//2, center_pos[1] - self.size[1]//2)
 
     def draw(self, display: pygame.Surface):
-        display.blit(self.image, self.pos)
+        display.blit(self.surface(), self.pos)
 
     def scroll_draw(self, display: pygame.Surface, offset: tuple[float, float]=(0, 0)):
-        display.blit(self.image, (self.pos[0] + offset[0], self.pos[1] + offset[1]))
+        display.blit(self.surface(), (self.pos[0] + offset[0], self.pos[1] + offset[1]))
 
 class Button:
     def __init__(self,
@@ -107,7 +123,7 @@ class Button:
             if pygame.mouse.get_pressed()[0] and not self.global_button_click[0] and not disable:
                 self.global_button_click[0] = True
                 self.callback()
-                audio_factory.AUDIO_LIBRARY["BUTTON_CLICK"].play()
+                audio_factory.play("BUTTON_CLICK")
             else:
                 color = (30, 30, 30)
 
@@ -120,68 +136,13 @@ class Button:
             if pygame.mouse.get_pressed()[0] and not self.global_button_click[0] and not disable:
                 self.global_button_click[0] = True
                 self.callback()
-                audio_factory.AUDIO_LIBRARY["BUTTON_CLICK"].play()
+                audio_factory.play("BUTTON_CLICK")
             else:
                 color = (30, 30, 30)
 
         pygame.draw.rect(display, color, self.bounding_box_rect.move(offset))
         display.blit(self.text, (self.text_pos[0] + offset[0], self.text_pos[1] + offset[1]))
 
-class Animation:
-    def __init__(self, min_: int, max_: int, speed: int = 1) -> None:
-        self.min: int = min_
-        self.max: int = max_
-        self.frame: int|float = min_
-        self.speed: int = speed
-        self.message = None
-
-    def update_add(self, delta, clamp: bool=False, wrap: bool=False):
-        #assert clamp ^ wrap or not (clamp or wrap)
-
-        val = delta * self.speed
-
-        if clamp:
-            if (self.frame + val) > self.max:
-                self.frame = self.max
-                return
-            elif (self.frame + val) < self.min:
-                self.frame = self.min
-                return
-        elif wrap:
-            if (self.frame + val) > self.max:
-                self.frame = self.min
-                return
-            elif (self.frame + val) < self.min:
-                self.frame = self.max
-                return
-
-        self.frame += val
-
-    def wrap(self):
-        if self.frame > self.max:
-            self.frame = self.min
-        elif self.frame < self.min:
-            self.frame = self.max
-
-    def clamp(self):
-        if self.frame > self.max:
-            self.frame = self.max
-        elif self.frame < self.min:
-            self.frame = self.min
-
-    def is_playing_within_top(self):
-        return self.frame < self.max
-    
-    def is_playing_after_down(self):
-        return self.frame > self.min
-
-    def is_playing(self):
-        return self.frame < self.max and self.frame > self.min
-
-    def set_message(self, msg, delta=0.0):
-        self.message = msg
-        self.update_add(delta)
-
 def multiple_texts(text:str, font: pygame.font.Font) -> pygame.Surface:
     renders: list[pygame.Surface] = []
     for line in text.split("\n"):
@@ -202,11 +163,20 @@ def multiple_texts(text:str, font: pygame.font.Font) -> pygame.Surface:
     return final_text
 
 class ScrollableWindow:
-    def __init__(self, items: list[Sprite|Button], width_height: tuple[float, float]) -> None:
+    # the sprites are composited once per size into one content surface, a frame copies the slice that is on screen.
+    # buttons stay live so they can still be hovered and clicked, and are only drawn / hit-tested when they are visible
+    def __init__(self, items: list[Sprite|Button], width_height: tuple[float, float], background: tuple[int, int, int]|None = None) -> None:
+        # background: what the window is drawn over, the content is composited onto it and copied opaque. None -> kept transparent
         self.items: list[Sprite|Button] = items
+        self.background = background
         self.scroll_length = 0
         self.first_scroll = 0
         self.last_scroll = -1
+
+        self.content: pygame.Surface|None = None
+        self.content_rect = pygame.Rect(0, 0, 0, 0) # where the content sits when scroll_length is 0
+        self.buttons: list[tuple[Button, int]] = [] # (button, y offset when scroll_length is 0)
+
         self.resize(*width_height)
 
     def resize(self, width, height):
@@ -234,6 +204,51 @@ class ScrollableWindow:
             self.last_scroll = int(total_height) - height//2 + self.items[-1].size[1]//2 + 50
         
         self.scroll(0)
+        self.composite()
+
+    def layout(self) -> list[tuple[Sprite|Button, tuple[int, int]]]:
+        # every item's offset from its own pos when scroll_length is 0: stacked 20px apart,
+        # text (and a sprite at the very end) lined up with the first text, everything else keeps its own x
+        left_align_pos = 0
+        match self.items:
+            case [val, *_] if isinstance(val, Sprite) and val.is_text:
+                left_align_pos = val.pos[0]
+
+        placed = []
+        total_height = 0
+        for i, item in enumerate(self.items):
+            last = i == len(self.items) - 1
+            if isinstance(item, Sprite) and (item.is_text or last):
+                placed.append((item, (int(-item.pos[0] + left_align_pos), total_height)))
+            else:
+                placed.append((item, (0, total_height)))
+
+            if not last:
+                total_height += item.size[1]//2 + self.items[i+1].size[1]//2 + 20
+        return placed
+
+    def composite(self):
+        sprites = []
+        self.buttons = []
+        for item, (x, y) in self.layout():
+            if isinstance(item, Button):
+                self.buttons.append((item, y))
+            else:
+                sprites.append((item, pygame.Rect(item.pos[0] + x, item.pos[1] + y, *item.size)))
+
+        if not sprites:
+            self.content = None
+            return
+
+        self.content_rect = sprites[0][1].unionall([rect for _, rect in sprites[1:]])
+        if self.background is None:
+            self.content = pygame.Surface(self.content_rect.size, pygame.SRCALPHA)
+        else:
+            self.content = pygame.Surface(self.content_rect.size)
+            self.content.fill(self.background)
+
+        for sprite, rect in sprites:
+            self.content.blit(sprite.surface(), rect.move(-self.content_rect.x, -self.content_rect.y))
 
     def scroll(self, amt: int) -> None:
         if (self.scroll_length + amt) < self.first_scroll:
@@ -247,30 +262,18 @@ class ScrollableWindow:
         self.scroll_length += amt
 
     def draw(self, display: pygame.Surface):
-        total_height = 0
-        left_align_pos = 0
-        
-        match self.items:
-            case [val, *_] if isinstance(val, Sprite) and val.is_text:
-                left_align_pos = val.pos[0]
-
-        for i in range(0, len(self.items)-1):
-            curr_item = self.items[i]
-            next_item = self.items[i+1]
-            
-            if isinstance(curr_item, Sprite) and curr_item.is_text:
-                curr_item.scroll_draw(display, offset=(-curr_item.pos[0] + left_align_pos, total_height - self.scroll_length))
-            else:
-                curr_item.scroll_draw(display, offset=(0, total_height - self.scroll_length))
+        view = display.get_rect()
 
-            total_height += curr_item.size[1]//2 + next_item.size[1]//2 + 20
+        if self.content is not None:
+            on_screen = self.content_rect.move(0, -self.scroll_length)
+            visible = on_screen.clip(view)
+            if visible:
+                display.blit(self.content, visible, visible.move(-on_screen.x, -on_screen.y))
 
-        match self.items:
-            case [*_, val]:
-                if isinstance(val, Sprite):
-                    val.scroll_draw(display, offset=(-val.pos[0] + left_align_pos, total_height - self.scroll_length))
-                elif isinstance(val, Button):
-                    val.scroll_draw(display, offset=(0, total_height - self.scroll_length))
+        for button, y in self.buttons:
+            offset = (0, y - self.scroll_length)
+            if button.bounding_box_rect.move(offset).colliderect(view):
+                button.scroll_draw(display, offset=offset)
 
 def hue_to_rbg(p, q, t):
     if t < 0: t += 1
@@ -308,25 +311,52 @@ def find_opp_color(color: pygame.Color) -> pygame.Color:
     new_rect = rotated_image.get_rect(center = image.get_rect(center = (x, y)).center)
     return rotated_image, new_rect.center """
 
+def load_image(name: str, alpha: int|None = None) -> pygame.Surface:
+    image = BUNDLE.surface(name, IMAGES[name]) if BUNDLE else None
+    if image is None:
+        image = bundle.scale_image(helper.resource_path(f"images/{name}"), IMAGES[name])
+    if alpha is not None:
+        image.set_alpha(alpha)
+    return image
+
+def image_asset(name: str, alpha: int|None = None) -> str:
+    # registers images/<name> at its IMAGES size with the asset loader, returns the asset's name
+    asset = f"images/{name}"
+    ASSETS.register(asset, lambda: load_image(name, alpha))
+    return asset
+
+def render_nums(font: pygame.font.Font) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+    nums = []
+    for i in range(0, 10):
+        num = font.render(str(i), True, (255, 255, 255))
+        num_size = num.get_size()
+        nums.append((num, num_size))
+    return nums
+
+# fonts are only ever made on the main thread, the background loader just finds Arial's file ahead of time
+ASSETS.register("font/Arial", lambda: pygame.font.match_font('Arial'))
+
+LAZY: dict[str, Callable[[], object]] = {
+    "semi_big_font": lambda: pygame.font.Font(helper.resource_path('font/Broadway.ttf'), 30 * 2),
+    "small_font": lambda: pygame.font.Font(ASSETS.get("font/Arial"), 22),
+    "BIG_NUMS": lambda: render_nums(lazy("semi_big_font")),
+}
+
+def lazy(name: str):
+    if name not in globals():
+        globals()[name] = LAZY[name]()
+    return globals()[name]
+
+def __getattr__(name: str):
+    # only called for names this module doesn't have yet (UI.small_font...), after that they are plain globals
+    if name not in LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return lazy(name)
+
 # used to load in images after starting up window, otherwise pygame wont allow
 def define(pygame_map: dict[str, tuple[int, Callable[[],None], Callable[[], None]]]):
-    global COLOR_WHEEL, COLOR_WHEEL_RADIUS
-    COLOR_WHEEL = pygame.transform.scale(pygame.image.load(helper.resource_path("images/colorwheel.png")).convert_alpha(), (400, 400))
-    COLOR_WHEEL_RADIUS = COLOR_WHEEL.get_width()//2
-
     for key_id, key_val in pygame_map.items():
-        key = pygame.image.load(helper.resource_path(f"images/keys/{key_id}_KEY.png")).convert_alpha()
-        key = pygame.transform.scale(key, (78, 78))
-        key.set_alpha(50)
-        KEYS_IMAGE[key_val[0]] = key, key_val[1], key_val[2]
-
-    for i in range(0, 10):
-        num = normal_font.render(str(i), True, (255, 255, 255))
-        num_size = num.get_size()
-        NUMS.append((num, num_size))
+        KEYS_IMAGE[key_val[0]] = image_asset(f"keys/{key_id}_KEY.png", 50), key_val[1], key_val[2]
 
-    for i in range(0, 10):
-        num = semi_big_font.render(str(i), True, (255, 255, 255))
-        num_size = num.get_size()
-        BIG_NUMS.append((num, num_size))
+    NUMS.extend(render_nums(normal_font))
 
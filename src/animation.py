@@ -0,0 +1,54 @@
+class Animation:
+    def __init__(self, min_: int, max_: int, speed: int = 1) -> None:
+        self.min: int = min_
+        self.max: int = max_
+        self.frame: int|float = min_
+        self.speed: int = speed
+        self.message = None
+
+    def update_add(self, delta, clamp: bool=False, wrap: bool=False):
+        #assert clamp ^ wrap or not (clamp or wrap)
+
+        val = delta * self.speed
+
+        if clamp:
+            if (self.frame + val) > self.max:
+                self.frame = self.max
+                return
+            elif (self.frame + val) < self.min:
+                self.frame = self.min
+                return
+        elif wrap:
+            if (self.frame + val) > self.max:
+                self.frame = self.min
+                return
+            elif (self.frame + val) < self.min:
+                self.frame = self.max
+                return
+
+        self.frame += val
+
+    def wrap(self):
+        if self.frame > self.max:
+            self.frame = self.min
+        elif self.frame < self.min:
+            self.frame = self.max
+
+    def clamp(self):
+        if self.frame > self.max:
+            self.frame = self.max
+        elif self.frame < self.min:
+            self.frame = self.min
+
+    def is_playing_within_top(self):
+        return self.frame < self.max
+    
+    def is_playing_after_down(self):
+        return self.frame > self.min
+
+    def is_playing(self):
+        return self.frame < self.max and self.frame > self.min
+
+    def set_message(self, msg, delta=0.0):
+        self.message = msg
+        self.update_add(delta)
@@ -0,0 +1,73 @@
+import pygame
+from collections import OrderedDict
+from camera import CameraSystem
+
+VOID_COLOR = (20, 20, 20)
+CLEAR_COLOR = (255, 0, 255) # palette slot left see-through, whatever is under the arena shows there
+
+class ArenaCache:
+    # the voids and court walls pre-rendered per camera scale, least recently used scale gets dropped first.
+    # every band of the arena is one flat colour, so a band longer than the viewport is cut down to the viewport:
+    # any window the camera can show still finds the same pixels, and a surface stays a few viewports big at any zoom
+
+    def __init__(self, max_entries: int = 8) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple, tuple[pygame.Surface, list[int], list[int]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.entries.clear()
+
+    def draw(self, screen: pygame.Surface, cam: CameraSystem, void_dim: tuple[float, float, float, float], court_sizes: tuple[float, float], left_color: pygame.Color, right_color: pygame.Color):
+        # void dim: (top_void, bottom_void, left_void, right_void)
+        top_void, bottom_void, left_void, right_void = void_dim
+        width, height = screen.get_size()
+
+        # band edges on screen, truncated like pygame.draw.rect does. x: void | left wall | court | right wall | void, y: void | court | void
+        edges_x = [int(cam.calc_pos_x(x)) for x in (left_void, left_void + court_sizes[0], right_void - court_sizes[1], right_void)]
+        edges_y = [int(cam.calc_pos_y(y)) for y in (top_void, bottom_void)]
+        bands_x = self.clamp_bands(edges_x, width)
+        bands_y = self.clamp_bands(edges_y, height)
+
+        key = (tuple(bands_x), tuple(bands_y), tuple(left_color), tuple(right_color))
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.entries[key] = self.render(bands_x, bands_y, left_color, right_color)
+            self.misses += 1
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        surface, starts_x, starts_y = self.entries[key]
+        area = (self.source_offset(edges_x, bands_x, starts_x), self.source_offset(edges_y, bands_y, starts_y), width, height)
+        screen.blit(surface, (0, 0), area)
+
+    @staticmethod
+    def clamp_bands(edges: list[int], view: int) -> list[int]:
+        # the outer bands run on forever, nothing past `view` pixels of any band can be on screen at once
+        inner = [min(max(b - a, 0), view) for a, b in zip(edges, edges[1:])]
+        return [view] + inner + [view]
+
+    @staticmethod
+    def source_offset(edges: list[int], bands: list[int], starts: list[int]) -> int:
+        # where the screen's first pixel lands in the shortened bands: keep the distance to the end of its band
+        band = sum(1 for edge in edges if edge <= 0)
+        remaining = edges[band] if band < len(edges) else bands[band]
+        return starts[band] + max(0, bands[band] - remaining)
+
+    def render(self, bands_x: list[int], bands_y: list[int], left_color: pygame.Color, right_color: pygame.Color) -> tuple[pygame.Surface, list[int], list[int]]:
+        starts_x = [sum(bands_x[:i]) for i in range(len(bands_x))]
+        starts_y = [sum(bands_y[:i]) for i in range(len(bands_y))]
+
+        surface = pygame.Surface((sum(bands_x), sum(bands_y)), 0, 8)
+        surface.set_palette([CLEAR_COLOR, VOID_COLOR, left_color, right_color] + [(0, 0, 0)] * 252)
+        surface.set_colorkey(CLEAR_COLOR, pygame.RLEACCEL)
+
+        for band, index in enumerate((1, 2, 0, 3, 1)):
+            surface.fill(index, (starts_x[band], 0, bands_x[band], surface.get_height()))
+        for band in (0, 2):
+            surface.fill(1, (0, starts_y[band], surface.get_width(), bands_y[band]))
+
+        return surface, starts_x, starts_y
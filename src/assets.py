@@ -0,0 +1,97 @@
+import threading, time
+from typing import Any, Callable
+
+class AssetLoader:
+    # assets by name (their path), each loaded once: by the first get(), or ahead of time by a background thread.
+    # decoding sounds and images lets go of the GIL, so the window keeps drawing while the thread works through the queue
+
+    def __init__(self) -> None:
+        self.loaders: dict[str, Callable[[], Any]] = {}
+        self.locks: dict[str, threading.Lock] = {} # held while that asset loads, get() waits on it instead of loading twice
+        self.assets: dict[str, Any] = {}
+        self.callbacks: dict[str, list[Callable[[Any], None]]] = {}
+        self.timings: dict[str, float] = {} # ms per asset, in the order they finished
+
+        self.guard = threading.Lock() # queue, callbacks and worker
+        self.queue: list[str] = []
+        self.worker: threading.Thread|None = None
+        self.preload_start = 0.0
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        if name not in self.loaders:
+            self.loaders[name] = loader
+            self.locks[name] = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.loaders
+
+    def ready(self, name: str) -> bool:
+        return name in self.assets
+
+    def get(self, name: str) -> Any:
+        if name in self.assets:
+            return self.assets[name]
+        return self.load(name)
+
+    def load(self, name: str) -> Any:
+        with self.locks[name]:
+            if name not in self.assets:
+                start = time.perf_counter()
+                asset = self.loaders[name]()
+                self.timings[name] = (time.perf_counter() - start) * 1000
+                self.assets[name] = asset
+
+        with self.guard:
+            callbacks = self.callbacks.pop(name, [])
+        for callback in callbacks:
+            callback(self.assets[name])
+        return self.assets[name]
+
+    def when_ready(self, name: str, callback: Callable[[Any], None]):
+        # runs `callback` with the asset, right away if it is loaded, otherwise on the loader thread once it is (jumping the queue)
+        with self.guard:
+            if name not in self.assets:
+                self.callbacks.setdefault(name, []).append(callback)
+                if name in self.queue:
+                    self.queue.remove(name)
+                self.queue.insert(0, name)
+                self.start()
+                return
+        callback(self.assets[name])
+
+    def preload(self, names: list[str]|None = None):
+        # queue everything not loaded yet (registration order), the background thread takes it from there
+        with self.guard:
+            if not self.queue and self.worker is None:
+                self.preload_start = time.perf_counter()
+            self.queue += [name for name in (names if names is not None else self.loaders) if name not in self.assets and name not in self.queue]
+            self.start()
+
+    def start(self):
+        # with self.guard held
+        if self.worker is None and self.queue:
+            self.worker = threading.Thread(target=self.run, name="asset loader", daemon=True)
+            self.worker.start()
+
+    def run(self):
+        while True:
+            with self.guard:
+                if not self.queue:
+                    self.worker = None
+                    break
+                name = self.queue.pop(0)
+
+            try:
+                self.load(name)
+            except Exception as error:
+                # get() loads it again on the main thread and raises there, where it can be seen
+                print(f">> GAME: couldn't load {name} in the background: {error}")
+
+        print(f">> GAME: Assets loaded after {(time.perf_counter() - self.preload_start) * 1000:.0f} ms")
+        for line in self.report():
+            print(f"    {line}")
+
+    def report(self) -> list[str]:
+        return [f"{ms:7.1f} ms  {name}" for name, ms in sorted(self.timings.items(), key=lambda timing: -timing[1])]
+
+ASSETS = AssetLoader()
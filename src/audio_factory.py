@@ -1,21 +1,144 @@
 import pygame, helper
+from assets import ASSETS
 
 VOLUME = 10
 #VOLUME = 0.05
 #VOLUME = 0.0
 
-AUDIO_LIBRARY = {
-    "BUTTON_CLICK": pygame.mixer.Sound(helper.resource_path("audio/click-button.mp3")),
-    "MAIN_MENU": pygame.mixer.Sound(helper.resource_path("audio/main-menu.mp3")),
-    "GAME_LOOP": pygame.mixer.Sound(helper.resource_path("audio/game-loop.mp3")),
-    "CLOCK": pygame.mixer.Sound(helper.resource_path("audio/clock.mp3")),
-    "POWER_UP": pygame.mixer.Sound(helper.resource_path("audio/power_up.mp3")),
-    "BEEP": pygame.mixer.Sound(helper.resource_path("audio/beep.mp3"))
+# long tracks, streamed from disk through pygame.mixer.music instead of being decoded into memory
+MUSIC_FILES = {
+    "MAIN_MENU": "audio/main-menu.mp3",
+    "GAME_LOOP": "audio/game-loop.mp3"
 }
 
+# short effects, decoded once (by the asset loader) and played on their own reserved channels
+AUDIO_FILES = {
+    "BUTTON_CLICK": "audio/click-button.mp3",
+    "CLOCK": "audio/clock.mp3",
+    "POWER_UP": "audio/power_up.mp3",
+    "BEEP": "audio/beep.mp3"
+}
+
+# how many of an effect can sound at once, the next one cuts off the oldest of the same effect and nothing else
+EFFECT_CHANNELS = {
+    "BUTTON_CLICK": 2,
+    "CLOCK": 1,
+    "POWER_UP": 2,
+    "BEEP": 3
+}
+
+FADE_MS = 600 # music switches fade the old track out, then the new one in
+
+volume: float = VOLUME
+
+# bumped by stop(), an effect that finishes decoding after that doesn't start anymore
+generation = 0
+
+music_track: str|None = None # playing, or fading in after the current one fades out
+music_pending: tuple[str, int]|None = None # (key, loops) waiting for the fade out to finish
+
+channels: dict[str, list[pygame.mixer.Channel]] = {}
+next_channel: dict[str, int] = {}
+
+def load(key: str) -> pygame.mixer.Sound:
+    audio = pygame.mixer.Sound(helper.resource_path(AUDIO_FILES[key]))
+    apply_volume(key, audio)
+    return audio
+
+def apply_volume(key: str, audio: pygame.mixer.Sound):
+    if key in ("CLOCK", "POWER_UP", "BEEP"):
+        audio.set_volume(volume * 2)
+    else:
+        audio.set_volume(volume)
+
+# headless runs never start the mixer, so there is nothing to load and play() stays silent.
+# otherwise the effects are decoded by the asset loader, not on import
+if pygame.mixer.get_init():
+    for key, path in AUDIO_FILES.items():
+        ASSETS.register(path, lambda key=key: load(key))
+
+    # Sound.play() never picks a reserved channel, so the effects only ever take each other's place
+    pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), sum(EFFECT_CHANNELS.values()) + 2))
+    pygame.mixer.set_reserved(sum(EFFECT_CHANNELS.values()))
+    first = 0
+    for key, count in EFFECT_CHANNELS.items():
+        channels[key] = [pygame.mixer.Channel(first + i) for i in range(count)]
+        next_channel[key] = 0
+        first += count
+
+def play(key: str, loops: int = 0):
+    if key in MUSIC_FILES:
+        play_music(key, loops)
+        return
+
+    path = AUDIO_FILES[key]
+    if path not in ASSETS:
+        return
+
+    if ASSETS.ready(path):
+        play_effect(key, ASSETS.get(path), loops)
+        return
+
+    # still decoding, starts as soon as it is ready
+    started = generation
+    ASSETS.when_ready(path, lambda audio: play_effect(key, audio, loops) if started == generation else None)
+
+def play_effect(key: str, audio: pygame.mixer.Sound, loops: int):
+    # a free channel of this effect, otherwise the one it used longest ago
+    pool = channels[key]
+    channel = next((channel for channel in pool if not channel.get_busy()), None)
+    if channel is None:
+        channel = pool[next_channel[key]]
+        next_channel[key] = (next_channel[key] + 1) % len(pool)
+    channel.play(audio, loops)
+
+def play_music(key: str, loops: int = -1):
+    global music_track, music_pending
+    if not pygame.mixer.get_init():
+        return
+    if key == music_track and (music_pending or pygame.mixer.music.get_busy()):
+        return
+
+    music_track = key
+    if pygame.mixer.music.get_busy():
+        # one stream can't play two tracks, so no true crossfade: fade out here, update() fades the next one in
+        if music_pending is None:
+            pygame.mixer.music.fadeout(FADE_MS)
+        music_pending = key, loops
+        return
+
+    start_music(key, loops)
+
+def start_music(key: str, loops: int):
+    pygame.mixer.music.load(helper.resource_path(MUSIC_FILES[key]))
+    pygame.mixer.music.set_volume(volume)
+    pygame.mixer.music.play(loops, fade_ms=FADE_MS)
+
+def update():
+    # once a frame: starts the next track once the previous one has faded out
+    global music_pending
+    if music_pending is not None and not pygame.mixer.music.get_busy():
+        start_music(*music_pending)
+        music_pending = None
+
+def stop(music: bool = False):
+    # stops every effect, the music only when asked (otherwise the next play() fades it into the new track)
+    global generation, music_track, music_pending
+    generation += 1
+    if not pygame.mixer.get_init():
+        return
+
+    pygame.mixer.stop()
+    if music:
+        pygame.mixer.music.stop()
+        music_track = music_pending = None
+
 def set_volume(vol:float=VOLUME):
-    for key, audio in AUDIO_LIBRARY.items():
-        if key in ("CLOCK", "POWER_UP", "BEEP"):
-            audio.set_volume(vol * 2)
-            continue
-        audio.set_volume(vol)
+    global volume
+    volume = vol
+    for key, path in AUDIO_FILES.items():
+        if ASSETS.ready(path):
+            apply_volume(key, ASSETS.get(path))
+
+    if pygame.mixer.get_init():
+        pygame.mixer.music.set_volume(volume)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# Balance sweeps: plays many headless bot matches for every combination of the tuning values given,
+# spread over a process pool, and writes one summary.
+#   uv run src/batch.py --param g=15,20,25 --param power_mass=500,1000 --repeats 50 --output balance.json
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+# one process per core already, numpy spinning up its own threads in each of them only gets in the way
+for name in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(name, "1")
+
+import pygame, json, time, itertools, argparse, userevents
+import numpy as np
+from multiprocessing import Pool
+from pathlib import Path
+from typing import NamedTuple
+from match import Match
+from gameplay import PowerUp
+from eventbus import SimEvent
+from headless import run_match
+from stepper import DEFAULT_HZ
+
+# everything a sweep can change, and whether it lives on the match or its physics world
+PARAMETERS = {
+    "g": "world",
+    "grav_damp": "world",
+    "bounce_damp": "world",
+    "friction": "world",
+    "clone_count": "match",
+    "coin_boost": "match",
+    "power_speed_limit": "match",
+    "power_size": "match",
+    "power_mass": "match",
+}
+
+class Job(NamedTuple):
+    point: int # index of the parameter combination
+    params: dict[str, float]
+    seed: int
+    game_time: int
+    physics_hz: int
+
+class Bot:
+    # heads for a spot just past the ball on the side its player scores on, so the ball gets pulled that way,
+    # and fires the power up as soon as it is charged. re-aims every `think_every` steps, holding its keys in between
+
+    def __init__(self, left_player: bool, lead: float = 300, dead_zone: float = 40, think_every: int = 6) -> None:
+        self.left_player = left_player
+        self.lead = lead
+        self.dead_zone = dead_zone
+        self.think_every = think_every
+
+        # (left, right, down, up), power
+        if left_player:
+            self.keys = (pygame.K_a, pygame.K_d, pygame.K_s, pygame.K_w)
+            self.power = pygame.K_LSHIFT
+        else:
+            self.keys = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_DOWN, pygame.K_UP)
+            self.power = pygame.K_RSHIFT
+        self.held: set[int] = set()
+
+    def __call__(self, match: Match) -> list[tuple[int, bool]]:
+        if match.steps % self.think_every:
+            return []
+
+        player = match.left_player if self.left_player else match.right_player
+        # the ball scores for the right player in the right end zone and for the left player in the left one
+        side = -1 if self.left_player else 1
+        dx = match.ball.pos.x + side * self.lead - player.pos.x
+        dy = match.ball.pos.y - player.pos.y
+
+        left, right, down, up = self.keys
+        want = set()
+        if abs(dx) > self.dead_zone:
+            want.add(right if dx > 0 else left)
+        if abs(dy) > self.dead_zone:
+            want.add(up if dy > 0 else down)
+
+        changes = [(key, False) for key in self.held - want] + [(key, True) for key in want - self.held]
+        self.held = want
+
+        allowed = match.gameplay.left_power_allow if self.left_player else match.gameplay.right_power_allow
+        if allowed:
+            changes.append((self.power, True))
+        return changes
+
+def apply(match: Match, params: dict[str, float]):
+    for name, value in params.items():
+        setattr(match.world if PARAMETERS[name] == "world" else match, name, value)
+
+def play(job: Job) -> dict:
+    match = Match(job.game_time, seed=job.seed)
+    apply(match, job.params)
+
+    powers = {"left": {power.name: 0 for power in PowerUp}, "right": {power.name: 0 for power in PowerUp}}
+    def count_power(event: SimEvent):
+        powers["left" if event.left_player else "right"][event.power.name] += 1
+    match.bus.subscribe(count_power, userevents.POWER_UP_GAIN_EVENT)
+
+    left, right = Bot(True), Bot(False)
+    start = time.perf_counter()
+    run_match(job.game_time, controller=lambda match: left(match) + right(match), physics_hz=job.physics_hz, match=match)
+
+    goals = match.gameplay.left_score + match.gameplay.right_score
+    return {
+        "point": job.point,
+        "seed": job.seed,
+        "winner": match.gameplay.winner,
+        "left_score": match.gameplay.left_score,
+        "right_score": match.gameplay.right_score,
+        "goals_per_minute": goals / (match.time / 60),
+        "powers": powers,
+        "sim_time": match.time,
+        "wall_time": time.perf_counter() - start
+    }
+
+def parse_param(text: str) -> tuple[str, list[float]]:
+    # "power_mass=500,1000" -> ("power_mass", [500, 1000])
+    name, _, values = text.partition("=")
+    if name not in PARAMETERS or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=V1,V2,... with NAME one of {', '.join(PARAMETERS)}")
+    return name, [float(value) if "." in value else int(value) for value in values.split(",")]
+
+def grid(params: list[tuple[str, list[float]]]) -> list[dict[str, float]]:
+    names = [name for name, _ in params]
+    return [dict(zip(names, values)) for values in itertools.product(*(values for _, values in params))]
+
+def summarize(points: list[dict[str, float]], results: list[dict]) -> list[dict]:
+    summary = []
+    for point, params in enumerate(points):
+        rows = [result for result in results if result["point"] == point]
+        winners = np.array([row["winner"] for row in rows])
+        summary.append({
+            "params": params,
+            "matches": len(rows),
+            "left_wins": round(float(np.mean(winners == 1)), 3),
+            "right_wins": round(float(np.mean(winners == 2)), 3),
+            "ties": round(float(np.mean(winners == 3)), 3),
+            "goals_per_minute": round(float(np.mean([row["goals_per_minute"] for row in rows])), 3),
+            "score_difference": round(float(np.mean([row["left_score"] - row["right_score"] for row in rows])), 3),
+            # power ups gained per match, both players together
+            "powers": {power.name: round(sum(row["powers"]["left"][power.name] + row["powers"]["right"][power.name] for row in rows) / len(rows), 3) for power in PowerUp}
+        })
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep GravBall tuning values over many headless bot matches")
+    parser.add_argument("--param", type=parse_param, action="append", default=[], help=f"NAME=V1,V2,... to sweep, can be repeated. NAME: {', '.join(PARAMETERS)}")
+    parser.add_argument("--repeats", type=int, default=20, help="matches per parameter combination, each with its own seed")
+    parser.add_argument("--game-time", type=int, default=180, help="match length in seconds (< 3600)")
+    parser.add_argument("--hz", type=int, default=DEFAULT_HZ, help="physics rate, 60 to 240")
+    parser.add_argument("--seed", type=int, default=0, help="first seed, match n of a combination uses seed + n")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="worker processes, defaults to one per core")
+    parser.add_argument("--output", type=Path, default=Path("balance.json"), help="where the summary goes")
+    args = parser.parse_args()
+
+    points = grid(args.param)
+    # the same seeds for every combination, so they differ only in the values being swept
+    jobs = [Job(point, params, args.seed + repeat, args.game_time, args.hz) for point, params in enumerate(points) for repeat in range(args.repeats)]
+
+    start = time.perf_counter()
+    results = []
+    with Pool(args.processes) as pool:
+        for result in pool.imap_unordered(play, jobs, chunksize=max(1, len(jobs) // (args.processes * 8))):
+            results.append(result)
+            print(f"\r{len(results)}/{len(jobs)} matches", end="", flush=True)
+    wall = time.perf_counter() - start
+    print()
+
+    results.sort(key=lambda result: (result["point"], result["seed"]))
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "game_time": args.game_time,
+        "physics_hz": args.hz,
+        "repeats": args.repeats,
+        "processes": args.processes,
+        "wall_time": round(wall, 3),
+        "matches_per_second": round(len(jobs) / wall, 3),
+        "summary": summarize(points, results),
+        "matches": results
+    }, indent=2))
+
+    print(f"{len(jobs)} matches in {wall:.1f} s on {args.processes} processes, {sum(result['sim_time'] for result in results) / wall:.0f}x real time -> {args.output}")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# One file holding every image already scaled to the size it is drawn at, as raw BGRA pixels
+# (the layout convert_alpha() gives), so the game maps it and makes surfaces straight on top of it.
+#   uv run src/bundle.py          writes images.bundle, run it again whenever an image or a size in IMAGES changes
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+
+import pygame, mmap, struct, json
+
+# every image under images/ and the size it is drawn at, the bundle holds exactly these
+IMAGES: dict[str, tuple[int, int]] = {
+    "colorwheel.png": (400, 400),
+    "left_crown.png": (300, 300),
+    "right_crown.png": (300, 300),
+    "gravity_formula.png": (332, 167),
+    "uncertainity.png": (337, 149),
+    "powerups/quantum.png": (100, 100),
+    "powerups/grow.png": (100, 100),
+    "powerups/speed.png": (100, 100),
+    "powerups/antigravity.png": (100, 100),
+    **{f"keys/{key}_KEY.png": (78, 78) for key in ("W", "A", "S", "D", "UP", "DOWN", "LEFT", "RIGHT")}
+}
+
+BUNDLE_FILE = "images.bundle"
+MAGIC = b"GBIB"
+VERSION = 1
+HEADER = struct.Struct("<4sBI") # magic, version, length of the json index that follows
+ALIGN = 16 # the pixel data and every image in it start on this boundary
+
+def scale_image(path: str, size: tuple[int, int]) -> pygame.Surface:
+    # what the game does with a loose file, and what the bundle stores the result of
+    return pygame.transform.scale(pygame.image.load(path).convert_alpha(), size)
+
+class Bundle:
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as bundle:
+            # copy on write: surfaces can be written to without touching the file, untouched pages stay shared
+            self.map = mmap.mmap(bundle.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.view = memoryview(self.map)
+        self.mtime = os.path.getmtime(path)
+
+        magic, version, length = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} image bundle")
+
+        # name -> (width, height, offset of the pixels from the start of the pixel data)
+        self.index: dict[str, list[int]] = json.loads(self.view[HEADER.size:HEADER.size + length].tobytes())
+        self.start = aligned(HEADER.size + length)
+        self.images_dir = os.path.join(os.path.dirname(path), "images")
+
+    def surface(self, name: str, size: tuple[int, int]) -> pygame.Surface|None:
+        # None when the bundle doesn't have this image at this size, or the loose file was changed after it was built
+        if name not in self.index:
+            return None
+        width, height, offset = self.index[name]
+        offset += self.start
+        if (width, height) != tuple(size):
+            return None
+
+        source = os.path.join(self.images_dir, name)
+        if os.path.exists(source) and os.path.getmtime(source) > self.mtime:
+            return None
+
+        return pygame.image.frombuffer(self.view[offset:offset + width * height * 4], (width, height), "BGRA")
+
+def open_bundle(path: str) -> Bundle|None:
+    if not os.path.exists(path):
+        return None
+    try:
+        return Bundle(path)
+    except (ValueError, struct.error) as error:
+        print(f">> GAME: {error}, using the loose images")
+        return None
+
+def aligned(offset: int) -> int:
+    return offset + (-offset % ALIGN)
+
+def build(images_dir: str, path: str):
+    pixels = bytearray()
+    index: dict[str, list[int]] = {}
+    for name, size in IMAGES.items():
+        index[name] = [size[0], size[1], len(pixels)]
+        pixels += pygame.image.tobytes(scale_image(os.path.join(images_dir, name), size), "BGRA")
+        pixels += bytes(aligned(len(pixels)) - len(pixels))
+
+    encoded = json.dumps(index).encode()
+    with open(path, "wb") as bundle:
+        bundle.write(HEADER.pack(MAGIC, VERSION, len(encoded)))
+        bundle.write(encoded)
+        bundle.write(bytes(aligned(HEADER.size + len(encoded)) - HEADER.size - len(encoded)))
+        bundle.write(pixels)
+
+if __name__ == "__main__":
+    # convert_alpha() needs a display, any will do
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.path.join(root, BUNDLE_FILE)
+    build(os.path.join(root, "images"), path)
+    print(f"{len(IMAGES)} images, {os.path.getsize(path) / 1024:.0f} KiB -> {path}")
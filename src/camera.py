@@ -1,4 +1,6 @@
 
+import numpy as np
+
 class CameraSystem:
     def __init__(self, coords: tuple[float, float], scale: float, width_height: tuple[float, float]) -> None:
         self.CAM_CENTER_ON = [-coords[0], coords[1]]
@@ -46,12 +48,31 @@ class CameraSystem:
             else:
                 self.SCALE += delta
 
+    @property
+    def is_zooming(self) -> bool:
+        # scale changes every frame while zooming, nothing keyed on it is worth caching then
+        return self._zoom_out_ != 0
+
     def calc_pos_x(self, pos_x: float) -> float:
         return (self.CAM_CENTER_ON[0] + pos_x) * self.SCALE + self.width//2
 
     def calc_pos_y(self, pos_y: float) -> float:
         return (self.CAM_CENTER_ON[1] - pos_y) * self.SCALE + self.height//2
     
+    def transform(self, positions: np.ndarray, radii: np.ndarray|float = 0, min_radius: float = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # calc_pos_x / calc_pos_y for a whole (N, 2) array of world positions at once, the same arrays can go through every camera.
+        # returns the screen positions, the screen radii (never below min_radius) and which of those circles reach into the viewport
+        screen = np.empty((len(positions), 2))
+        screen[:, 0] = (self.CAM_CENTER_ON[0] + positions[:, 0]) * self.SCALE + self.width//2
+        screen[:, 1] = (self.CAM_CENTER_ON[1] - positions[:, 1]) * self.SCALE + self.height//2
+        screen_radii = np.maximum(np.broadcast_to(np.asarray(radii, dtype=float) * self.SCALE, len(positions)), min_radius)
+
+        # a circle is on screen when the viewport point closest to its centre is inside it, not only when the centre is
+        nearest_x = np.clip(screen[:, 0], 0, self.width)
+        nearest_y = np.clip(screen[:, 1], 0, self.height)
+        visible = (screen[:, 0] - nearest_x)**2 + (screen[:, 1] - nearest_y)**2 <= screen_radii**2
+        return screen, screen_radii, visible
+
     def set_width_height(self, width_height: tuple[float, float]) -> None:
         self.width, self.height = width_height
 
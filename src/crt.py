@@ -0,0 +1,62 @@
+import moderngl, UI
+from gpu_scene import load_program
+
+# crt_quality in the config -> the CRT pass' fragment shader.
+# 2 works the whole CRT look out for every pixel of every frame, 1 reads the parts that never move from a baked mask
+# (looks the same), 0 bakes the big scan line's average in as well so nothing is left to work out per pixel
+CRT_SHADERS = {2: "shader", 1: "crt", 0: "crt_static"}
+
+# the fixed CRT settings, for shader.frag and for baking the mask
+CRT_UNIFORMS = {
+    "curvature": (4.0, 3.0),
+    "scanLineOpacity": (0.05, 0.05),
+    "vignetteRoundness": 2.0,
+    "vignetteOpacity": UI.OPENGL_VIGNETTE_OPACITY,
+    "brightness": UI.OPENGL_BRIGHTNESS
+}
+BIG_SCAN_LINE_OPACITY = 0.01
+
+class CRTMask:
+    # the curvature, the fine scan lines, the vignette and the brightness only depend on the window's size, so they are
+    # rendered once into a float texture (rg: where each pixel samples the frame, b: how much of it comes through) on start
+    # and on resize. crt.frag reads them back with one lookup, the big scan line is the only part it still works out
+
+    def __init__(self, ctx: moderngl.Context, quad_buffer: moderngl.Buffer, size: tuple[int, int], quality: int = 1) -> None:
+        self.ctx = ctx
+        self.texture: moderngl.Texture|None = None
+        self.fbo: moderngl.Framebuffer|None = None
+
+        # the same quad and vertex shader as the CRT pass, every mask pixel gets the uv its screen pixel gets there
+        self.program = load_program(ctx, "crt_bake", vertex="shader")
+        for name, value in CRT_UNIFORMS.items():
+            self.program[name] = value
+        # the big scan line swings between 0.5 and 1.0 (less its opacity), 0.75 on average
+        self.program['bigScanLineAverage'] = 1.0 if quality == 1 else 0.75 * (1 - BIG_SCAN_LINE_OPACITY)
+        self.renderer = ctx.vertex_array(self.program, [(quad_buffer, '2f 2f', 'vert', 'texcoord')])
+
+        self.resize(size)
+
+    def resize(self, size: tuple[int, int]):
+        if self.fbo is not None:
+            self.fbo.release()
+            self.texture.release()
+
+        # one texel per pixel of the window, read back exactly as they were written
+        self.texture = self.ctx.texture(size, 4, dtype="f4")
+        self.texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        self.fbo = self.ctx.framebuffer(color_attachments=[self.texture])
+
+        self.program['screenResolution'] = size
+        self.bake()
+
+    def bake(self):
+        previous, viewport = self.ctx.fbo, self.ctx.viewport
+        self.fbo.use()
+        self.renderer.render(mode=moderngl.TRIANGLE_STRIP)
+        previous.use()
+        self.ctx.viewport = viewport
+
+    def release(self):
+        self.renderer.release()
+        self.fbo.release()
+        self.texture.release()
@@ -0,0 +1,53 @@
+from typing import Any, Callable, Hashable, NamedTuple
+
+class SimEvent(NamedTuple):
+    # one simulation event, `type` is an id from userevents and only the fields that type uses are set
+    type: int
+    left_player: bool = False
+    power: Any = None # gameplay.PowerUp
+    player: int = 0 # body id
+    random_body: Any = None # phybody.Body
+
+Handler = Callable[[SimEvent], None]
+
+class EventBus:
+    # in process queue for a match's events, drained once per step instead of going through SDL.
+    # an event posted with a coalesce key is dropped while another one with the same key is still waiting
+
+    def __init__(self) -> None:
+        self.queue: list[tuple[SimEvent, Hashable]] = []
+        self.waiting: set[Hashable] = set()
+        self.handlers: dict[int, list[Handler]] = {}
+        self.catch_all: list[Handler] = []
+
+    def post(self, event: SimEvent, key: Hashable = None):
+        if key is not None:
+            if key in self.waiting:
+                return
+            self.waiting.add(key)
+
+        self.queue.append((event, key))
+
+    def subscribe(self, handler: Handler, *types: int):
+        # no types -> every event, in subscription order
+        if not types:
+            self.catch_all.append(handler)
+        for event_type in types:
+            self.handlers.setdefault(event_type, []).append(handler)
+
+    def drain(self):
+        # events posted by a handler are delivered in the same drain, after the ones already queued
+        while self.queue:
+            queue, self.queue = self.queue, []
+            for event, key in queue:
+                if key is not None:
+                    self.waiting.discard(key)
+
+                for handler in self.catch_all:
+                    handler(event)
+                for handler in self.handlers.get(event.type, ()):
+                    handler(event)
+
+    def clear(self):
+        self.queue.clear()
+        self.waiting.clear()
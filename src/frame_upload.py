@@ -0,0 +1,39 @@
+import pygame, moderngl
+
+class FrameUploader:
+    # one texture that lives as long as the window size does, fed through a pixel buffer that is orphaned
+    # every frame, so writing this frame's pixels never waits on the driver still reading last frame's
+
+    def __init__(self, ctx: moderngl.Context, size: tuple[int, int]) -> None:
+        self.ctx = ctx
+        self.texture: moderngl.Texture|None = None
+        self.buffer: moderngl.Buffer|None = None
+        self.allocate(size)
+
+    def allocate(self, size: tuple[int, int]):
+        self.release()
+        self.size = (int(size[0]), int(size[1]))
+
+        self.texture = self.ctx.texture(self.size, 4)
+        self.texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        self.texture.swizzle = 'BGRA'
+        self.buffer = self.ctx.buffer(reserve=self.size[0] * self.size[1] * 4, dynamic=True)
+
+    def resize(self, size: tuple[int, int]):
+        if (int(size[0]), int(size[1])) != self.size:
+            self.allocate(size)
+
+    def upload(self, surface: pygame.Surface) -> moderngl.Texture:
+        # orphan first so the driver hands back fresh storage instead of syncing on a pending transfer
+        self.buffer.orphan()
+        self.buffer.write(surface.get_view('1'))
+        self.texture.write(self.buffer)
+        return self.texture
+
+    def release(self):
+        if self.texture is not None:
+            self.texture.release()
+            self.texture = None
+        if self.buffer is not None:
+            self.buffer.release()
+            self.buffer = None
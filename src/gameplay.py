@@ -1,5 +1,6 @@
-import pygame, audio_factory, random
+import audio_factory, random
 from enum import Enum
+from eventbus import EventBus, SimEvent
 
 class PowerUp(Enum):
     SpeedUp = 110
@@ -8,7 +9,7 @@ class PowerUp(Enum):
     AntiGravity = 410
 
 class Gameplay:
-    def __init__(self, max_time: int, winner_event: int, power_up_gain_event: int, power_up_destroy_event: int) -> None:
+    def __init__(self, max_time: int, winner_event: int, power_up_gain_event: int, power_up_destroy_event: int, bus: EventBus|None = None, rng: random.Random|None = None) -> None:
         assert max_time < 3600, "MaxTime can't be greater than 60 minutes"
 
         self.left_score: int = 0
@@ -24,6 +25,11 @@ class Gameplay:
         self.power_up_gain_event: int = power_up_gain_event
         self.power_up_destroy_event: int = power_up_destroy_event
 
+        # where gameplay events go, a Match hands in its own bus
+        self.bus = bus if bus is not None else EventBus()
+        # and where power ups are drawn from, a Match shares its seeded generator
+        self.rng = rng if rng is not None else random.Random()
+
         self.left_power: None|tuple[PowerUp, int] = None
         self.left_power_allow: bool = False
         self.right_power: None|tuple[PowerUp, int] = None
@@ -33,7 +39,7 @@ class Gameplay:
         if (left_player and (self.left_power or not self.left_power_allow)) or (not left_player and (self.right_power or not self.right_power_allow)):
             return
         
-        power = random.choice(list(PowerUp))
+        power = self.rng.choice(list(PowerUp))
         #power = PowerUp.SpeedUp
         #power = PowerUp.Grow
         #power = PowerUp.Quantum
@@ -44,8 +50,8 @@ class Gameplay:
         else:
             self.right_power = power, self.timer
 
-        audio_factory.AUDIO_LIBRARY["POWER_UP"].play()
-        pygame.event.post(pygame.event.Event(self.power_up_gain_event, left_player=left_player, power=power))
+        audio_factory.play("POWER_UP")
+        self.bus.post(SimEvent(self.power_up_gain_event, left_player=left_player, power=power))
 
     def remove_power(self, left_player: bool):
         if left_player:
@@ -74,7 +80,7 @@ class Gameplay:
         #print("tick!", self.timer_in_min_sec())
 
         if self.timer < 10 and not self.clock_sound:
-            audio_factory.AUDIO_LIBRARY["CLOCK"].play(-1)
+            audio_factory.play("CLOCK", -1)
             self.clock_sound = True
 
 
@@ -87,12 +93,12 @@ class Gameplay:
     def check_powerup(self):
         if ((self.left_power is not None) and
             ((self.left_power[1] - self.timer) > self.left_power[0].value%100)):
-            pygame.event.post(pygame.event.Event(self.power_up_destroy_event, left_player=True, power=self.left_power[0]))
+            self.bus.post(SimEvent(self.power_up_destroy_event, left_player=True, power=self.left_power[0]))
             self.left_power = None
 
         if ((self.right_power is not None) and
             ((self.right_power[1] - self.timer) > self.right_power[0].value%100)):
-            pygame.event.post(pygame.event.Event(self.power_up_destroy_event, left_player=False, power=self.right_power[0]))
+            self.bus.post(SimEvent(self.power_up_destroy_event, left_player=False, power=self.right_power[0]))
             self.right_power = None
 
     def check_winner(self) -> int:
@@ -116,7 +122,7 @@ class Gameplay:
         else:
             self.winner = 3
         
-        pygame.event.post(pygame.event.Event(self.winner_event))
+        self.bus.post(SimEvent(self.winner_event))
         return self.winner
         
     def reset(self) -> None:
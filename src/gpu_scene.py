@@ -0,0 +1,217 @@
+import pygame, moderngl, array, helper
+import numpy as np
+from camera import CameraSystem
+from arena import VOID_COLOR
+
+# one circle as the instanced draw reads it: world position, world radius, smallest radius on screen, rgba
+INSTANCE = np.dtype([("center", "f4", 2), ("radius", "f4"), ("min_radius", "f4"), ("color", "u1", 4)])
+INSTANCE_FORMAT = "2f f f 4f1/i"
+
+# how the viewports, drawn smaller than the window, are stretched over it
+UPSCALE_FILTERS = {"linear": moderngl.LINEAR, "nearest": moderngl.NEAREST}
+
+def load_program(ctx: moderngl.Context, name: str, vertex: str|None = None) -> moderngl.Program:
+    # shaders/<name>.frag, with shaders/<name>.vert unless another vertex shader is named
+    with open(helper.resource_path(f"shaders/{vertex or name}.vert"), "r") as vert:
+        vertex_shader = vert.read()
+    with open(helper.resource_path(f"shaders/{name}.frag"), "r") as fragment:
+        fragment_shader = fragment.read()
+    return ctx.program(vertex_shader=vertex_shader, fragment_shader=fragment_shader)
+
+def normalized(color) -> tuple[float, float, float]:
+    return (color[0] / 255, color[1] / 255, color[2] / 255)
+
+class CircleBatch:
+    # the circles of one frame in an instance buffer, every viewport draws them from it
+
+    def __init__(self, ctx: moderngl.Context, program: moderngl.Program, corners: moderngl.Buffer, capacity: int = 256) -> None:
+        self.ctx = ctx
+        self.program = program
+        self.corners = corners
+        self.count = 0
+        self.allocate(capacity)
+
+    def allocate(self, capacity: int):
+        self.instances = np.zeros(capacity, INSTANCE)
+        self.buffer = self.ctx.buffer(reserve=capacity * INSTANCE.itemsize, dynamic=True)
+        self.renderer = self.ctx.vertex_array(self.program, [
+            (self.corners, '2f', 'corner'),
+            (self.buffer, INSTANCE_FORMAT, 'center', 'radius', 'minRadius', 'color')
+        ])
+
+    def set(self, groups: list[tuple[np.ndarray, np.ndarray|float, float, np.ndarray|tuple[int, int, int, int]]]):
+        # (world positions, radii, smallest radius on screen, rgba) groups in drawing order, later ones on top.
+        # radii and colours can be one value for the whole group
+        self.count = sum(len(centers) for centers, *_ in groups)
+        if self.count > len(self.instances):
+            self.release()
+            self.allocate(max(self.count, len(self.instances) * 2))
+
+        start = 0
+        for centers, radii, min_radius, colors in groups:
+            instances = self.instances[start:start + len(centers)]
+            instances["center"] = centers
+            instances["radius"] = radii
+            instances["min_radius"] = min_radius
+            instances["color"] = colors
+            start += len(centers)
+
+        if self.count:
+            self.buffer.orphan()
+            self.buffer.write(self.instances[:self.count])
+
+    def release(self):
+        self.renderer.release()
+        self.buffer.release()
+
+class GPUScene:
+    # the game frame put together on the GPU before the CRT pass, per viewport: the glows, the arena (voids, walls and
+    # the wall pulse, from a fragment shader) and every body and coin as one instanced draw. the HUD is the only part
+    # drawn on the CPU, it is uploaded and blended on top.
+    # with a render scale below 1 the viewports go into a smaller target first and are stretched over the frame, the HUD
+    # (text above all) stays sharp at the window's size.
+    # the frame's rows run top to bottom like an uploaded surface, so the CRT pass samples `texture` the same way
+
+    def __init__(self, ctx: moderngl.Context, size: tuple[int, int], render_scale: float = 1.0, upscale_filter: str = "linear") -> None:
+        self.ctx = ctx
+        self.render_scale = render_scale
+        self.upscale_filter = UPSCALE_FILTERS[upscale_filter]
+        self.texture: moderngl.Texture|None = None
+        self.fbo: moderngl.Framebuffer|None = None
+
+        self.corners = ctx.buffer(data=array.array('f', [-1.0, -1.0, 1.0, -1.0, -1.0, 1.0, 1.0, 1.0]))
+
+        self.layer_program = load_program(ctx, "layer")
+        self.layer_program['tex'] = 0
+        self.layer_program['opacity'] = 1.0
+        self.layer_renderer = ctx.vertex_array(self.layer_program, [(self.corners, '2f', 'vert')])
+        self.black = ctx.texture((1, 1), 4, data=bytes((0, 0, 0, 255)))
+
+        self.arena_program = load_program(ctx, "arena")
+        self.arena_program['voidColor'] = normalized(VOID_COLOR)
+        self.arena_renderer = ctx.vertex_array(self.arena_program, [(self.corners, '2f', 'vert')])
+
+        self.arena_program['renderScale'] = render_scale
+
+        self.circle_program = load_program(ctx, "circles")
+        self.circle_program['renderScale'] = render_scale
+        self.glows = CircleBatch(ctx, self.circle_program, self.corners, 4)
+        self.bodies = CircleBatch(ctx, self.circle_program, self.corners)
+
+        self.allocate(size)
+
+    def allocate(self, size: tuple[int, int]):
+        if self.fbo is not None:
+            self.release_targets()
+        self.size = (int(size[0]), int(size[1]))
+
+        self.texture = self.ctx.texture(self.size, 4)
+        self.texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        self.fbo = self.ctx.framebuffer(color_attachments=[self.texture])
+
+        # where the viewports are drawn, the frame itself at full scale
+        self.world_size = (max(1, round(self.size[0] * self.render_scale)), max(1, round(self.size[1] * self.render_scale)))
+        if self.world_size == self.size:
+            self.world_texture, self.world_fbo = self.texture, self.fbo
+        else:
+            self.world_texture = self.ctx.texture(self.world_size, 4)
+            self.world_texture.filter = (self.upscale_filter, self.upscale_filter)
+            # linear filtering would otherwise blend the top and bottom rows into each other
+            self.world_texture.repeat_x = self.world_texture.repeat_y = False
+            self.world_fbo = self.ctx.framebuffer(color_attachments=[self.world_texture])
+        self.circle_program['frameSize'] = self.world_size
+
+    def resize(self, size: tuple[int, int]):
+        if (int(size[0]), int(size[1])) != self.size:
+            self.allocate(size)
+
+    def scaled(self, viewport: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+        # window pixels -> pixels of the world target, neighbouring viewports still meet without a gap
+        x, y = round(viewport[0] * self.render_scale), round(viewport[1] * self.render_scale)
+        return (x, y, round((viewport[0] + viewport[2]) * self.render_scale) - x, round((viewport[1] + viewport[3]) * self.render_scale) - y)
+
+    def begin(self, color: tuple[int, int, int]):
+        self.world_fbo.use()
+        self.world_fbo.clear(*normalized(color), 1.0)
+
+    def draw_circles(self, batch: CircleBatch, cam: CameraSystem, viewport: tuple[int, int, int, int], opacity: float = 1.0):
+        # viewport: (x, y, width, height) of the camera's screen on the frame, nothing is drawn outside of it
+        if not batch.count:
+            return
+
+        self.circle_program['camCenter'] = tuple(cam.CAM_CENTER_ON)
+        self.circle_program['scale'] = cam.SCALE
+        self.circle_program['origin'] = (viewport[0] + cam.width//2, viewport[1] + cam.height//2)
+        self.circle_program['opacity'] = opacity
+        if opacity < 1:
+            self.ctx.enable(moderngl.BLEND)
+            self.ctx.blend_func = moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA
+
+        self.ctx.scissor = self.scaled(viewport)
+        batch.renderer.render(mode=moderngl.TRIANGLE_STRIP, instances=batch.count)
+        self.ctx.scissor = None
+        self.ctx.disable(moderngl.BLEND)
+
+    def draw_arena(self, cam: CameraSystem, viewport: tuple[int, int, int, int], void_dim: tuple[float, float, float, float], court_sizes: tuple[float, float],
+                   left_color: pygame.Color, right_color: pygame.Color, base_color: tuple[int, int, int], pulse: float, pulse_opacity: float):
+        # void dim: (top_void, bottom_void, left_void, right_void). pulse: how far the walls reach into the courts, world units
+        top_void, bottom_void, left_void, right_void = void_dim
+
+        self.arena_program['camCenter'] = tuple(cam.CAM_CENTER_ON)
+        self.arena_program['scale'] = cam.SCALE
+        self.arena_program['halfSize'] = (cam.width//2, cam.height//2)
+        self.arena_program['viewportStart'] = viewport[:2]
+        self.arena_program['voids'] = (left_void, right_void, top_void, bottom_void)
+        self.arena_program['courtSizes'] = court_sizes
+        self.arena_program['pulse'] = (pulse, pulse)
+        self.arena_program['pulseOpacity'] = pulse_opacity
+        self.arena_program['leftColor'] = normalized(left_color)
+        self.arena_program['rightColor'] = normalized(right_color)
+        self.arena_program['baseColor'] = normalized(base_color)
+
+        self.ctx.scissor = self.scaled(viewport)
+        self.arena_renderer.render(mode=moderngl.TRIANGLE_STRIP)
+        self.ctx.scissor = None
+
+    def upscale(self):
+        # the viewports over the whole frame, before the HUD goes on top
+        if self.world_fbo is not self.fbo:
+            self.fbo.use()
+            self.world_texture.use(0)
+            self.layer_renderer.render(mode=moderngl.TRIANGLE_STRIP)
+
+    def overlay(self, layer: moderngl.Texture, opacity: float = 1.0):
+        # alpha blended over everything drawn so far
+        self.fbo.use()
+        self.ctx.enable(moderngl.BLEND)
+        self.ctx.blend_func = moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA
+        self.layer_program['opacity'] = opacity
+        layer.use(0)
+        self.layer_renderer.render(mode=moderngl.TRIANGLE_STRIP)
+        self.layer_program['opacity'] = 1.0
+        self.ctx.disable(moderngl.BLEND)
+
+    def fade(self, opacity: float):
+        # the whole frame towards black, like the transition screen. blitting that onto the HUD layer would make it opaque
+        if opacity > 0:
+            self.overlay(self.black, opacity)
+
+    def read(self) -> pygame.Surface:
+        # the last frame put together, as a surface (pausing keeps it)
+        return pygame.image.frombytes(self.fbo.read(components=4), self.size, "RGBA")
+
+    def release(self):
+        self.glows.release()
+        self.bodies.release()
+        self.arena_renderer.release()
+        self.layer_renderer.release()
+        self.corners.release()
+        self.black.release()
+        self.release_targets()
+
+    def release_targets(self):
+        if self.world_fbo is not self.fbo:
+            self.world_fbo.release()
+            self.world_texture.release()
+        self.fbo.release()
+        self.texture.release()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# Gravity solvers for balls pulled by players and clones. Running the module prints how far Barnes-Hut is from
+# the direct sum and times both to find where the tree starts paying off (benchmarks/checks.py asserts the accuracy):
+#   uv run src/gravity.py
+import numpy as np
+
+SOLVERS = ("direct", "barnes_hut")
+
+THETA = 0.5 # opening angle, a cell is used as one point mass once its size / distance drops below this
+MAX_DEPTH = 10
+CHUNK = 256 # points per batch in the direct sum, bounds the (points, sources, 2) temporaries
+
+def cubed(x):
+    # not x ** 3: numpy's vectorised pow rounds differently from math.pow and from one CPU to the next, products
+    # don't. so a replay plays out the same on any machine, and plain floats match the arrays bit for bit
+    return x * x * x
+
+def direct(points: np.ndarray, ids: np.ndarray, sizes: np.ndarray, src_pos: np.ndarray, src_mass: np.ndarray, src_size: np.ndarray, src_ids: np.ndarray) -> np.ndarray:
+    # sum of m * d / |d|^3 from every source on every point, skipping sources the point touches or is
+    force = np.zeros((len(points), 2))
+    for i in range(0, len(points), CHUNK):
+        part = slice(i, i + CHUNK)
+        diff = src_pos[None, :, :] - points[part, None, :]
+        dist = np.sqrt(np.einsum("bsj,bsj->bs", diff, diff))
+        far = (dist > sizes[part, None] + src_size) & (ids[part, None] != src_ids)
+        strength = np.where(far, src_mass / cubed(np.where(far, dist, 1)), 0)
+        force[part] = np.einsum("bs,bsj->bj", strength, diff)
+    return force
+
+def morton(x: np.ndarray, y: np.ndarray, bits: int) -> np.ndarray:
+    code = np.zeros_like(x)
+    for bit in range(bits):
+        code |= (((x >> bit) & 1) << (2 * bit + 1)) | (((y >> bit) & 1) << (2 * bit))
+    return code
+
+class QuadTree:
+    # linear quadtree: sources are sorted by morton code, so every cell on every level is one contiguous run
+    # of that order. each level keeps its occupied cells with their run, total mass and centre of mass
+
+    def __init__(self, pos: np.ndarray, mass: np.ndarray, size: np.ndarray, ids: np.ndarray, max_depth: int = MAX_DEPTH) -> None:
+        # deep enough that a cell holds about one body on average, deeper levels would only be copies
+        max_depth = self.depth = min(max_depth, int(np.ceil(np.log(max(len(pos), 1)) / np.log(4))) + 2)
+
+        low = pos.min(0)
+        self.side = max(float((pos.max(0) - low).max()), 1e-9) * (1 + 1e-9)
+        cells = np.minimum(((pos - low) * ((1 << max_depth) / self.side)).astype(np.int64), (1 << max_depth) - 1)
+        code = morton(cells[:, 0], cells[:, 1], max_depth)
+
+        order = np.argsort(code, kind="stable")
+        code = code[order]
+        self.pos, self.mass, self.size, self.ids = pos[order], mass[order], size[order], ids[order]
+
+        # antigravity gives negative masses, which would cancel out inside one centre of mass,
+        # so every cell keeps a separate point mass for its attracting and its repelling bodies
+        signed = (np.maximum(self.mass, 0), np.minimum(self.mass, 0))
+
+        self.start: list[np.ndarray] = []
+        self.end: list[np.ndarray] = []
+        self.node_mass: list[tuple[np.ndarray, np.ndarray]] = []
+        self.center: list[tuple[np.ndarray, np.ndarray]] = []
+        for level in range(max_depth + 1):
+            prefix = code >> (2 * (max_depth - level))
+            start = np.flatnonzero(np.r_[True, prefix[1:] != prefix[:-1]])
+            mass = tuple(np.add.reduceat(part, start) for part in signed)
+
+            self.start.append(start)
+            self.end.append(np.r_[start[1:], len(code)])
+            self.node_mass.append(mass)
+            self.center.append(tuple(np.add.reduceat(self.pos * part[:, None], start) / np.where(total != 0, total, 1)[:, None] for part, total in zip(signed, mass)))
+
+    def force(self, points: np.ndarray, ids: np.ndarray, sizes: np.ndarray, theta: float = THETA) -> np.ndarray:
+        # same sum as direct(), walked top down for every point at once as a frontier of (point, cell) pairs
+        fx = np.zeros(len(points))
+        fy = np.zeros(len(points))
+
+        query = np.arange(len(points))
+        node = np.zeros(len(points), dtype=np.int64)
+        for level in range(self.depth + 1):
+            if len(query) == 0:
+                break
+
+            start, end = self.start[level][node], self.end[level][node]
+            single = (end - start) == 1
+
+            # one body: exact, with the same touching / same body rules as the direct sum
+            self.add_direct(fx, fy, query[single], start[single], points, ids, sizes)
+
+            # a whole cell far enough away acts as one point mass per sign, the opening test uses the nearer one
+            query, node, start, end = query[~single], node[~single], start[~single], end[~single]
+            lumps = []
+            for center, mass in zip(self.center[level], self.node_mass[level]):
+                diff = center[node] - points[query]
+                lumps.append((diff, np.sqrt(np.einsum("ij,ij->i", diff, diff)), mass[node]))
+            dist = np.minimum(*(np.where(mass != 0, dist, np.inf) for _, dist, mass in lumps))
+            opened = self.side / (1 << level) >= theta * dist
+
+            for diff, dist, mass in lumps:
+                far = ~opened & (dist > 0)
+                strength = np.where(far, mass / cubed(np.where(far, dist, 1)), 0)
+                fx += np.bincount(query, strength * diff[:, 0], minlength=len(points))
+                fy += np.bincount(query, strength * diff[:, 1], minlength=len(points))
+
+            query, start, end = query[opened], start[opened], end[opened]
+            if level == self.depth:
+                # bottom cells that still hold several bodies are summed body by body
+                count = end - start
+                bodies = np.repeat(start - (np.cumsum(count) - count), count) + np.arange(int(count.sum()))
+                self.add_direct(fx, fy, np.repeat(query, count), bodies, points, ids, sizes)
+                break
+
+            # children are the next level's cells whose run starts inside this one
+            lo = np.searchsorted(self.start[level + 1], start)
+            count = np.searchsorted(self.start[level + 1], end) - lo
+            node = np.repeat(lo - (np.cumsum(count) - count), count) + np.arange(int(count.sum()))
+            query = np.repeat(query, count)
+
+        return np.stack((fx, fy), axis=1)
+
+    def add_direct(self, fx: np.ndarray, fy: np.ndarray, query: np.ndarray, body: np.ndarray, points: np.ndarray, ids: np.ndarray, sizes: np.ndarray):
+        diff = self.pos[body] - points[query]
+        dist = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        far = (dist > sizes[query] + self.size[body]) & (ids[query] != self.ids[body])
+        strength = np.where(far, self.mass[body] / cubed(np.where(far, dist, 1)), 0)
+        fx += np.bincount(query, strength * diff[:, 0], minlength=len(fx))
+        fy += np.bincount(query, strength * diff[:, 1], minlength=len(fy))
+
+def barnes_hut(points: np.ndarray, ids: np.ndarray, sizes: np.ndarray, src_pos: np.ndarray, src_mass: np.ndarray, src_size: np.ndarray, src_ids: np.ndarray, theta: float = THETA) -> np.ndarray:
+    if len(src_pos) == 0:
+        return np.zeros((len(points), 2))
+    return QuadTree(src_pos, src_mass, src_size, src_ids).force(points, ids, sizes, theta)
+
+def scene(sources: int, balls: int, rng: np.random.Generator) -> tuple[tuple[np.ndarray, ...], tuple[np.ndarray, ...]]:
+    # a full arena of clone sized bodies, every tenth one anti gravity
+    src_mass = rng.integers(50, 1500, sources).astype(float)
+    src_mass[::10] *= -1
+    src = (rng.uniform((-5000, -3000), (5000, 3000), (sources, 2)), src_mass, rng.integers(10, 30, sources).astype(float), np.arange(sources) + 100)
+    ball = (rng.uniform((-5000, -3000), (5000, 3000), (balls, 2)), np.ones(balls, dtype=np.int64), np.full(balls, 20.0))
+    return ball, src
+
+def force_errors(thetas: tuple[float, ...], sources: int = 2000, balls: int = 500, seed: int = 0) -> dict[float, np.ndarray]:
+    # barnes_hut's error on every ball of a scene, per theta, as a fraction of the sum of |m| / d^2 over the sources.
+    # the pulls nearly cancel out on some balls, an error relative to what is left says little about the tree there
+    ball, src = scene(sources, balls, np.random.default_rng(seed))
+    exact = direct(*ball, *src)
+
+    diff = src[0][None, :, :] - ball[0][:, None, :]
+    dist = np.sqrt(np.einsum("bsj,bsj->bs", diff, diff))
+    far = (dist > ball[2][:, None] + src[2]) & (ball[1][:, None] != src[3])
+    scale = np.where(far, np.abs(src[1]) / np.where(far, dist, 1) ** 2, 0).sum(1)
+
+    return {theta: np.linalg.norm(barnes_hut(*ball, *src, theta=theta) - exact, axis=1) / scale for theta in thetas}
+
+if __name__ == "__main__":
+    import time
+
+    print("error / sum of |m| / d^2, 2000 sources on 500 balls")
+    for theta, error in force_errors((1.0, 0.7, 0.5, 0.3, 0.2)).items():
+        print(f"  theta {theta:.1f}: median {np.median(error):.2e}  p99 {np.quantile(error, 0.99):.2e}")
+    rng = np.random.default_rng(0)
+
+    print("time per call, sources = balls")
+    crossover = None
+    for n in (16, 32, 64, 128, 256, 512, 1024, 2048, 4096):
+        ball, src = scene(n, n, rng)
+        timings = []
+        for solver in (direct, barnes_hut):
+            runs = max(1, 2000 // n)
+            start = time.perf_counter()
+            for _ in range(runs):
+                solver(*ball, *src)
+            timings.append((time.perf_counter() - start) / runs * 1e3)
+        print(f"  {n:5d}: direct {timings[0]:8.2f} ms  barnes_hut {timings[1]:8.2f} ms")
+        if crossover is None and timings[1] < timings[0]:
+            crossover = n
+
+    print(f"barnes_hut wins from {crossover} bodies" if crossover else "barnes_hut never won")
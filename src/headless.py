@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# Plays a match without a window, mixer or GL context, as fast as the CPU allows.
+#   uv run src/headless.py --game-time 1200 --script inputs.json
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+
+import pygame, json, time, argparse
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+from match import Match
+from stepper import FixedStepper, DEFAULT_HZ
+from gravity import SOLVERS, THETA
+from replay import Replay
+
+class KeyInput(NamedTuple):
+    time: float # simulation seconds since the match started
+    key: int
+    down: bool
+
+# called before every step with the match, returns the (key, down) changes to apply
+Controller = Callable[[Match], Iterable[tuple[int, bool]]]
+
+def load_script(path: str) -> list[KeyInput]:
+    # [[0.0, "d", "down"], [1.5, "d", "up"], [2.0, "LSHIFT", "down"], ...], key names are pygame.K_* without the prefix
+    with open(path, "r") as script:
+        return [KeyInput(float(at), getattr(pygame, "K_" + key), state == "down") for at, key, state in json.loads(script.read())]
+
+def press(match: Match, key: int, down: bool):
+    if down:
+        match.key_down(key)
+    else:
+        match.key_up(key)
+
+def run_match(game_time: int = 1200, inputs: Iterable[KeyInput] = (), controller: Controller|None = None, physics_hz: int = DEFAULT_HZ, match: Match|None = None) -> Match:
+    match = match if match is not None else Match(game_time)
+    dt = FixedStepper(physics_hz).dt
+
+    inputs = sorted(inputs, key=lambda key_input: key_input.time)
+    next_input = 0
+
+    while not match.gameplay.winner:
+        while next_input < len(inputs) and inputs[next_input].time <= match.time:
+            press(match, inputs[next_input].key, inputs[next_input].down)
+            next_input += 1
+
+        if controller is not None:
+            for key, down in controller(match):
+                press(match, key, down)
+
+        match.step(dt)
+
+    return match
+
+def summary(match: Match) -> dict[str, int|float]:
+    return {
+        "winner": match.gameplay.winner,
+        "left_score": match.gameplay.left_score,
+        "right_score": match.gameplay.right_score,
+        "sim_time": round(match.time, 3)
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play a GravBall match headless, faster than real time")
+    parser.add_argument("--game-time", type=int, default=1200, help="match length in seconds (< 3600)")
+    parser.add_argument("--hz", type=int, default=DEFAULT_HZ, help="physics rate, 60 to 240")
+    parser.add_argument("--script", help="JSON list of [time, key name, 'down'|'up'] inputs")
+    parser.add_argument("--stress-bodies", type=int, default=0, help="extra bodies to load the arena with")
+    parser.add_argument("--stress-coins", type=int, default=0, help="extra coins to load the arena with")
+    parser.add_argument("--solver", choices=SOLVERS, default="direct", help="gravity solver for balls that touch nothing")
+    parser.add_argument("--theta", type=float, default=THETA, help="Barnes-Hut opening angle")
+    parser.add_argument("--seed", type=int, help="seed for every random choice in the match, random when left out")
+    parser.add_argument("--record", help="save the match as a replay here")
+    args = parser.parse_args()
+
+    match = Match(args.game_time, gravity_solver=args.solver, theta=args.theta, seed=args.seed)
+    match.add_stress(args.stress_bodies, args.stress_coins)
+
+    if args.record:
+        if args.stress_bodies or args.stress_coins:
+            parser.error("stress bodies and coins are not part of a replay, --record can't be used with them")
+        recording = Replay(match.seed, {"game_time": args.game_time, "physics_hz": FixedStepper(args.hz).hz, "gravity_solver": args.solver, "theta": args.theta})
+        match.record = recording.record
+
+    start = time.perf_counter()
+    match = run_match(args.game_time, load_script(args.script) if args.script else (), physics_hz=args.hz, match=match)
+    wall = time.perf_counter() - start
+
+    if args.record:
+        recording.steps = match.steps
+        recording.save(Path(args.record))
+
+    result = summary(match)
+    result["seed"] = match.seed
+    result["wall_time"] = round(wall, 3)
+    result["speedup"] = round(match.time / wall, 1)
+    print(json.dumps(result))
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
-import os
+import os, time
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+START = time.perf_counter()
 
-import pygame, json, math, moderngl, array, random
+import pygame, json, math, moderngl, array, argparse
+import numpy as np
 from pathlib import Path
 from platformdirs import user_config_dir
 from enum import Enum
@@ -10,12 +12,29 @@ pygame.init()
 
 import UI, audio_factory
 from camera import CameraSystem
-from gameplay import Gameplay, PowerUp
+from arena import ArenaCache
+from stepper import FixedStepper
+from frame_upload import FrameUploader
+from gpu_scene import GPUScene, UPSCALE_FILTERS
+from crt import CRTMask, CRT_SHADERS, CRT_UNIFORMS, BIG_SCAN_LINE_OPACITY
+from assets import ASSETS
+from profiler import FrameProfiler
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from gameplay import PowerUp
+from match import Match
+from replay import Replay, Playback
+from gravity import THETA
+from eventbus import SimEvent
 from pygame.math import Vector2
 from phybody import Body
-import phybody
 import userevents, helper
 
+COIN_COLOR = (245, 189, 2, 255)
+
+# frame rate while nothing on screen moves, only the shader's time is left to advance then
+IDLE_FPS = 30
+
 class States(Enum):
     MAIN_MENU_S = 0
     GAME_SCREEN_S = 1
@@ -25,21 +44,28 @@ class States(Enum):
     ABOUT_S = 5
 
 class GravClient:
-    def __init__(self, SET_FPS: int) -> None:
+    def __init__(self, SET_FPS: int, config: dict[str, str|list[int]|int|float]|None = None, replay: Replay|None = None) -> None:
+        # config: used instead of reading the player's config file when given (benchmarks)
+        # replay: a recorded match to play back instead of taking input, it starts as soon as the game is shown
         self.SET_FPS = SET_FPS
         self.FPS = SET_FPS
         self.delta = 0
+        self.shader_time = 0.0
+        self.redraw = True # main_display is out of date, set by input, resizes and state changes
 
         self.player_config: dict[str, str|list[int]|int|float]
         CONFIG_DIR = Path(user_config_dir("GravBall", "skandabhairava"))
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
         self.CONFIG_FILE = CONFIG_DIR / "GravBall_config.json"
-        try:
-            with open(self.CONFIG_FILE, "r") as config:
-                self.player_config = json.loads(config.read())
-        except FileNotFoundError:
-            self.fix_broken_config()
+        if config is not None:
+            self.player_config = dict(config)
+        else:
+            try:
+                with open(self.CONFIG_FILE, "r") as config_file:
+                    self.player_config = json.loads(config_file.read())
+            except FileNotFoundError:
+                self.fix_broken_config()
 
         if not isinstance(self.player_config["volume"], float|int):
             print(">> GAME: 'volume' in GravBall_config should be a float or int value")
@@ -78,7 +104,25 @@ class GravClient:
             print(">> GAME: 'postprocess' in GravBall_config should be an integer value. 0 -> to disable, any other int -> enable")
             exit()
         self.postprocess = bool(self.player_config["postprocess"])
+
+        # with post processing the viewports can be drawn at a fraction of the window's size and stretched over it
+        self.render_scale = self.player_config.get("render_scale", 1.0)
+        if not isinstance(self.render_scale, float|int) or not 0.25 <= self.render_scale <= 1:
+            print(">> GAME: 'render_scale' in GravBall_config should be a number between 0.25 and 1.0. 1.0 -> full resolution")
+            exit()
+        self.upscale_filter = self.player_config.get("upscale_filter", "linear")
+        if self.upscale_filter not in UPSCALE_FILTERS:
+            print(f">> GAME: 'upscale_filter' in GravBall_config should be one of: {', '.join(UPSCALE_FILTERS)}")
+            exit()
+        self.crt_quality = self.player_config.get("crt_quality", 1)
+        if not isinstance(self.crt_quality, int) or self.crt_quality not in CRT_SHADERS:
+            print(">> GAME: 'crt_quality' in GravBall_config should be 0, 1 or 2. 2 -> CRT effect worked out every frame, 1 -> partly baked, 0 -> fully baked, for slow GPUs")
+            exit()
+        self.crt_mask: CRTMask|None = None
         self.window: pygame.Surface
+        self.gpu_scene: GPUScene|None = None
+        self.gpu_composed = False # this frame's viewports were drawn into gpu_scene, the HUD layer still goes on top
+        self.gpu_fade = 0.0
         if self.postprocess:
             # enable OPEN GL and load a bunch of other stuff
             self.postprocess_enable()
@@ -90,29 +134,63 @@ class GravClient:
 
         pygame.display.set_caption("Grav Ball")
 
-        self.ball = Body(1, False, pygame.Color(255, 255, 255), Vector2(0, 0), Vector2(0, 0), 20, 50)
-        self.left_player = Body(2, True, self.left_color_ball, Vector2(-250, 0), Vector2(0, 0))
-        self.right_player = Body(3, True, self.right_color_ball, Vector2(250, 0), Vector2(0, 0))
-        
-        self.bodies: list[Body] = [
-            self.left_player, 
-            self.right_player,
-            self.ball
-        ]
+        if not isinstance(self.player_config["game_time"], int):
+            print(">> GAME: 'game_time' in GravBall_config should be an integer < 3600")
+            exit()
+
+        # the recording's own settings win over the player's, the match would play out differently otherwise
+        self.playback = Playback(replay) if replay else None
+        self.game_time: int = self.player_config["game_time"]
+        if replay:
+            self.match = replay.new_match(left_color=self.left_color_ball, right_color=self.right_color_ball)
+        else:
+            self.match = Match(self.game_time, self.left_color_ball, self.right_color_ball)
+        self.match.bus.subscribe(self.match_event, userevents.POWER_UP_GAIN_EVENT, userevents.POWER_UP_QUANTUM_COLLAPSED, userevents.WINNER_DECLARED)
+        #self.match = Match(15)
+
+        # these are never replaced during a match, so the renderer can keep hold of them
+        self.world = self.match.world
+        self.ball = self.match.ball
+        self.left_player = self.match.left_player
+        self.right_player = self.match.right_player
+        self.gameplay = self.match.gameplay
+
+        self.physics_hz = self.player_config.get("physics_hz", 120)
+        if not isinstance(self.physics_hz, int):
+            print(">> GAME: 'physics_hz' in GravBall_config should be an integer between 60 and 240")
+            exit()
+        self.stepper = FixedStepper(replay.config["physics_hz"] if replay else self.physics_hz)
+
+        # how many of the latest matches are kept as replays, older ones are deleted as new ones are saved
+        self.record_replays = self.player_config.get("record_replays", 0)
+        if not isinstance(self.record_replays, int) or self.record_replays < 0:
+            print(">> GAME: 'record_replays' in GravBall_config should be a positive integer, the number of latest matches kept as replays. 0 -> to disable")
+            exit()
+        self.recording: Replay|None = None
 
-        self.coins: list[phybody.Coin] = []
+        # F3 shows the frame time overlay, F4 saves the recorded frames next to the config
+        self.profiler = FrameProfiler()
+        self.world.lap = self.profiler.lap
 
-        self.acceleration = 0.2
+        minimap_hz = self.player_config.get("minimap_hz", 0)
+        if not isinstance(minimap_hz, int) or minimap_hz < 0:
+            print(">> GAME: 'minimap_hz' in GravBall_config should be a positive integer. 0 -> redraw every frame")
+            exit()
+        self.minimap_interval = 1 / minimap_hz if minimap_hz else 0.0
+        self.minimap_timer = 0.0
+
+        # without post processing both viewports and the minimap can be drawn at the same time on a few threads,
+        # pygame lets go of the GIL while it fills and blits (and free threaded builds don't have one)
+        render_threads = self.player_config.get("render_threads", 0)
+        if not isinstance(render_threads, int) or render_threads < 0:
+            print(">> GAME: 'render_threads' in GravBall_config should be a positive integer. 0 -> draw everything on the main thread")
+            exit()
+        self.render_pool = ThreadPoolExecutor(render_threads, thread_name_prefix="render") if render_threads else None
 
         pygame_map = {
-            "W": (pygame.K_w, lambda: self.left_player.add_mouse_y(self.acceleration), lambda: self.left_player.add_mouse_y(-self.acceleration)),
-            "A": (pygame.K_a, lambda: self.left_player.add_mouse_x(-self.acceleration), lambda: self.left_player.add_mouse_x(self.acceleration)),
-            "S": (pygame.K_s, lambda: self.left_player.add_mouse_y(-self.acceleration), lambda: self.left_player.add_mouse_y(self.acceleration)),
-            "D": (pygame.K_d, lambda: self.left_player.add_mouse_x(self.acceleration), lambda: self.left_player.add_mouse_x(-self.acceleration)),
-            "UP": (pygame.K_UP, lambda: self.right_player.add_mouse_y(self.acceleration), lambda: self.right_player.add_mouse_y(-self.acceleration)),
-            "DOWN": (pygame.K_DOWN, lambda: self.right_player.add_mouse_y(-self.acceleration), lambda: self.right_player.add_mouse_y(self.acceleration)),
-            "LEFT": (pygame.K_LEFT, lambda: self.right_player.add_mouse_x(-self.acceleration), lambda: self.right_player.add_mouse_x(self.acceleration)),
-            "RIGHT": (pygame.K_RIGHT, lambda: self.right_player.add_mouse_x(self.acceleration), lambda: self.right_player.add_mouse_x(-self.acceleration))
+            name: (key, lambda key=key: self.match.key_down(key), lambda key=key: self.match.key_up(key))
+            for name, key in (("W", pygame.K_w), ("A", pygame.K_a), ("S", pygame.K_s), ("D", pygame.K_d),
+                              ("UP", pygame.K_UP), ("DOWN", pygame.K_DOWN), ("LEFT", pygame.K_LEFT), ("RIGHT", pygame.K_RIGHT))
         }
 
         UI.define(pygame_map)
@@ -130,49 +208,23 @@ class GravClient:
         }
 
         self.sprites = {
-            "LEFT_CROWN": UI.Sprite.import_image("left_crown.png", (300, 300), lambda width, height: (width//2 - 250, height//2 - 20), (width, height)),
-            "RIGHT_CROWN": UI.Sprite.import_image("right_crown.png", (300, 300), lambda width, height: (width//2 + 250, height//2 - 20), (width, height)),
-            "COLOR_WHEEL": UI.Sprite(UI.COLOR_WHEEL, lambda width, height: (width//2 + 200, height//2 - 100), (width, height), False),
+            "LEFT_CROWN": UI.Sprite.import_image("left_crown.png", lambda width, height: (width//2 - 250, height//2 - 20), (width, height)),
+            "RIGHT_CROWN": UI.Sprite.import_image("right_crown.png", lambda width, height: (width//2 + 250, height//2 - 20), (width, height)),
+            "COLOR_WHEEL": UI.Sprite.import_image("colorwheel.png", lambda width, height: (width//2 + 200, height//2 - 100), (width, height)),
             "MAIN_TEXT": UI.Sprite(UI.MAIN_TEXT, lambda width, height: (width//2, height//2 - 200), (width, height), True),
             "PAUSE_TEXT": UI.Sprite(UI.PAUSED_TEXT, lambda width, height: (width//2, height//2 - 200), (width, height), True),
             "GAME_END_TEXT": UI.Sprite(UI.GAME_END_TEXT, lambda width, height: (width//2, height//2 - 200), (width, height), True),
         }
+        # decoded by the asset loader, drawn from there
         self.power_up_sprites = {
-            PowerUp.Quantum: pygame.transform.scale(pygame.image.load(helper.resource_path(f"images/powerups/quantum.png")).convert_alpha(), (100, 100)),
-            PowerUp.Grow: pygame.transform.scale(pygame.image.load(helper.resource_path(f"images/powerups/grow.png")).convert_alpha(), (100, 100)),
-            PowerUp.SpeedUp: pygame.transform.scale(pygame.image.load(helper.resource_path(f"images/powerups/speed.png")).convert_alpha(), (100, 100)),
-            PowerUp.AntiGravity: pygame.transform.scale(pygame.image.load(helper.resource_path(f"images/powerups/antigravity.png")).convert_alpha(), (100, 100)),
+            PowerUp.Quantum: UI.image_asset("powerups/quantum.png"),
+            PowerUp.Grow: UI.image_asset("powerups/grow.png"),
+            PowerUp.SpeedUp: UI.image_asset("powerups/speed.png"),
+            PowerUp.AntiGravity: UI.image_asset("powerups/antigravity.png"),
         }
 
-        self.about_text = UI.ScrollableWindow([
-            UI.Sprite(UI.multiple_texts(helper.ABOUT0, UI.normal_font), lambda width, height: (width//2-50, height//2), (width, height), True),
-            UI.Sprite(UI.multiple_texts(helper.ABOUT1, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
-            UI.Sprite.import_image("gravity_formula.png", (332, 167), lambda width, height: (width//2, height//2), (width, height)),
-            UI.Sprite(UI.multiple_texts(helper.ABOUT2, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
-            UI.Sprite(UI.multiple_texts(helper.ABOUT3, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
-            UI.Sprite(self.power_up_sprites[PowerUp.SpeedUp], lambda width, height: (width//2, height//2), (width, height), False),
-            UI.Sprite(UI.multiple_texts(helper.ABOUT3_speed, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
-            UI.Sprite(self.power_up_sprites[PowerUp.Grow], lambda width, height: (width//2, height//2), (width, height), False),
-            UI.Sprite(UI.multiple_texts(helper.ABOUT3_grow, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
-            UI.Sprite(self.power_up_sprites[PowerUp.AntiGravity], lambda width, height: (width//2, height//2), (width, height), False),
-            UI.Sprite(UI.multiple_texts(helper.ABOUT3_antigrav, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
-            UI.Sprite(self.power_up_sprites[PowerUp.Quantum], lambda width, height: (width//2, height//2), (width, height), False),
-            UI.Sprite(UI.multiple_texts(helper.ABOUT3_quantum, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
-            UI.Sprite.import_image("uncertainity.png", (337, 149), lambda width, height: (width//2, height//2), (width, height)),
-            UI.Sprite(UI.multiple_texts(helper.ABOUT4, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
-            UI.Button("Back to Menu", UI.normal_font, (UI.button_width, UI.button_height), lambda width, height: (width//2, height//2), (width, height), lambda: self.change_state(States.MAIN_MENU_S), self.global_button_click)
-        ], (width, height))
-
-        self.top_void = 3000
-        self.bottom_void = -self.top_void
-        self.left_void = -5000
-        self.right_void = -self.left_void
-        self.left_court_size = 500
-        self.right_court_size = self.left_court_size
-
-        self.left_power_anim = UI.Animation(0, 100, (6))
-        self.right_power_anim = UI.Animation(0, 100, (6))
-        self.coin_boost = 60*20
+        # built the first time the about page is opened
+        self.about_text: UI.ScrollableWindow|None = None
 
         self.left_screen = pygame.Surface((width//2, height))
         self.left_rect = self.left_screen.get_bounding_rect()
@@ -190,13 +242,20 @@ class GravClient:
         self.right_cam = CameraSystem((self.right_player.pos.x, self.right_player.pos.y), 1, (width//2, height))
 
         self.minimap_height = 100
-        minimap_aspect_ratio = (self.right_void - self.left_void)/(self.top_void - self.bottom_void) #width/height
+        minimap_aspect_ratio = (self.match.right_void - self.match.left_void)/(self.match.top_void - self.match.bottom_void) #width/height
         self.minimap_width = self.minimap_height * minimap_aspect_ratio
-        self.center_cam = CameraSystem((0, 0), self.minimap_height/(self.top_void-self.bottom_void), (self.minimap_width, self.minimap_height))
+        self.center_cam = CameraSystem((0, 0), self.minimap_height/(self.match.top_void-self.match.bottom_void), (self.minimap_width, self.minimap_height))
+        # one cache per surface drawn into: SDL remaps a surface for every new destination it is blitted to,
+        # and the viewports couldn't be drawn on two threads at once with a shared one
+        self.minimap_arena_cache = ArenaCache()
+        self.left_arena_cache = ArenaCache()
+        self.right_arena_cache = ArenaCache()
         self.center_screen = pygame.Surface((self.minimap_width, self.minimap_height))
+        self.minimap_background = pygame.Surface((self.minimap_width, self.minimap_height))
 
         self.anim = pygame.Surface((width, height))
-        self.half_anim = pygame.Surface((width//2, height))
+        self.left_anim = pygame.Surface((width//2, height))
+        self.right_anim = pygame.Surface((width//2, height))
 
         self.transition_screen = pygame.Surface((width, height))
         self.transition = UI.Animation(0, 100, (60 * 6))
@@ -206,30 +265,54 @@ class GravClient:
         self.anim_ball_revol_mainmenu = UI.Animation(0, UI.set_anim_ball_revol_mainmenu, (60))
         self.anim_ball_comeback = UI.Animation(0, UI.set_anim_ball_comeback, 60)
 
-        if not isinstance(self.player_config["game_time"], int):
-            print(">> GAME: 'game_time' in GravBall_config should be an integer < 3600")
-            exit()
-        self.gameplay = Gameplay(self.player_config["game_time"], userevents.WINNER_DECLARED, userevents.POWER_UP_GAIN_EVENT, userevents.POWER_UP_DESTROY_EVENT)
-        #self.gameplay = Gameplay(15, WINNER_DECLARED)
-
         self.input_keys = UI.KEYS_IMAGE
-        self.LEFT_DPAD = pygame.Surface((254, 166))
-        self.LEFT_DPAD.set_colorkey(self.base_color)
 
-        self.RIGHT_DPAD = pygame.Surface((254, 166))
-        self.RIGHT_DPAD.set_colorkey(self.base_color)
+        # every pressed / released combination of a pad is drawn up front, a key event only flips a bit
+        # pad keys in bit order: up, left, down, right
+        self.dpad_keys = ((pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d), (pygame.K_UP, pygame.K_LEFT, pygame.K_DOWN, pygame.K_RIGHT))
+        self.dpad_bits = {key: (pad, 1 << bit) for pad, keys in enumerate(self.dpad_keys) for bit, key in enumerate(keys)}
+        self.dpad_masks = [0, 0]
+        self.dpad_sprites: list[list[pygame.Surface]]|None = None # drawn with the first game frame
 
-        self.blit_dpads()
+        # that is all the main menu needs, the rest of the sounds and images decode in the background from here
+        ASSETS.preload()
 
         #self.lock = threading.Lock()
 
+    def build_about_text(self, width: float, height: float) -> UI.ScrollableWindow:
+        return UI.ScrollableWindow([
+            UI.Sprite(UI.multiple_texts(helper.ABOUT0, UI.normal_font), lambda width, height: (width//2-50, height//2), (width, height), True),
+            UI.Sprite(UI.multiple_texts(helper.ABOUT1, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
+            UI.Sprite.import_image("gravity_formula.png", lambda width, height: (width//2, height//2), (width, height)),
+            UI.Sprite(UI.multiple_texts(helper.ABOUT2, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
+            UI.Sprite(UI.multiple_texts(helper.ABOUT3, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
+            UI.Sprite(None, lambda width, height: (width//2, height//2), (width, height), False, self.power_up_sprites[PowerUp.SpeedUp], (100, 100)),
+            UI.Sprite(UI.multiple_texts(helper.ABOUT3_speed, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
+            UI.Sprite(None, lambda width, height: (width//2, height//2), (width, height), False, self.power_up_sprites[PowerUp.Grow], (100, 100)),
+            UI.Sprite(UI.multiple_texts(helper.ABOUT3_grow, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
+            UI.Sprite(None, lambda width, height: (width//2, height//2), (width, height), False, self.power_up_sprites[PowerUp.AntiGravity], (100, 100)),
+            UI.Sprite(UI.multiple_texts(helper.ABOUT3_antigrav, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
+            UI.Sprite(None, lambda width, height: (width//2, height//2), (width, height), False, self.power_up_sprites[PowerUp.Quantum], (100, 100)),
+            UI.Sprite(UI.multiple_texts(helper.ABOUT3_quantum, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
+            UI.Sprite.import_image("uncertainity.png", lambda width, height: (width//2, height//2), (width, height)),
+            UI.Sprite(UI.multiple_texts(helper.ABOUT4, UI.small_font), lambda width, height: (width//2, height//2), (width, height), True),
+            UI.Button("Back to Menu", UI.normal_font, (UI.button_width, UI.button_height), lambda width, height: (width//2, height//2), (width, height), lambda: self.change_state(States.MAIN_MENU_S), self.global_button_click)
+        ], (width, height), self.base_color)
+
     def fix_broken_config(self):
         self.player_config = {
                 "color": [228, 93, 37],
                 "opposite_color": [37, 140, 228],
                 "postprocess": 1,
                 "volume": 0.1,
-                "game_time": 1200
+                "game_time": 1200,
+                "physics_hz": 120,
+                "minimap_hz": 0,
+                "record_replays": 0,
+                "render_scale": 1.0,
+                "upscale_filter": "linear",
+                "crt_quality": 1,
+                "render_threads": 0
             }
         with open(self.CONFIG_FILE, "w") as config:
             config.write(json.dumps(self.player_config))
@@ -245,7 +328,8 @@ class GravClient:
             -1.0, -1.0, 0.0, 1.0, # bottom left
              1.0, -1.0, 1.0, 1.0  # bottom right
         ]))
-        with open(helper.resource_path("shaders/shader.frag"), "r") as fragment:
+        # below the highest quality the CRT pass reads what never changes from a baked mask
+        with open(helper.resource_path(f"shaders/{CRT_SHADERS[self.crt_quality]}.frag"), "r") as fragment:
             fragment_shader = fragment.read()
         with open(helper.resource_path("shaders/shader.vert"), "r") as vert:
             vertex_shader = vert.read()
@@ -255,23 +339,62 @@ class GravClient:
 
         # OPENGL EFFECTS UNIFORMS
         self.opengl_program['tex'] = 0
-        self.opengl_program['curvature'] = 4.0, 3.0
-        self.opengl_program['scanLineOpacity'] = 0.05, 0.05
-        self.opengl_program['screenResolution'] = self.window.get_size()
-        self.opengl_program['vignetteRoundness'] = 2.0
-        self.opengl_program['bigScanLineOpacity'] = 0.01
-        self.opengl_program['vignetteOpacity'] = UI.OPENGL_VIGNETTE_OPACITY
-        self.opengl_program['brightness'] = UI.OPENGL_BRIGHTNESS
-
-    def surface_to_texture(self, surface: pygame.Surface) -> moderngl.Texture:
-        tex = self.opengl_ctx.texture(surface.get_size(), 4)
-        tex.filter = (moderngl.NEAREST, moderngl.NEAREST)
-        tex.swizzle = 'BGRA'
-        tex.write(surface.get_view('1'))
-        return tex
+        if self.crt_quality > 0:
+            self.opengl_program['bigScanLineOpacity'] = BIG_SCAN_LINE_OPACITY
+        if self.crt_quality == 2:
+            for name, value in CRT_UNIFORMS.items():
+                self.opengl_program[name] = value
+            self.opengl_program['screenResolution'] = self.window.get_size()
+        else:
+            self.opengl_program['crtMask'] = 1
+            self.crt_mask = CRTMask(self.opengl_ctx, self.quad_buffer, self.window.get_size(), self.crt_quality)
+
+        self.frame_uploader = FrameUploader(self.opengl_ctx, self.main_display.get_size())
+
+        # in game the bodies and coins are drawn by the GPU, over main_display and under the HUD, which gets its own layer
+        self.gpu_scene = GPUScene(self.opengl_ctx, self.main_display.get_size(), self.render_scale, self.upscale_filter)
+        self.hud_display = pygame.Surface(self.main_display.get_size(), pygame.SRCALPHA)
+        self.hud_uploader = FrameUploader(self.opengl_ctx, self.main_display.get_size())
+
+    def export_profile(self):
+        path = self.CONFIG_FILE.parent / "profiles" / f"frames-{datetime.now():%Y%m%d-%H%M%S}"
+        self.profiler.export(path.with_suffix(".csv"))
+        self.profiler.export(path.with_suffix(".json"))
+        print(f">> GAME: Frame profile saved to: {path}.csv / .json")
+
+    def start_recording(self):
+        self.recording = Replay(self.match.seed, {"game_time": self.gameplay.max_time, "physics_hz": self.stepper.hz})
+        self.match.record = self.recording.record
+
+    def save_recording(self):
+        # finished and abandoned matches both get saved, next to the config
+        if self.recording is None:
+            return
+
+        self.recording.steps = self.match.steps
+        folder = self.CONFIG_FILE.parent / "replays"
+        path = folder / f"match-{datetime.now():%Y%m%d-%H%M%S}.gbr"
+        self.recording.save(path)
+        print(f">> GAME: Replay saved to: {path}")
+
+        # the names sort by the time they were saved at, only the latest record_replays are kept
+        for old in sorted(folder.glob("match-*.gbr"))[:-self.record_replays]:
+            old.unlink(missing_ok=True)
+
+        self.recording = None
+        self.match.record = None
+
+    def end_playback(self):
+        # the recorded match is over, the next one is played for real with the player's own settings
+        self.playback = None
+        self.gameplay.max_time = self.game_time
+        self.world.gravity_solver = "direct"
+        self.world.theta = THETA
+        self.stepper = FixedStepper(self.physics_hz)
 
     def quit(self):
-        pygame.mixer.stop()
+        self.save_recording()
+        audio_factory.stop(music=True)
         print(">> GAME: SHUTTING DOWN")
 
     def change_state(self, new_state: States) -> None:
@@ -285,91 +408,89 @@ class GravClient:
         match new_state:
 
             case States.PAUSE_MENU_S: #if self.STATE == States.GAME_SCREEN_S: #pause #commenting this line, as u can only pause from the game screen
-                pygame.time.set_timer(userevents.GAME_TICK_SECOND, 0)
-                self.pause_window.blit(self.main_display, (0, 0))
+                # main_display misses the bodies and the HUD when the GPU put the last frame together
+                self.pause_window.blit(self.gpu_scene.read() if self.gpu_scene is not None else self.main_display, (0, 0))
                 self.pause_window.blit(self.pause_screen, (0, 0))
 
             ##########################################################################################################
             case States.GAME_SCREEN_S if self.STATE in (States.MAIN_MENU_S, States.OPTION_MENU_S):
                 print(">> GAME: STARTED")
-                pygame.mixer.stop()
-                audio_factory.AUDIO_LIBRARY["GAME_LOOP"].play(-1)
-                pygame.time.set_timer(userevents.GAME_TICK_SECOND, 1000)
+                if self.record_replays and not self.playback:
+                    self.start_recording()
+                audio_factory.stop()
+                audio_factory.play("GAME_LOOP", -1)
                 self.transition.set_message(None)
-
-            case States.GAME_SCREEN_S if self.STATE == States.PAUSE_MENU_S: # unpause
-                pygame.time.set_timer(userevents.GAME_TICK_SECOND, 1000)
             ##########################################################################################################
 
             case States.MAIN_MENU_S if self.STATE in (States.GAME_SCREEN_S, States.PAUSE_MENU_S, States.GAME_END_S):
                 print(">> GAME: EXITED")
+                self.save_recording()
+                if self.playback:
+                    self.end_playback()
                 self.reset_game()
 
-                pygame.mixer.stop()
-                audio_factory.AUDIO_LIBRARY["MAIN_MENU"].play(-1)
-                pygame.time.set_timer(userevents.GAME_TICK_SECOND, 0)
+                audio_factory.stop()
+                audio_factory.play("MAIN_MENU", -1)
 
                 self.transition.set_message(None)
             ##########################################################################################################
 
             case States.GAME_END_S: #if self.STATE in (States.GAME_SCREEN_S, States.PAUSE_MENU_S): # commented this line, as GAME_END can only happen during GAME_SCREEN_S
                 print(">> GAME: ENDED")
-                pygame.mixer.stop()
-                audio_factory.AUDIO_LIBRARY["MAIN_MENU"].play(-1)
-                pygame.time.set_timer(userevents.GAME_TICK_SECOND, 0)
+                self.save_recording()
+                audio_factory.stop()
+                audio_factory.play("MAIN_MENU", -1)
                 self.transition.set_message(None)
             ##########################################################################################################
 
             case States.ABOUT_S:
+                if self.about_text is None:
+                    self.about_text = self.build_about_text(*self.main_display.get_size())
                 self.about_text.scroll_length = self.about_text.first_scroll
 
         self.STATE = new_state
+        self.redraw = True
     
     def set_colors(self):
         self.left_color_ball = self.left_color.correct_gamma(2)
         self.left_color_wall = self.left_color.correct_gamma(0.8)
         self.right_color_ball = self.right_color.correct_gamma(2)
         self.right_color_wall = self.right_color.correct_gamma(0.8)
-
-    def blit_dpads(self):
-        self.LEFT_DPAD = pygame.transform.scale_by(self.LEFT_DPAD, 2)
-        self.LEFT_DPAD.fill(self.base_color)
-        self.LEFT_DPAD.blit(self.input_keys[pygame.K_w][0], (254//2 - 78//2, 0))
-        self.LEFT_DPAD.blit(self.input_keys[pygame.K_a][0], (0, 78+10))
-        self.LEFT_DPAD.blit(self.input_keys[pygame.K_s][0], (254//2 - 78//2, 78+10))
-        self.LEFT_DPAD.blit(self.input_keys[pygame.K_d][0], (254 - 78, 78+10))
-        self.LEFT_DPAD = pygame.transform.scale_by(self.LEFT_DPAD, 0.5)
-
-        self.RIGHT_DPAD = pygame.transform.scale_by(self.RIGHT_DPAD, 2)
-        self.RIGHT_DPAD.fill(self.base_color)
-        self.RIGHT_DPAD.blit(self.input_keys[pygame.K_UP][0], (254//2 - 78//2, 0))
-        self.RIGHT_DPAD.blit(self.input_keys[pygame.K_LEFT][0], (0, 78+10))
-        self.RIGHT_DPAD.blit(self.input_keys[pygame.K_DOWN][0], (254//2 - 78//2, 78+10))
-        self.RIGHT_DPAD.blit(self.input_keys[pygame.K_RIGHT][0], (254 - 78, 78+10))
-        self.RIGHT_DPAD = pygame.transform.scale_by(self.RIGHT_DPAD, 0.5)
+        self.minimap_dirty = True # walls changed colour, the minimap background has to be drawn again
+
+    def render_dpads(self, keys: tuple[int, int, int, int]) -> list[pygame.Surface]:
+        slots = ((254//2 - 78//2, 0), (0, 78+10), (254//2 - 78//2, 78+10), (254 - 78, 78+10))
+
+        sprites = []
+        for mask in range(16):
+            pad = pygame.Surface((254 * 2, 166 * 2))
+            pad.fill(self.base_color)
+            for bit, (key, slot) in enumerate(zip(keys, slots)):
+                image = ASSETS.get(self.input_keys[key][0])
+                image.set_alpha(255 if mask & (1 << bit) else 50)
+                pad.blit(image, slot)
+                image.set_alpha(50)
+
+            pad = pygame.transform.scale_by(pad, 0.5)
+            pad.set_colorkey(self.base_color)
+            sprites.append(pad)
+
+        return sprites
+
+    def set_dpad_key(self, key: int, down: bool):
+        pad, bit = self.dpad_bits[key]
+        if down:
+            self.dpad_masks[pad] |= bit
+        else:
+            self.dpad_masks[pad] &= ~bit
 
     def reset_game(self):
-        self.left_player.reset((-250, 0))
-        #self.left_player.color = self.left_color_ball
-
-        self.right_player.reset((250, 0))
-        #self.right_player.color = self.right_color_ball
-
-        self.ball.reset((0, 0))
-
-        self.bodies: list[Body] = [
-            self.left_player, 
-            self.right_player,
-            self.ball
-        ]
+        self.match.reset()
 
         self.left_cam.reset((self.left_player.pos.x, self.left_player.pos.y))
         self.right_cam.reset((self.right_player.pos.x, self.right_player.pos.y))
 
-        self.left_power_anim.frame = self.left_power_anim.min
-        self.right_power_anim.frame = self.right_power_anim.min
-
-        self.gameplay.reset()
+        self.stepper.reset()
 
     def resize(self, new_size: tuple[float, float]) -> None:
         width, height = new_size
@@ -378,7 +499,8 @@ class GravClient:
         self.pause_screen = pygame.transform.scale(self.pause_screen, new_size)
         self.transition_screen = pygame.transform.scale(self.transition_screen, new_size)
 
-        self.half_anim = pygame.transform.scale(self.half_anim, (width//2, height))
+        self.left_anim = pygame.transform.scale(self.left_anim, (width//2, height))
+        self.right_anim = pygame.transform.scale(self.right_anim, (width//2, height))
         
         self.left_screen = pygame.transform.scale(self.left_screen, (width//2, height))
         self.left_rect = self.left_screen.get_bounding_rect()
@@ -394,7 +516,8 @@ class GravClient:
         for sprite in self.sprites.values():
             sprite.resize(width, height)
 
-        self.about_text.resize(width, height)
+        if self.about_text is not None:
+            self.about_text.resize(width, height)
 
         self.pause_window = pygame.transform.scale(self.pause_window, new_size)
         if self.STATE == States.PAUSE_MENU_S: # if paused
@@ -402,61 +525,85 @@ class GravClient:
             self.pause_window.blit(self.pause_screen, (0, 0))
 
         if self.postprocess:
-            self.opengl_program['screenResolution'] = new_size
-
-    def draw_glow(self, cam: CameraSystem, display: pygame.Surface, player: Body, rect: pygame.Rect):
-        body_pos = (cam.calc_pos_x(player.pos.x), cam.calc_pos_y(player.pos.y))
-        if rect.collidepoint(body_pos):
-            pygame.draw.circle(display, player.color, body_pos, max(player.size * cam.SCALE * (self.game_anims.frame * 0.03), player.size * cam.SCALE))
-
-    def game_draw(self, display: pygame.Surface, width: float, height: float):
-        self.left_screen.fill(self.base_color)
-        self.right_screen.fill(self.base_color)        
-
-        # setup animation
-        self.half_anim.set_alpha(int((-200// self.game_anims.max ) * self.game_anims.frame) + 200)
-        self.transition_screen.set_alpha(int(2.55 * self.transition.frame))
-
-        self.left_cam.follow((self.left_player.pos.x, self.left_player.pos.y), self.delta)
-        self.right_cam.follow((self.right_player.pos.x, self.right_player.pos.y), self.delta)
-
-        self.left_cam.zoom(self.delta*0.5)
-        self.right_cam.zoom(self.delta*0.5)
-
-        for (cam, screen, rect) in ((self.left_cam, self.left_screen, self.left_rect), (self.right_cam, self.right_screen, self.right_rect)):
-            left_void_pos =  cam.calc_pos_x(self.left_void)
-            right_void_pos = cam.calc_pos_x(self.right_void)
-            left_wall_pos = cam.calc_pos_x(self.left_void + self.left_court_size)
-            right_wall_pos = cam.calc_pos_x(self.right_void - self.right_court_size)
-            top_void_pos = cam.calc_pos_y(self.top_void)
-            bottom_void_pos = cam.calc_pos_y(self.bottom_void)
-            
-            LEFT_WALL = (left_void_pos, 0, left_wall_pos-left_void_pos, height)
-            RIGHT_WALL = (right_wall_pos, 0, right_void_pos - right_wall_pos, height)
-
-            self.half_anim.fill(self.base_color)
-
-            match self.gameplay.left_power:
+            if self.crt_mask is not None:
+                self.crt_mask.resize(new_size)
+            else:
+                self.opengl_program['screenResolution'] = new_size
+            self.frame_uploader.resize(self.main_display.get_size())
+            self.gpu_scene.resize(self.main_display.get_size())
+            self.hud_display = pygame.Surface(self.main_display.get_size(), pygame.SRCALPHA)
+            self.hud_uploader.resize(self.main_display.get_size())
+
+        self.redraw = True
+
+    def draw_glow(self, cam: CameraSystem, display: pygame.Surface, player: Body, render_pos):
+        (body_pos,), (radius,), (visible,) = cam.transform(render_pos[player.row:player.row+1], player.size * max(self.game_anims.frame * 0.03, 1))
+        if visible:
+            pygame.draw.circle(display, player.color, body_pos.tolist(), radius)
+
+    def draw_minimap(self, rows: np.ndarray, body_pos: np.ndarray, body_colors: np.ndarray):
+        # center_cam never moves, the arena is drawn once and only the dots go on top of it every refresh
+        if self.minimap_dirty:
+            self.minimap_background.fill(self.base_color)
+            self.minimap_arena_cache.draw(self.minimap_background, self.center_cam, self.match.void_dim, (self.match.left_court_size, self.match.right_court_size), self.left_color_wall, self.right_color_wall)
+            self.minimap_dirty = False
+
+        self.center_screen.blit(self.minimap_background, (0, 0))
+
+        # the whole arena fits on the minimap, nothing to cull. clones are left out
+        shown = self.world.is_clone[rows] == 0
+        screen_pos, _, _ = self.center_cam.transform(body_pos[shown])
+        for is_player, color, pos in zip(self.world.is_player[rows[shown]].tolist(), body_colors[shown].tolist(), screen_pos.tolist()):
+            pygame.draw.circle(self.center_screen, color, pos, 5 if is_player else 3)
+
+        coin_pos, _, _ = self.center_cam.transform(self.match.coins.positions)
+        for pos in coin_pos.tolist():
+            pygame.draw.circle(self.center_screen, COIN_COLOR, pos, 1)
+
+    def glowing_players(self) -> list[Body]:
+        # the grow power up always glows, the glow flag only while the player is shown
+        glowing = []
+        for player, power in ((self.left_player, self.gameplay.left_power), (self.right_player, self.gameplay.right_power)):
+            match power:
                 case (PowerUp.Grow, _):
-                    self.draw_glow(cam, self.half_anim, self.left_player, rect)
-            if (self.left_player.glow and not self.left_player.hidden):
-                self.draw_glow(cam, self.half_anim, self.left_player, rect)
+                    glowing.append(player)
+                    continue
+            if player.glow and not player.hidden:
+                glowing.append(player)
+        return glowing
+
+    def draw_viewport(self, cam: CameraSystem, screen: pygame.Surface, rect: pygame.Rect, anim: pygame.Surface, arena_cache: ArenaCache,
+                      render_pos: np.ndarray, body_pos: np.ndarray, body_sizes: np.ndarray, colors: list, coin_pos: np.ndarray, width: float, height: float):
+        # one viewport on the CPU, touching nothing but its own surfaces and cache so the two can be drawn on separate threads
+        screen.fill(self.base_color)
+
+        left_void_pos =  cam.calc_pos_x(self.match.left_void)
+        right_void_pos = cam.calc_pos_x(self.match.right_void)
+        left_wall_pos = cam.calc_pos_x(self.match.left_void + self.match.left_court_size)
+        right_wall_pos = cam.calc_pos_x(self.match.right_void - self.match.right_court_size)
+        top_void_pos = cam.calc_pos_y(self.match.top_void)
+        bottom_void_pos = cam.calc_pos_y(self.match.bottom_void)
+        
+        LEFT_WALL = (left_void_pos, 0, left_wall_pos-left_void_pos, height)
+        RIGHT_WALL = (right_wall_pos, 0, right_void_pos - right_wall_pos, height)
 
-            match self.gameplay.right_power:
-                case (PowerUp.Grow, _):
-                    self.draw_glow(cam, self.half_anim, self.right_player, rect)
-            if (self.right_player.glow and not self.right_player.hidden):
-                self.draw_glow(cam, self.half_anim, self.right_player, rect)
+        anim.fill(self.base_color)
 
-            left_anim_wall_pos = cam.calc_pos_x(self.left_void + self.left_court_size + (self.game_anims.frame * 4))
-            right_anim_wall_pos = cam.calc_pos_x(self.right_void - self.right_court_size - (self.game_anims.frame * 4))
-            if left_anim_wall_pos > rect.left:
-                pygame.draw.rect(self.half_anim, self.left_color_wall, (left_wall_pos, 0, left_anim_wall_pos-left_wall_pos, height))
-            if right_anim_wall_pos < rect.right:
-                pygame.draw.rect(self.half_anim, self.right_color_wall, (right_anim_wall_pos, 0, right_wall_pos-right_anim_wall_pos, height))
+        for player in self.glowing_players():
+            self.draw_glow(cam, anim, player, render_pos)
 
-            screen.blit(self.half_anim, (0,0))    # draw animation onto screen
+        left_anim_wall_pos = cam.calc_pos_x(self.match.left_void + self.match.left_court_size + (self.game_anims.frame * 4))
+        right_anim_wall_pos = cam.calc_pos_x(self.match.right_void - self.match.right_court_size - (self.game_anims.frame * 4))
+        if left_anim_wall_pos > rect.left:
+            pygame.draw.rect(anim, self.left_color_wall, (left_wall_pos, 0, left_anim_wall_pos-left_wall_pos, height))
+        if right_anim_wall_pos < rect.right:
+            pygame.draw.rect(anim, self.right_color_wall, (right_anim_wall_pos, 0, right_wall_pos-right_anim_wall_pos, height))
 
+        screen.blit(anim, (0,0))    # draw animation onto screen
+
+        if not cam.is_zooming:
+            arena_cache.draw(screen, cam, self.match.void_dim, (self.match.left_court_size, self.match.right_court_size), self.left_color_wall, self.right_color_wall)
+        else:
             if left_void_pos > rect.left:
                 pygame.draw.rect(screen, (20, 20, 20), (0, 0, left_void_pos, height))
             if right_void_pos < rect.right:
@@ -470,81 +617,116 @@ class GravClient:
             if bottom_void_pos < rect.bottom:
                 pygame.draw.rect(screen, (20, 20, 20), (0, bottom_void_pos, width//2, height))
 
-            for body in self.bodies:
-                if body.hidden:
-                    continue
+        screen_pos, radii, visible = cam.transform(body_pos, body_sizes, min_radius=2)
+        for i in np.flatnonzero(visible).tolist():
+            pygame.draw.circle(screen, colors[i], screen_pos[i].tolist(), radii[i])
 
-                body_pos = (cam.calc_pos_x(body.pos.x), cam.calc_pos_y(body.pos.y))
-                if rect.collidepoint(body_pos):
-                    pygame.draw.circle(screen, body.color, body_pos, max(body.size * cam.SCALE, 2))
-
-            for coin in self.coins:
-                coin_pos = (cam.calc_pos_x(coin.pos.x), cam.calc_pos_y(coin.pos.y))
-                if rect.collidepoint(coin_pos):
-                    pygame.draw.circle(screen, (245, 189, 2), coin_pos, max(15 * cam.SCALE, 1))
-
-        # draw on minimap
-        self.center_screen.fill(self.base_color)
-        left_void_pos =  self.center_cam.calc_pos_x(self.left_void)
-        right_void_pos = self.center_cam.calc_pos_x(self.right_void)
-        left_wall_pos = self.center_cam.calc_pos_x(self.left_void + self.left_court_size)
-        right_wall_pos = self.center_cam.calc_pos_x(self.right_void - self.right_court_size)
-        top_void_pos = self.center_cam.calc_pos_y(self.top_void)
-        bottom_void_pos = self.center_cam.calc_pos_y(self.bottom_void)
-
-        #print(left_void_pos, right_void_pos, left_wall_pos, right_wall_pos, top_void_pos, bottom_void_pos)
-        
-        LEFT_WALL = (left_void_pos, 0, left_wall_pos-left_void_pos, self.minimap_height)
-        RIGHT_WALL = (right_wall_pos, 0, right_void_pos - right_wall_pos, self.minimap_height)
-
-        pygame.draw.rect(self.center_screen, (20, 20, 20), (0, 0, left_void_pos, self.minimap_height))
-        pygame.draw.rect(self.center_screen, (20, 20, 20), (right_void_pos, 0, self.minimap_width, self.minimap_height))
-        pygame.draw.rect(self.center_screen, self.left_color_wall, LEFT_WALL)
-        pygame.draw.rect(self.center_screen, self.right_color_wall, RIGHT_WALL)
-        pygame.draw.rect(self.center_screen, (20, 20, 20), (0, 0, self.minimap_width, top_void_pos))
-        pygame.draw.rect(self.center_screen, (20, 20, 20), (0, bottom_void_pos, self.minimap_width, self.minimap_height))
-
-        for body in self.bodies:
-            if body.hidden or body.is_clone:
-                continue
-
-            body_pos = (self.center_cam.calc_pos_x(body.pos.x), self.center_cam.calc_pos_y(body.pos.y))
-            if body.is_player:
-                pygame.draw.circle(self.center_screen, body.color, body_pos, 5)
+        screen_pos, radii, visible = cam.transform(coin_pos, 15, min_radius=1)
+        for pos, radius in zip(screen_pos[visible].tolist(), radii[visible].tolist()):
+            pygame.draw.circle(screen, COIN_COLOR, pos, radius)
+
+    def game_draw(self, display: pygame.Surface, width: float, height: float):
+        # setup animation
+        anim_alpha = int((-200// self.game_anims.max ) * self.game_anims.frame) + 200
+        self.left_anim.set_alpha(anim_alpha)
+        self.right_anim.set_alpha(anim_alpha)
+        self.transition_screen.set_alpha(int(2.55 * self.transition.frame))
+
+        # draw everything between the last two physics steps
+        render_pos = self.world.lerp_pos(self.stepper.alpha)
+
+        self.left_cam.follow(render_pos[self.left_player.row], self.delta)
+        self.right_cam.follow(render_pos[self.right_player.row], self.delta)
+
+        self.left_cam.zoom(self.delta*0.5)
+        self.right_cam.zoom(self.delta*0.5)
+
+        # gathered once, every camera transforms the same arrays
+        rows = np.flatnonzero(self.world.active_mask())
+        body_pos = render_pos[rows]
+        body_sizes = self.world.size[rows]
+        body_colors = self.world.color[rows]
+        coin_pos = self.match.coins.positions
+
+        # draw on minimap, every frame or at minimap_hz
+        self.minimap_timer += self.delta
+        minimap_due = self.minimap_dirty or self.minimap_timer >= self.minimap_interval
+        if minimap_due:
+            self.minimap_timer = 0.0 if not self.minimap_interval else self.minimap_timer % self.minimap_interval
+
+        # with post processing the GPU draws both viewports whole, the CPU only draws the HUD
+        gpu = self.gpu_scene is not None and display is self.main_display
+        if gpu:
+            self.gpu_scene.glows.set([(render_pos[[player.row]], player.size * max(self.game_anims.frame * 0.03, 1), 0, tuple(player.color)) for player in self.glowing_players()])
+            self.gpu_scene.bodies.set([(body_pos, body_sizes, 2, body_colors), (coin_pos, 15, 1, COIN_COLOR)])
+            self.gpu_scene.begin(self.base_color)
+
+            for cam, viewport in ((self.left_cam, (0, 0, *self.left_screen.get_size())), (self.right_cam, (width//2, 0, *self.right_screen.get_size()))):
+                # the glows sit in the courts under the walls, faded like the wall pulse
+                self.gpu_scene.draw_circles(self.gpu_scene.glows, cam, viewport, anim_alpha / 255)
+                self.gpu_scene.draw_arena(cam, viewport, self.match.void_dim, (self.match.left_court_size, self.match.right_court_size),
+                                          self.left_color_wall, self.right_color_wall, self.base_color, self.game_anims.frame * 4, anim_alpha / 255)
+                self.gpu_scene.draw_circles(self.gpu_scene.bodies, cam, viewport)
+            self.gpu_composed = True
+        else:
+            colors = body_colors.tolist()
+            views = ((self.left_cam, self.left_screen, self.left_rect, self.left_anim, self.left_arena_cache),
+                     (self.right_cam, self.right_screen, self.right_rect, self.right_anim, self.right_arena_cache))
+            if self.render_pool is not None:
+                # all at once, composited below once every one of them is done. the minimap's time counts as draw_world then
+                futures = [self.render_pool.submit(self.draw_viewport, *view, render_pos, body_pos, body_sizes, colors, coin_pos, width, height) for view in views]
+                if minimap_due:
+                    futures.append(self.render_pool.submit(self.draw_minimap, rows, body_pos, body_colors))
+                    minimap_due = False
+                for future in futures:
+                    future.result()
             else:
-                pygame.draw.circle(self.center_screen, body.color, body_pos, 3)
-        for body in self.coins:
-            body_pos = (self.center_cam.calc_pos_x(body.pos.x), self.center_cam.calc_pos_y(body.pos.y))
-            pygame.draw.circle(self.center_screen, (245, 189, 2), body_pos, 1)
+                for view in views:
+                    self.draw_viewport(*view, render_pos, body_pos, body_sizes, colors, coin_pos, width, height)
+
+        self.profiler.lap("draw_world")
+
+        if minimap_due:
+            self.draw_minimap(rows, body_pos, body_colors)
+        self.profiler.lap("draw_minimap")
 
         if self.transition.message is None and self.transition.is_playing_after_down():
             self.transition.update_add(-self.delta, clamp=True)
         elif self.transition.message and self.transition.is_playing():
             self.transition.update_add(self.delta, clamp=True)
 
-        display.blit(self.left_screen, (0, 0))
-        display.blit(self.right_screen, (width//2, 0))
-        pygame.draw.rect(display, (255, 255, 255), (width//2 - self.minimap_width//2 - 3, 17 + UI.COLON_SYMB_SIZE[1], self.minimap_width + 6, self.minimap_height+6))
-        display.blit(self.center_screen, (width//2 - self.minimap_width//2, 20 + UI.COLON_SYMB_SIZE[1]))
+        # with the GPU drawing the viewports the HUD goes on a layer of its own, above them
+        if gpu:
+            hud = self.hud_display
+            hud.fill((0, 0, 0, 0))
+        else:
+            hud = display
+            display.blit(self.left_screen, (0, 0))
+            display.blit(self.right_screen, (width//2, 0))
 
-        display.blit(self.LEFT_DPAD, (width//2 - (254 * 0.5) - 10, height - (78 * 2 + 10 + 20)*0.5))
-        display.blit(self.RIGHT_DPAD, (width//2 + 10, height - (78 * 2 + 10 + 20)*0.5))
+        pygame.draw.rect(hud, (255, 255, 255), (width//2 - self.minimap_width//2 - 3, 17 + UI.COLON_SYMB_SIZE[1], self.minimap_width + 6, self.minimap_height+6))
+        hud.blit(self.center_screen, (width//2 - self.minimap_width//2, 20 + UI.COLON_SYMB_SIZE[1]))
+
+        if self.dpad_sprites is None:
+            self.dpad_sprites = [self.render_dpads(keys) for keys in self.dpad_keys]
+        hud.blit(self.dpad_sprites[0][self.dpad_masks[0]], (width//2 - (254 * 0.5) - 10, height - (78 * 2 + 10 + 20)*0.5))
+        hud.blit(self.dpad_sprites[1][self.dpad_masks[1]], (width//2 + 10, height - (78 * 2 + 10 + 20)*0.5))
 
         #background for power-up bar
-        pygame.draw.rect(display, (80, 80, 80), (50, height-50-10-30, width//2 - 180 - 30, 10))
-        pygame.draw.rect(display, (80, 80, 80), (width - 50 - (width//2 - 180 - 30), height-50-10-30, width//2 - 180 - 30, 10))
+        pygame.draw.rect(hud, (80, 80, 80), (50, height-50-10-30, width//2 - 180 - 30, 10))
+        pygame.draw.rect(hud, (80, 80, 80), (width - 50 - (width//2 - 180 - 30), height-50-10-30, width//2 - 180 - 30, 10))
         
-        green = (250 - 120) * (self.left_power_anim.frame == self.left_power_anim.max) + 120
+        green = (250 - 120) * (self.match.left_power_anim.frame == self.match.left_power_anim.max) + 120
         pygame.draw.rect(
-            display,
+            hud,
             (120, green, 120),
-            (55, height-50-8-30, ((self.left_power_anim.frame/100) * (width//2 - 180 - 35 - 5)), 6)
+            (55, height-50-8-30, ((self.match.left_power_anim.frame/100) * (width//2 - 180 - 35 - 5)), 6)
         )
         
-        green = (250 - 120) * (self.right_power_anim.frame == self.right_power_anim.max) + 120
-        right_power_width = ((self.right_power_anim.frame/100) * (width//2 - 180 - 35 - 5))
+        green = (250 - 120) * (self.match.right_power_anim.frame == self.match.right_power_anim.max) + 120
+        right_power_width = ((self.match.right_power_anim.frame/100) * (width//2 - 180 - 35 - 5))
         pygame.draw.rect(
-            display,
+            hud,
             (120, green, 120),
             ((width - 55 - right_power_width), height-50-8-30, right_power_width, 6)
         )
@@ -552,76 +734,73 @@ class GravClient:
         if self.gameplay.left_power:
             left_power = self.power_up_sprites.get(self.gameplay.left_power[0])
             if left_power:
-                display.blit(left_power, (30, height - 100 - 30))
+                hud.blit(ASSETS.get(left_power), (30, height - 100 - 30))
         if self.gameplay.right_power:
             right_power = self.power_up_sprites.get(self.gameplay.right_power[0])
             if right_power:
-                display.blit(right_power, (width - 30 - 100, height - 100 - 30))
+                hud.blit(ASSETS.get(right_power), (width - 30 - 100, height - 100 - 30))
 
         # TIMER
-        display.blit(UI.COLON_SYMB, (width//2 - UI.COLON_SYMB_SIZE[0]//2, 10))
+        hud.blit(UI.COLON_SYMB, (width//2 - UI.COLON_SYMB_SIZE[0]//2, 10))
         minute, sec = self.gameplay.timer_in_min_sec()
         
         min_0 = int(minute[0])
         min_1 = int(minute[1])
-        display.blit(UI.NUMS[min_1][0], (width//2 - UI.COLON_SYMB_SIZE[0]//2 - 10 - UI.NUMS[min_1][1][0], 13))
-        display.blit(UI.NUMS[min_0][0], (width//2 - UI.COLON_SYMB_SIZE[0]//2 - 10 - UI.NUMS[min_1][1][0] - 5 - UI.NUMS[min_0][1][0], 13))
+        hud.blit(UI.NUMS[min_1][0], (width//2 - UI.COLON_SYMB_SIZE[0]//2 - 10 - UI.NUMS[min_1][1][0], 13))
+        hud.blit(UI.NUMS[min_0][0], (width//2 - UI.COLON_SYMB_SIZE[0]//2 - 10 - UI.NUMS[min_1][1][0] - 5 - UI.NUMS[min_0][1][0], 13))
 
         sec_0 = int(sec[0])
         sec_1 = int(sec[1])
-        display.blit(UI.NUMS[sec_0][0], (width//2 + UI.COLON_SYMB_SIZE[0]//2 + 10, 13))
-        display.blit(UI.NUMS[sec_1][0], (width//2 + UI.COLON_SYMB_SIZE[0]//2 + 10 + UI.NUMS[sec_0][1][0] + 5, 13))
+        hud.blit(UI.NUMS[sec_0][0], (width//2 + UI.COLON_SYMB_SIZE[0]//2 + 10, 13))
+        hud.blit(UI.NUMS[sec_1][0], (width//2 + UI.COLON_SYMB_SIZE[0]//2 + 10 + UI.NUMS[sec_0][1][0] + 5, 13))
 
         # SCORES
         score = f"{(self.gameplay.left_score):02}"
         score_0 = int(score[0])
         score_1 = int(score[1])
-        display.blit(UI.BIG_NUMS[score_0][0], (40, 20))
-        display.blit(UI.BIG_NUMS[score_1][0], (40 + UI.BIG_NUMS[score_0][1][0] + 10, 20))
+        hud.blit(UI.BIG_NUMS[score_0][0], (40, 20))
+        hud.blit(UI.BIG_NUMS[score_1][0], (40 + UI.BIG_NUMS[score_0][1][0] + 10, 20))
 
         score = f"{(self.gameplay.right_score):02}"
         score_0 = int(score[0])
         score_1 = int(score[1])
-        display.blit(UI.BIG_NUMS[score_1][0], (width - 40 - UI.BIG_NUMS[score_1][1][0], 20))
-        display.blit(UI.BIG_NUMS[score_0][0], (width - 40 - UI.BIG_NUMS[score_1][1][0] - 10 - UI.BIG_NUMS[score_0][1][0], 20))
+        hud.blit(UI.BIG_NUMS[score_1][0], (width - 40 - UI.BIG_NUMS[score_1][1][0], 20))
+        hud.blit(UI.BIG_NUMS[score_0][0], (width - 40 - UI.BIG_NUMS[score_1][1][0] - 10 - UI.BIG_NUMS[score_0][1][0], 20))
 
-        pygame.draw.line(display, (255, 255, 255), (width//2, 17 + UI.COLON_SYMB_SIZE[1] + 5 + self.minimap_height), (width//2, height), 3)
-        self.main_display.blit(self.transition_screen, (0, 0))
+        pygame.draw.line(hud, (255, 255, 255), (width//2, 17 + UI.COLON_SYMB_SIZE[1] + 5 + self.minimap_height), (width//2, height), 3)
+        if gpu:
+            self.gpu_fade = self.transition_screen.get_alpha() / 255
+        else:
+            self.main_display.blit(self.transition_screen, (0, 0))
+        self.profiler.lap("draw_hud")
 
     def game_start_lobby_menu(self, width, height):
         if not self.transition.is_playing():
-            self.ball.gravity_calc(self.bodies)
-
-            for body in self.bodies:
-                body.update(self.delta, (self.top_void, self.bottom_void, self.left_void, self.right_void), self.coins)
-
-            #self.ball.update(self.delta, (self.top_void, self.bottom_void, self.left_void, self.right_void))
+            for _ in range(self.stepper.advance(self.delta)):
+                if self.playback:
+                    self.play_inputs()
+                self.match.step(self.stepper.dt)
 
             self.game_anims.update_add(self.delta, wrap=True)
 
-            if (self.ball.pos.x - self.ball.size) > (self.right_void - self.right_court_size):
-                self.gameplay.right_score_add()
-                self.ball.reset((0, 0))
-
-            if (self.ball.pos.x + self.ball.size) < (self.left_void + self.right_court_size):
-                self.gameplay.left_score_add()
-                self.ball.reset((0, 0))
-
-            self.left_power_anim.update_add(self.delta, clamp=True)
-            self.right_power_anim.update_add(self.delta, clamp=True)
-
-            if (self.left_power_anim.frame == self.left_power_anim.max) and not self.gameplay.left_power_allow:
-                self.gameplay.left_power_allow = True
-                audio_factory.AUDIO_LIBRARY["BEEP"].play()
-            if (self.right_power_anim.frame == self.right_power_anim.max) and not self.gameplay.right_power_allow:
-                self.gameplay.right_power_allow = True
-                audio_factory.AUDIO_LIBRARY["BEEP"].play()
-
         if self.transition.message and not self.transition.is_playing():
             self.change_state(self.transition.message)
 
         self.game_draw(self.main_display, width, height)
 
+    def play_inputs(self):
+        for step, key, down in self.playback.due(self.match.steps):
+            if key in self.dpad_bits:
+                self.set_dpad_key(key, down)
+            if down:
+                self.match.key_down(key)
+            else:
+                self.match.key_up(key)
+
+        # the recording was stopped before anyone won, leave where it ends
+        if self.match.steps >= self.playback.replay.steps and not self.gameplay.winner and not self.transition.message:
+            self.transition.set_message(States.MAIN_MENU_S, self.delta)
+
     def pause_menu(self, width, height):
         self.main_display.blit(self.pause_window, (0, 0))
 
@@ -777,23 +956,23 @@ class GravClient:
         self.about_text.draw(self.main_display)
         #self.about_text.items[0].draw(self.main_display)
 
-    def quantumn_collapse(self, random_body: Body, player: Body, left_player: bool):
-        player.pos = random_body.pos
-        player.velocity = random_body.velocity
-
-        self.bodies = [body for body in self.bodies if (body.is_clone != player.id)]
-
-        player.hidden = False
-        player.glow = True
+    def match_event(self, event: SimEvent):
+        # the match has already applied the event, this only covers what the client shows for it
+        match event.type:
+            case userevents.POWER_UP_GAIN_EVENT if event.power == PowerUp.Quantum:
+                if event.left_player:
+                    self.left_cam.zoom_out()
+                else:
+                    self.right_cam.zoom_out()
 
-        if left_player:
-            self.left_cam.zoom_in()
-            pygame.time.set_timer(pygame.event.Event(userevents.POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_LEFT), 2000, loops=1)
-        else:
-            self.right_cam.zoom_in()
-            pygame.time.set_timer(pygame.event.Event(userevents.POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_RIGHT), 2000, loops=1)
+            case userevents.POWER_UP_QUANTUM_COLLAPSED:
+                if event.left_player:
+                    self.left_cam.zoom_in()
+                else:
+                    self.right_cam.zoom_in()
 
-        self.gameplay.remove_power(left_player)
+            case userevents.WINNER_DECLARED:
+                self.transition.set_message(States.GAME_END_S, self.delta)
 
     # SCREEN STATE:
         # 0 => Main Menu
@@ -806,17 +985,16 @@ class GravClient:
         match event.type:
             case pygame.KEYDOWN:
                 if self.STATE in (States.GAME_SCREEN_S, States.PAUSE_MENU_S):
-                    if event.key in self.input_keys:
-                        self.input_keys[event.key][0].set_alpha(255)
-                        self.blit_dpads()
+                    # while a replay plays, the match only gets the recorded keys
+                    if event.key in self.input_keys and not self.playback:
+                        self.set_dpad_key(event.key, True)
 
                         self.input_keys[event.key][1]() # start acceleration
 
                     if self.STATE in (States.GAME_SCREEN_S,):
-                        if event.key == pygame.K_LSHIFT:
-                            self.gameplay.set_power(True)
-                        elif event.key == pygame.K_RSHIFT:
-                            self.gameplay.set_power(False)
+                        if event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
+                            if not self.playback:
+                                self.match.key_down(event.key)
                         
                         elif event.key == pygame.K_q:
                             self.left_cam.decrease_scale()
@@ -844,27 +1022,17 @@ class GravClient:
 
                 elif event.key == pygame.K_F11:
                     pygame.display.toggle_fullscreen()
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                elif event.key == pygame.K_F4:
+                    self.export_profile()
 
             case pygame.KEYUP:
-                if event.key in self.input_keys and self.STATE in (States.GAME_SCREEN_S, States.PAUSE_MENU_S):
-                    self.input_keys[event.key][0].set_alpha(50)
-                    self.blit_dpads()
+                if event.key in self.input_keys and self.STATE in (States.GAME_SCREEN_S, States.PAUSE_MENU_S) and not self.playback:
+                    self.set_dpad_key(event.key, False)
 
                     self.input_keys[event.key][2]() # start deacceleration
 
-            case userevents.GAME_TICK_SECOND:
-                self.gameplay.tick()
-                if len(self.coins) < 10 and random.random() < 0.4:
-                    self.coins.append(phybody.Coin(Vector2(phybody.Body.random_pos((self.left_void, self.top_void, self.right_void, self.bottom_void)))))
-                if len(self.coins) > 0 and random.random() < 0.1:
-                    self.coins.pop(random.randint(0, len(self.coins)-1))
-
-            case userevents.COIN_PICKUP:
-                if event.player == self.left_player.id:
-                    self.left_power_anim.update_add(self.delta * self.coin_boost, clamp=True)
-                else:
-                    self.right_power_anim.update_add(self.delta * self.coin_boost, clamp=True)
-
             case pygame.MOUSEWHEEL:
                 match self.STATE:
                     case States.GAME_SCREEN_S:
@@ -897,65 +1065,6 @@ class GravClient:
             case pygame.MOUSEBUTTONUP if event.button == 1 and self.global_button_click[0]:
                 self.global_button_click[0] = False
 
-            case userevents.POWER_UP_GAIN_EVENT:
-                if event.left_player:
-                    player = self.left_player
-                    self.gameplay.left_power_allow = False
-                    self.left_power_anim.frame = self.left_power_anim.min
-                else:
-                    player = self.right_player
-                    self.gameplay.right_power_allow = False
-                    self.right_power_anim.frame = self.right_power_anim.min
-                
-                match event.power:
-                    case PowerUp.SpeedUp:
-                        player.speed_limit = phybody.POWER_SPEED_LIMIT
-                    case PowerUp.Grow:
-                        player.size, player.mass = phybody.POWER_SIZE, phybody.POWER_MASS
-                    case PowerUp.AntiGravity:
-                        player.mass = -1 * abs(player.mass)
-                    case PowerUp.Quantum:
-                        for i in range(70):
-                            self.bodies.append(player.create_clone(player.id*100 + i, (self.left_void, self.top_void, self.right_void, self.bottom_void)))
-                        
-                        player.hidden = True
-                        if event.left_player:
-                            self.left_cam.zoom_out()
-                        else:
-                            self.right_cam.zoom_out()
-
-            case userevents.POWER_UP_DESTROY_EVENT:
-                player = self.left_player if event.left_player else self.right_player
-
-                match event.power:
-                    case PowerUp.SpeedUp:
-                        player.speed_limit = phybody.SPEED_LIMIT
-                    case PowerUp.Grow:
-                        player.size, player.mass = phybody.SIZE, phybody.MASS
-                    case PowerUp.AntiGravity:
-                        player.mass = abs(player.mass)
-                    case PowerUp.Quantum:
-                        for body in self.bodies:
-                            if body.is_clone == player.id:
-                                self.quantumn_collapse(body, player, event.left_player)
-                                break
-                        else:
-                            self.quantumn_collapse(player, player, event.left_player)
-
-            case userevents.POWER_UP_QUANTUM_COLLAPSE:
-                if event.random_body.is_clone == self.left_player.id:
-                    self.quantumn_collapse(event.random_body, self.left_player, True)
-                else:
-                    self.quantumn_collapse(event.random_body, self.right_player, False)
-
-            case userevents.POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_LEFT:
-                self.left_player.glow = False
-            case userevents.POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_RIGHT:
-                self.right_player.glow = False
-
-            case userevents.WINNER_DECLARED:
-                self.transition.set_message(States.GAME_END_S, self.delta)
-
             case pygame.QUIT:
                 self.running = False
 
@@ -964,57 +1073,134 @@ class GravClient:
 
         print(f">> GAME: Config is located in: {self.CONFIG_FILE}")
 
-        time = 0.0
-        audio_factory.AUDIO_LIBRARY["MAIN_MENU"].play(-1)
+        audio_factory.play("MAIN_MENU", -1)
+        if self.playback:
+            self.change_state(States.GAME_SCREEN_S)
+
+        self.frame()
+        print(f">> GAME: First frame after {(time.perf_counter() - START) * 1000:.0f} ms")
+
         while self.running:
             try:
-                width, height = self.main_display.get_size()
-
-                events = pygame.event.get()
-                for event in events:
-                    self.evaluate_event(event, width)
+                self.frame()
+            except KeyboardInterrupt:
+                self.running = False
 
-                self.main_display.fill(self.base_color)
+        if self.postprocess:
+            self.frame_uploader.release()
+            self.hud_uploader.release()
+            self.gpu_scene.release()
+            if self.crt_mask is not None:
+                self.crt_mask.release()
+        if self.render_pool is not None:
+            self.render_pool.shutdown()
+
+    def is_still(self) -> bool:
+        # whether the current state looks the same every frame until some input arrives.
+        # the menus, options and the game always animate, pause, game over and about only during a transition
+        if self.profiler.show_overlay:
+            return False
+
+        match self.STATE:
+            case States.ABOUT_S:
+                return True
+            case States.PAUSE_MENU_S | States.GAME_END_S:
+                return self.transition.message is None and not self.transition.is_playing_after_down()
+        return False
 
-                match self.STATE:
-                    case States.MAIN_MENU_S:
-                        self.main_menu(width, height)
-                    case States.GAME_SCREEN_S:
-                        self.game_start_lobby_menu(width, height)
-                    case States.PAUSE_MENU_S:
-                        self.pause_menu(width, height)
-                    case States.OPTION_MENU_S:
-                        self.option_menu(width, height)
-                    case States.ABOUT_S:
-                        self.about_menu(width, height)
-                    case States.GAME_END_S:
-                        self.win_screen(width, height)
-
-                if self.postprocess:
-                    frame_tex = self.surface_to_texture(self.main_display)
-                    frame_tex.use(0)
-                    self.opengl_program['time'] = time
-                    
-                    self.opengl_renderer.render(mode=moderngl.TRIANGLE_STRIP)
-                else:
-                    self.window.blit(self.main_display, (0, 0))
+    def frame(self):
+        # one pass of the program loop: events, update + draw for the current state, present, wait
+        width, height = self.main_display.get_size()
 
-                pygame.display.flip()
+        events = pygame.event.get()
+        self.profiler.lap("events")
+        for event in events:
+            self.evaluate_event(event, width)
+        audio_factory.update()
+        self.profiler.lap("evaluate")
+
+        # any event can move the mouse over a button, scroll or expose the window, so all of them count as damage
+        still = self.is_still()
+        if events or self.redraw or not still:
+            # the frame that finishes an animation drew it one step early, so one more pass after it stops
+            # (set first, a state change while drawing asks for the next frame too)
+            self.redraw = not still
+            self.draw_state(width, height)
+            self.present(upload=True)
+        else:
+            # nothing changed: no redraw, no upload. without post processing the window still shows this frame
+            self.profiler.lap("draw_menu")
+            if self.postprocess and self.crt_quality > 0:
+                # the big scan line keeps moving. fully baked, the CRT pass would draw the same picture again
+                self.present(upload=False)
 
-                if self.postprocess:
-                    frame_tex.release()
-                    if time >= 2 * math.pi * 100: time = 0
+        if self.postprocess:
+            if self.shader_time >= 2 * math.pi * 100: self.shader_time = 0
+
+        self.delta = self.clock.tick(self.FPS if (events or not still) else IDLE_FPS) * 0.001
+        self.profiler.lap("wait")
+        self.profiler.end_frame()
+        #self.delta *= 0.001
+
+    def draw_state(self, width, height):
+        self.gpu_composed = False
+        if not (self.gpu_scene is not None and self.STATE == States.GAME_SCREEN_S):
+            self.main_display.fill(self.base_color)
+
+        match self.STATE:
+            case States.MAIN_MENU_S:
+                self.main_menu(width, height)
+            case States.GAME_SCREEN_S:
+                self.game_start_lobby_menu(width, height)
+            case States.PAUSE_MENU_S:
+                self.pause_menu(width, height)
+            case States.OPTION_MENU_S:
+                self.option_menu(width, height)
+            case States.ABOUT_S:
+                self.about_menu(width, height)
+            case States.GAME_END_S:
+                self.win_screen(width, height)
 
-                self.delta = self.clock.tick(self.FPS) * 0.001
-                pygame.display.set_caption(f"FPS: {1/self.delta}")
-                #self.delta *= 0.001
-            except KeyboardInterrupt:
-                if self.postprocess:
-                    frame_tex.release()
-                self.running = False
+        self.profiler.draw_overlay(self.hud_display if self.gpu_composed else self.main_display, UI.small_font, self.delta)
+        self.profiler.lap("draw_menu")
 
-CLIENT = GravClient(SET_FPS=1000)
-CLIENT.display()
-# program loop
-CLIENT.quit()
-pygame.quit()
\ No newline at end of file
+    def present(self, upload: bool):
+        # upload: main_display changed since the last frame, otherwise the texture still holds it
+        if self.postprocess:
+            if upload and self.gpu_composed:
+                # the viewports are already drawn on the GPU, only the HUD comes from the CPU
+                self.gpu_scene.upscale()
+                self.gpu_scene.overlay(self.hud_uploader.upload(self.hud_display))
+                self.gpu_scene.fade(self.gpu_fade)
+                self.screen_texture = self.gpu_scene.texture
+
+                self.opengl_ctx.screen.use()
+                self.opengl_ctx.viewport = (0, 0, *self.gpu_scene.size)
+            elif upload:
+                self.screen_texture = self.frame_uploader.upload(self.main_display)
+            self.screen_texture.use(0)
+            if self.crt_mask is not None:
+                self.crt_mask.texture.use(1)
+            self.profiler.lap("upload")
+            self.shader_time += self.delta
+            if self.crt_quality > 0:
+                self.opengl_program['time'] = self.shader_time
+            
+            self.opengl_renderer.render(mode=moderngl.TRIANGLE_STRIP)
+        else:
+            self.window.blit(self.main_display, (0, 0))
+        self.profiler.lap("render")
+
+        pygame.display.flip()
+        self.profiler.lap("flip")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GravBall")
+    parser.add_argument("--replay", type=Path, help="watch a recorded match (.gbr from the replays folder next to the config)")
+    args = parser.parse_args()
+
+    CLIENT = GravClient(SET_FPS=1000, replay=Replay.load(args.replay) if args.replay else None)
+    CLIENT.display()
+    # program loop
+    CLIENT.quit()
+    pygame.quit()
@@ -0,0 +1,287 @@
+import pygame, random, audio_factory, userevents, phybody
+from typing import Callable
+from pygame.math import Vector2
+from animation import Animation
+from eventbus import EventBus, SimEvent
+from gameplay import Gameplay, PowerUp
+from gravity import SOLVERS, THETA
+from phybody import Body, PhysicsWorld
+
+class Match:
+    # everything a match needs to play out, without a window, mixer or GL context
+    # the client and the headless runner both drive it through key_down / key_up / step
+
+    def __init__(self, game_time: int, left_color: pygame.Color = pygame.Color(228, 93, 37), right_color: pygame.Color = pygame.Color(37, 140, 228), gravity_solver: str = "direct", theta: float = THETA, seed: int|None = None) -> None:
+        if gravity_solver not in SOLVERS:
+            raise ValueError(f"unknown gravity solver {gravity_solver!r}, expected one of {SOLVERS}")
+
+        self.top_void = 3000
+        self.bottom_void = -self.top_void
+        self.left_void = -5000
+        self.right_void = -self.left_void
+        self.left_court_size = 500
+        self.right_court_size = self.left_court_size
+
+        # every random choice in the match comes from here, so a seed and the inputs are enough to play it again
+        self.seed: int = seed if seed is not None else random.getrandbits(63)
+        self.rng = random.Random(self.seed)
+
+        # everything the match reports goes through here, the match itself is the first subscriber
+        self.bus = EventBus()
+        self.bus.subscribe(self.handle_event)
+
+        self.world = PhysicsWorld(bounds=(self.left_void, self.bottom_void, self.right_void, self.top_void), bus=self.bus)
+        self.world.gravity_solver = gravity_solver
+        self.world.theta = theta
+
+        self.ball = Body(1, False, pygame.Color(255, 255, 255), Vector2(0, 0), Vector2(0, 0), 20, 50, world=self.world)
+        self.left_player = Body(2, True, left_color, Vector2(-250, 0), Vector2(0, 0), world=self.world)
+        self.right_player = Body(3, True, right_color, Vector2(250, 0), Vector2(0, 0), world=self.world)
+
+        self.bodies: list[Body] = [
+            self.left_player,
+            self.right_player,
+            self.ball
+        ]
+
+        self.coins = phybody.CoinField((self.left_void, self.bottom_void, self.right_void, self.top_void))
+
+        self.acceleration = 0.2
+        self.controls: dict[int, tuple[Body, float, float]] = {
+            pygame.K_w: (self.left_player, 0, self.acceleration),
+            pygame.K_a: (self.left_player, -self.acceleration, 0),
+            pygame.K_s: (self.left_player, 0, -self.acceleration),
+            pygame.K_d: (self.left_player, self.acceleration, 0),
+            pygame.K_UP: (self.right_player, 0, self.acceleration),
+            pygame.K_DOWN: (self.right_player, 0, -self.acceleration),
+            pygame.K_LEFT: (self.right_player, -self.acceleration, 0),
+            pygame.K_RIGHT: (self.right_player, self.acceleration, 0)
+        }
+
+        self.left_power_anim = Animation(0, 100, (6))
+        self.right_power_anim = Animation(0, 100, (6))
+        # seconds of charging a coin is worth, the frame loop used to add 60*20 * delta at its 1000 fps cap
+        self.coin_boost = 1.2
+        self.clone_count = 70
+
+        # what the power ups change a player to, per match so balance runs can tune them
+        self.power_speed_limit = phybody.POWER_SPEED_LIMIT
+        self.power_size = phybody.POWER_SIZE
+        self.power_mass = phybody.POWER_MASS
+
+        self.gameplay = Gameplay(game_time, userevents.WINNER_DECLARED, userevents.POWER_UP_GAIN_EVENT, userevents.POWER_UP_DESTROY_EVENT, self.bus, self.rng)
+
+        # simulation clock, GAME_TICK_SECOND fires every full second of it
+        self.time: float = 0.0
+        self.next_tick: float = 1.0
+        self.steps: int = 0
+
+        self.timers: list[tuple[float, SimEvent]] = []
+
+        # (step, key, down) of every key the match gets, replay.Replay.record when recording
+        self.record: Callable[[int, int, bool], None]|None = None
+
+    @property
+    def void_dim(self) -> tuple[float, float, float, float]:
+        return (self.top_void, self.bottom_void, self.left_void, self.right_void)
+
+    @property
+    def pos_limit(self) -> tuple[float, float, float, float]:
+        #pos_limit: (left, top, right, down)
+        return (self.left_void, self.top_void, self.right_void, self.bottom_void)
+
+    def schedule(self, delay: float, event: SimEvent):
+        # post `event` once `delay` seconds of simulation time have passed
+        self.timers.append((self.time + delay, event))
+
+    def key_down(self, key: int):
+        if self.record:
+            self.record(self.steps, key, True)
+
+        if key in self.controls:
+            body, x, y = self.controls[key]
+            body.add_mouse_x(x)
+            body.add_mouse_y(y)
+        elif key == pygame.K_LSHIFT:
+            self.gameplay.set_power(True)
+        elif key == pygame.K_RSHIFT:
+            self.gameplay.set_power(False)
+
+    def key_up(self, key: int):
+        if self.record:
+            self.record(self.steps, key, False)
+
+        if key in self.controls:
+            body, x, y = self.controls[key]
+            body.add_mouse_x(-x)
+            body.add_mouse_y(-y)
+
+    def step(self, dt: float):
+        # one fixed physics step, everything in here has to be independent of the render rate
+        self.world.step(dt, self.void_dim, self.coins)
+
+        if (self.ball.pos.x - self.ball.size) > (self.right_void - self.right_court_size):
+            self.gameplay.right_score_add()
+            self.ball.reset((0, 0))
+
+        if (self.ball.pos.x + self.ball.size) < (self.left_void + self.right_court_size):
+            self.gameplay.left_score_add()
+            self.ball.reset((0, 0))
+
+        self.left_power_anim.update_add(dt, clamp=True)
+        self.right_power_anim.update_add(dt, clamp=True)
+
+        if (self.left_power_anim.frame == self.left_power_anim.max) and not self.gameplay.left_power_allow:
+            self.gameplay.left_power_allow = True
+            audio_factory.play("BEEP")
+        if (self.right_power_anim.frame == self.right_power_anim.max) and not self.gameplay.right_power_allow:
+            self.gameplay.right_power_allow = True
+            audio_factory.play("BEEP")
+
+        self.time += dt
+        self.steps += 1
+        if self.time >= self.next_tick:
+            self.next_tick += 1
+            self.bus.post(SimEvent(userevents.GAME_TICK_SECOND))
+
+        if self.timers:
+            due = [timer for timer in self.timers if timer[0] <= self.time]
+            if due:
+                self.timers = [timer for timer in self.timers if timer[0] > self.time]
+                for _, event in due:
+                    self.bus.post(event)
+
+        self.bus.drain()
+        if self.world.lap:
+            self.world.lap("rules")
+
+    def handle_event(self, event: SimEvent):
+        match event.type:
+            case userevents.GAME_TICK_SECOND:
+                self.gameplay.tick()
+                if len(self.coins) < 10 and self.rng.random() < 0.4:
+                    self.coins.add(phybody.Body.random_pos(self.pos_limit, self.rng))
+                if len(self.coins) > 0 and self.rng.random() < 0.1:
+                    self.coins.remove(self.rng.randint(0, len(self.coins)-1))
+
+            case userevents.COIN_PICKUP:
+                # a pickup is worth the same at any frame or physics rate
+                if event.player == self.left_player.id:
+                    self.left_power_anim.update_add(self.coin_boost, clamp=True)
+                else:
+                    self.right_power_anim.update_add(self.coin_boost, clamp=True)
+
+            case userevents.POWER_UP_GAIN_EVENT:
+                if event.left_player:
+                    player = self.left_player
+                    self.gameplay.left_power_allow = False
+                    self.left_power_anim.frame = self.left_power_anim.min
+                else:
+                    player = self.right_player
+                    self.gameplay.right_power_allow = False
+                    self.right_power_anim.frame = self.right_power_anim.min
+
+                match event.power:
+                    case PowerUp.SpeedUp:
+                        player.speed_limit = self.power_speed_limit
+                    case PowerUp.Grow:
+                        player.size, player.mass = self.power_size, self.power_mass
+                    case PowerUp.AntiGravity:
+                        player.mass = -1 * abs(player.mass)
+                    case PowerUp.Quantum:
+                        for i in range(self.clone_count):
+                            self.bodies.append(player.create_clone(player.id*100 + i, self.pos_limit, self.rng))
+
+                        player.hidden = True
+
+            case userevents.POWER_UP_DESTROY_EVENT:
+                player = self.left_player if event.left_player else self.right_player
+
+                match event.power:
+                    case PowerUp.SpeedUp:
+                        player.speed_limit = phybody.SPEED_LIMIT
+                    case PowerUp.Grow:
+                        player.size, player.mass = phybody.SIZE, phybody.MASS
+                    case PowerUp.AntiGravity:
+                        player.mass = abs(player.mass)
+                    case PowerUp.Quantum:
+                        for body in self.bodies:
+                            if body.is_clone == player.id:
+                                self.quantumn_collapse(body, player, event.left_player)
+                                break
+                        else:
+                            self.quantumn_collapse(player, player, event.left_player)
+
+            case userevents.POWER_UP_QUANTUM_COLLAPSE if event.random_body.alive:
+                if event.random_body.is_clone == self.left_player.id:
+                    self.quantumn_collapse(event.random_body, self.left_player, True)
+                else:
+                    self.quantumn_collapse(event.random_body, self.right_player, False)
+
+            case userevents.POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_LEFT:
+                self.left_player.glow = False
+            case userevents.POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_RIGHT:
+                self.right_player.glow = False
+
+    def add_stress(self, bodies: int, coins: int):
+        # fills the arena for load testing: half the bodies attract like players, the other half fall like balls
+        for _ in range(coins):
+            self.coins.add(Body.random_pos(self.pos_limit, self.rng))
+
+        for i in range(bodies):
+            self.bodies.append(Body(1000 + i, i % 2 == 0, pygame.Color(120, 120, 120), Vector2(Body.random_pos(self.pos_limit, self.rng)), Vector2(0, 0), self.rng.randint(10, 30), self.rng.randint(50, 1500), world=self.world))
+
+    def quantumn_collapse(self, random_body: Body, player: Body, left_player: bool):
+        player.pos = random_body.pos
+        player.velocity = random_body.velocity
+
+        for body in self.bodies:
+            if body.is_clone == player.id:
+                body.release()
+        self.bodies = [body for body in self.bodies if (body.is_clone != player.id)]
+
+        player.hidden = False
+        player.glow = True
+
+        if left_player:
+            self.schedule(2, SimEvent(userevents.POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_LEFT))
+        else:
+            self.schedule(2, SimEvent(userevents.POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_RIGHT))
+
+        self.gameplay.remove_power(left_player)
+        self.bus.post(SimEvent(userevents.POWER_UP_QUANTUM_COLLAPSED, left_player=left_player))
+
+    def reset(self, seed: int|None = None):
+        # a new seed for the next match, the generator is shared with gameplay so it is reseeded in place
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng.seed(self.seed)
+
+        self.left_player.reset((-250, 0))
+        self.right_player.reset((250, 0))
+        self.ball.reset((0, 0))
+
+        for body in self.bodies:
+            if body.is_clone:
+                body.release()
+        # a replay starts from a new match, so this one has to hand out the clones' rows the same way
+        self.world.trim()
+
+        self.bodies = [
+            self.left_player,
+            self.right_player,
+            self.ball
+        ]
+        self.left_player.glow = False
+        self.right_player.glow = False
+        self.coins.clear()
+
+        self.left_power_anim.frame = self.left_power_anim.min
+        self.right_power_anim.frame = self.right_power_anim.min
+
+        self.gameplay.reset()
+
+        self.time = 0.0
+        self.next_tick = 1.0
+        self.steps = 0
+        self.bus.clear()
+        self.timers.clear()
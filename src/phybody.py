@@ -1,5 +1,9 @@
 from pygame.math import Vector2
-import pygame, random, userevents
+import pygame, random, math, userevents, gravity
+import numpy as np
+from typing import Callable
+from eventbus import EventBus, SimEvent
+from spatial import SpatialGrid, CELL_SIZE
 
 # const
 G = 20
@@ -17,24 +21,496 @@ POWER_SIZE, POWER_MASS = 50, 1000
 
 FRICTION = 0.99
 
-class Coin:
-    def __init__(self, pos: Vector2) -> None:
-        self.pos = pos
+COIN_SIZE = 15
+
+# ARENA (left, bottom, right, top), what the spatial grids cover
+BOUNDS = (-5000, -3000, 5000, 3000)
+
+# above this many ball x body (or player x coin) pairs they are found through the grid instead of checking every pair
+GRID_PAIRS = 256
+
+# up to this many moving rows (or ball x body, player x coin pairs) are worked through one by one in plain floats,
+# numpy's cost per call is most of a step below it. same arithmetic in the same order, so the same result
+SCALAR_LIMIT = 32
+
+class CoinField:
+    # every coin position in one array. removing a coin moves the last one into its slot, so order is not kept
+
+    def __init__(self, bounds: tuple[float, float, float, float] = BOUNDS, capacity: int = 16) -> None:
+        self.pos = np.zeros((capacity, 2))
+        self.count = 0
+        self.grid = SpatialGrid(bounds, CELL_SIZE)
+        self.dirty = True # grid is rebuilt lazily, coins only move when they spawn or get picked up
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.pos[:self.count]
+
+    def add(self, pos: tuple[float, float]):
+        if self.count == len(self.pos):
+            self.pos = np.concatenate((self.pos, np.zeros_like(self.pos)))
+        self.pos[self.count] = pos
+        self.count += 1
+        self.dirty = True
+
+    def remove(self, i: int):
+        self.count -= 1
+        self.pos[i] = self.pos[self.count]
+        self.dirty = True
+
+    def remove_many(self, indices: np.ndarray):
+        # highest index first, so a swapped in coin is never one that still has to go
+        for i in sorted(indices, reverse=True):
+            self.remove(int(i))
+
+    def clear(self):
+        self.count = 0
+        self.dirty = True
+
+    def index(self) -> SpatialGrid:
+        if self.dirty:
+            self.grid.build(self.positions)
+            self.dirty = False
+        return self.grid
+
+class RowVector:
+    # x, y view over one row of a (N, 2) array in a PhysicsWorld, so `body.pos.x += 1` writes straight into the world
+
+    __slots__ = ("world", "field", "row")
+
+    def __init__(self, world: 'PhysicsWorld', field: str, row: int) -> None:
+        self.world = world
+        self.field = field
+        self.row = row
+
+    @property
+    def x(self) -> float:
+        return float(getattr(self.world, self.field)[self.row, 0])
+
+    @x.setter
+    def x(self, val: float):
+        getattr(self.world, self.field)[self.row, 0] = val
+
+    @property
+    def y(self) -> float:
+        return float(getattr(self.world, self.field)[self.row, 1])
+
+    @y.setter
+    def y(self, val: float):
+        getattr(self.world, self.field)[self.row, 1] = val
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, i: int) -> float:
+        return float(getattr(self.world, self.field)[self.row, i])
+
+    def __setitem__(self, i: int, val: float):
+        getattr(self.world, self.field)[self.row, i] = val
+
+    def __iter__(self):
+        row = getattr(self.world, self.field)[self.row]
+        return iter((float(row[0]), float(row[1])))
+
+    def __repr__(self) -> str:
+        return f"RowVector({self.x}, {self.y})"
+
+class PhysicsWorld:
+    # structure-of-arrays storage for every body, rows are recycled through a free list
+
+    def __init__(self, capacity: int = 256, bounds: tuple[float, float, float, float] = BOUNDS, bus: EventBus|None = None) -> None:
+        self.capacity = 0
+        self.count = 0 # rows [0, count) have been handed out at least once
+        self.free_rows: list[int] = []
+        self.bodies: list['Body|None'] = []
+        self.active: np.ndarray|None = None # cached active_mask(), dropped whenever a row appears, leaves or hides
+
+        self.pos = np.zeros((0, 2))
+        self.prev_pos = np.zeros((0, 2)) # positions before the last step, for render interpolation
+        self.velocity = np.zeros((0, 2))
+        self.acceleration = np.zeros((0, 2))
+        self.mass = np.zeros(0)
+        self.size = np.zeros(0)
+        self.speed_limit = np.zeros(0)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.is_clone = np.zeros(0, dtype=np.int64)
+        self.is_player = np.zeros(0, dtype=bool)
+        self.hidden = np.zeros(0, dtype=bool)
+        self.alive = np.zeros(0, dtype=bool)
+        self.color = np.zeros((0, 4), dtype=np.uint8) # rgba, only the renderer reads it
+
+        self.g = G
+        self.grav_damp = GRAV_DAMP
+        self.bounce_damp = BOUNCE_DAMP
+        self.friction = FRICTION
+
+        # how balls that touch nothing are pulled, see gravity.SOLVERS
+        self.gravity_solver = "direct"
+        self.theta = gravity.THETA
+
+        self.grid = SpatialGrid(bounds, CELL_SIZE) # rebuilt from the attracting bodies every gravity pass
+
+        # profiler hook, called with a phase name as each part of a step finishes
+        self.lap: Callable[[str], None]|None = None
+
+        # where collision and pickup events go, a Match hands in its own bus
+        self.bus = bus if bus is not None else EventBus()
+
+        self.grow(capacity)
+
+    def grow(self, capacity: int):
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+
+        for field in ("pos", "prev_pos", "velocity", "acceleration"):
+            setattr(self, field, np.concatenate((getattr(self, field), np.zeros((extra, 2)))))
+        for field in ("mass", "size", "speed_limit"):
+            setattr(self, field, np.concatenate((getattr(self, field), np.zeros(extra))))
+        for field in ("ids", "is_clone"):
+            setattr(self, field, np.concatenate((getattr(self, field), np.zeros(extra, dtype=np.int64))))
+        for field in ("is_player", "hidden", "alive"):
+            setattr(self, field, np.concatenate((getattr(self, field), np.zeros(extra, dtype=bool))))
+        self.color = np.concatenate((self.color, np.zeros((extra, 4), dtype=np.uint8)))
+
+        self.bodies.extend([None] * extra)
+        self.capacity = capacity
+
+    def add(self, body: 'Body') -> int:
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.count == self.capacity:
+                self.grow(self.capacity * 2)
+            row = self.count
+            self.count += 1
+
+        self.alive[row] = True
+        self.bodies[row] = body
+        self.active = None
+        return row
+
+    def remove(self, row: int):
+        if not self.alive[row]:
+            return
+
+        self.alive[row] = False
+        self.hidden[row] = False
+        self.bodies[row] = None
+        self.active = None
+        self.pos[row] = self.prev_pos[row] = self.velocity[row] = self.acceleration[row] = 0
+        self.free_rows.append(row)
+
+    def trim(self):
+        # drop the dead rows at the end, so they are handed out again in order like in a freshly built world
+        while self.count and not self.alive[self.count - 1]:
+            self.count -= 1
+        self.free_rows = [row for row in self.free_rows if row < self.count]
+        self.active = None
+
+    def active_mask(self) -> np.ndarray:
+        # live, visible rows out of [0, count)
+        if self.active is None:
+            self.active = self.alive[:self.count] & ~self.hidden[:self.count]
+        return self.active
+
+    def step(self, dt: float, void_dim: tuple[float, float, float, float], coins: CoinField):
+        # one simulation step for every body in the world: gravity on the balls, then movement for everyone
+        self.prev_pos[:self.count] = self.pos[:self.count]
+        self.gravity()
+        if self.lap:
+            self.lap("gravity")
+        self.update(dt, void_dim, coins)
+        if self.lap:
+            self.lap("integrate")
+
+    def lerp_pos(self, alpha: float) -> np.ndarray:
+        # positions blended between the previous and the current step, indexed by row
+        return self.prev_pos + (self.pos - self.prev_pos) * alpha
+
+    def gravity(self):
+        # targets: live, visible balls that get attracted, all_src: live, visible players and clones that attract them
+
+        n = self.count
+        targets = np.flatnonzero(self.active_mask() & ~self.is_player[:n])
+        all_src = np.flatnonzero(self.active_mask() & self.is_player[:n])
+        if len(targets) == 0:
+            return
+
+        # a ball or two and the players: walking each ball is cheaper than first finding out which ones touch something
+        if self.gravity_solver == "direct" and len(targets) * len(all_src) <= GRID_PAIRS:
+            scalar = all_src.tolist() if len(all_src) <= SCALAR_LIMIT else None
+            for ball in targets:
+                if scalar is None or not self.pull(int(ball), scalar):
+                    self.collide(ball, all_src)
+            return
+
+        # only a ball that touches something needs the ordered walk, the rest are summed together
+        colliding = self.touching(targets, all_src)
+        free = targets[~colliding]
+        if len(free):
+            self.free_fall(free, all_src)
+
+        for ball in targets[colliding]:
+            self.collide(ball, all_src)
+
+    def touching(self, targets: np.ndarray, src: np.ndarray) -> np.ndarray:
+        # mask over targets: does the ball overlap any source right now
+        colliding = np.zeros(len(targets), dtype=bool)
+        if len(src) == 0:
+            return colliding
+
+        if len(targets) * len(src) <= GRID_PAIRS:
+            query = np.repeat(np.arange(len(targets)), len(src))
+            other = np.tile(src, len(targets))
+        else:
+            self.grid.build(self.pos[src])
+            query, other = self.grid.candidates(self.pos[targets], self.size[targets].max() + self.size[src].max())
+            other = src[other]
+
+        ball = targets[query]
+        diff = self.pos[other] - self.pos[ball]
+        reach = self.size[ball] + self.size[other]
+        hits = (np.einsum("ij,ij->i", diff, diff) < reach * reach) & (self.ids[ball] != self.ids[other])
+        colliding[query[hits]] = True
+        return colliding
+
+    def free_fall(self, balls: np.ndarray, src: np.ndarray):
+        # gravity for balls that touch nothing, all of them in one go
+        args = (self.pos[balls], self.ids[balls], self.size[balls], self.pos[src], self.mass[src], self.size[src], self.ids[src])
+        if self.gravity_solver == "barnes_hut":
+            force = gravity.barnes_hut(*args, theta=self.theta)
+        else:
+            force = gravity.direct(*args)
+
+        # F = G * m1 * m2 / d^2, so a = F / m1 leaves G * m2 / d^2
+        self.acceleration[balls] = (1 - self.grav_damp) * self.g * force
+
+    def pull(self, ball: int, all_src: list[int]) -> bool:
+        # collide() in plain floats for a ball that touches nothing. False, with nothing changed, if it touches something
+        x, y = self.pos[ball].tolist()
+        size = float(self.size[ball])
+        id = int(self.ids[ball])
+
+        fx = fy = 0.0
+        for src in all_src:
+            if self.ids[src] == id:
+                continue
+            sx, sy = self.pos[src].tolist()
+            dx, dy = sx - x, sy - y
+            dist = math.sqrt(dx * dx + dy * dy)
+            reach = size + float(self.size[src])
+            if dist < reach:
+                return False
+            strength = float(self.mass[src]) / gravity.cubed(dist) if dist > reach else 0.0
+            fx += strength * dx
+            fy += strength * dy
+
+        scale = (1 - self.grav_damp) * self.g
+        self.acceleration[ball] = (scale * fx, scale * fy)
+        return True
+
+    def collide(self, ball: int, all_src: np.ndarray):
+        src = all_src[self.ids[all_src] != self.ids[ball]]
+
+        src_pos = self.pos[src]
+        src_mass = self.mass[src]
+        reach = self.size[ball] + self.size[src]
+        force = np.zeros(2)
+
+        # walk the sources in order like the per-body loop did: everything before a collision pulls on the
+        # ball at its old position, everything after it pulls on the position the collision pushed it to
+        start = 0
+        while start < len(src):
+            diff = src_pos[start:] - self.pos[ball]
+            dist = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+            hits = np.flatnonzero(dist < reach[start:])
+            end = hits[0] if len(hits) else len(dist)
+
+            # GRAVITY
+            far = dist[:end] > reach[start:start + end]
+            strength = np.where(far, src_mass[start:start + end] / gravity.cubed(np.where(far, dist[:end], 1)), 0)
+            if start == 0 and end == len(dist):
+                # touches nothing, sum it the way gravity.direct does so a free ball moves the same either way
+                force += np.einsum("i,ij->j", strength, diff)
+            else:
+                force += strength @ diff[:end]
+
+            if end == len(dist):
+                break
+
+            # HANDLE COLLISION
+            body = src[start + end]
+            normal = -diff[end] / dist[end] if dist[end] else np.array((0.0, 1.0))
+            self.pos[ball] = src_pos[start + end] + normal * reach[start + end]
+
+            vel = self.velocity[ball]
+            self.velocity[ball] = (vel - 2 * np.dot(vel, normal) * normal) * (1 - self.bounce_damp)
+
+            # touching several clones, or the same one for several steps, collapses a player once per step
+            if self.is_clone[body]:
+                self.bus.post(SimEvent(userevents.POWER_UP_QUANTUM_COLLAPSE, random_body=self.bodies[body]), (userevents.POWER_UP_QUANTUM_COLLAPSE, int(self.is_clone[body])))
+
+            start += end + 1
+
+        self.acceleration[ball] = (1 - self.grav_damp) * self.g * force
+
+    def update(self, dt: float, void_dim: tuple[float, float, float, float], coins: CoinField):
+        # void dim: (self.top_void, self.bottom_void, self.left_void, self.right_void)
+
+        active = self.active_mask()
+        if not active.any():
+            return
+
+        moving = np.flatnonzero(active)
+        if len(moving) <= SCALAR_LIMIT:
+            self.update_rows(dt, void_dim, coins, moving.tolist())
+            return
+
+        if coins:
+            self.pickup_coins(active, coins)
+
+        n = self.count
+        steps = dt * 60 * 2
+        pos = self.pos[:n]
+        vel = self.velocity[:n]
+        size = self.size[:n, None]
+
+        # bounce off the voids: (x, y) against (left, bottom) and (right, top)
+        speed = np.abs(vel)
+        new_vel = np.where((pos + size) > (void_dim[3], void_dim[0]), -speed, vel)
+        new_vel = np.where((pos - size) < (void_dim[2], void_dim[1]), speed, new_vel)
+
+        # clamp_magnitude(speed_limit)
+        clamp = self.speed_limit[:n] / np.maximum(np.sqrt(np.einsum("ij,ij->i", new_vel, new_vel)), 1e-12)
+        new_pos = pos + new_vel * (np.minimum(clamp, 1) * steps)[:, None]
+
+        friction_factor = np.where(self.is_clone[:n] != 0, 1.0, self.friction ** steps)
+        new_vel = (new_vel + self.acceleration[:n] * steps) * friction_factor[:, None]
+        new_vel[np.einsum("ij,ij->i", new_vel, new_vel) < 0.01 ** 2] = 0
+
+        if len(self.free_rows) == 0 and not self.hidden[:n].any():
+            pos[:] = new_pos
+            vel[:] = new_vel
+        else:
+            np.copyto(pos, new_pos, where=active[:, None])
+            np.copyto(vel, new_vel, where=active[:, None])
+
+    def update_rows(self, dt: float, void_dim: tuple[float, float, float, float], coins: CoinField, rows: list[int]):
+        # update() one row at a time in plain floats, for a handful of bodies
+        if coins:
+            self.pickup_rows(rows, coins)
+
+        top, bottom, left, right = void_dim
+        steps = dt * 60 * 2
+        friction = self.friction ** steps
+
+        for row in rows:
+            x, y = self.pos[row].tolist()
+            vx, vy = self.velocity[row].tolist()
+            ax, ay = self.acceleration[row].tolist()
+            size = float(self.size[row])
+
+            # bounce off the voids, the near side wins when a body is wider than the arena like in update()
+            if x - size < left:
+                vx = abs(vx)
+            elif x + size > right:
+                vx = -abs(vx)
+            if y - size < bottom:
+                vy = abs(vy)
+            elif y + size > top:
+                vy = -abs(vy)
+
+            clamp = float(self.speed_limit[row]) / max(math.sqrt(vx * vx + vy * vy), 1e-12)
+            move = min(clamp, 1) * steps
+            self.pos[row] = (x + vx * move, y + vy * move)
+
+            factor = 1.0 if self.is_clone[row] else friction
+            vx, vy = (vx + ax * steps) * factor, (vy + ay * steps) * factor
+            if vx * vx + vy * vy < 0.01 ** 2:
+                vx = vy = 0.0
+            self.velocity[row] = (vx, vy)
+
+    def pickup_rows(self, rows: list[int], coins: CoinField):
+        # pickup_coins() pair by pair in plain floats
+        players = [row for row in rows if self.is_player[row] and not self.is_clone[row]]
+        if len(players) * len(coins) > SCALAR_LIMIT:
+            active = np.zeros(self.count, dtype=bool)
+            active[rows] = True
+            self.pickup_coins(active, coins)
+            return
+
+        # the first player in row order gets a coin both of them touch
+        reaches = [(*self.pos[row].tolist(), float(self.size[row]) + COIN_SIZE) for row in players]
+        taken: list[int] = []
+        owners: list[int] = []
+        for coin, (x, y) in enumerate(coins.positions.tolist()):
+            for player, (px, py, reach) in enumerate(reaches):
+                dx, dy = x - px, y - py
+                if dx * dx + dy * dy < reach * reach:
+                    taken.append(coin)
+                    owners.append(player)
+                    break
+        if not taken:
+            return
+
+        for player in sorted(owners):
+            self.bus.post(SimEvent(userevents.COIN_PICKUP, player=int(self.ids[players[player]])))
+
+        coins.remove_many(taken)
+
+    def pickup_coins(self, active: np.ndarray, coins: CoinField):
+        players = np.flatnonzero(active & self.is_player[:self.count] & (self.is_clone[:self.count] == 0))
+        if len(players) == 0 or len(coins) == 0:
+            return
+
+        reach = self.size[players] + COIN_SIZE
+        if len(players) * len(coins) <= GRID_PAIRS:
+            # two players and a few coins, checking every pair at once is cheaper than asking the grid
+            diff = coins.positions[None, :, :] - self.pos[players][:, None, :]
+            hits = np.einsum("pcj,pcj->pc", diff, diff) < (reach * reach)[:, None]
+            if not hits.any():
+                return
+
+            # the first player in row order gets a coin both of them touch
+            coin = np.flatnonzero(hits.any(axis=0))
+            owner = hits[:, coin].argmax(axis=0)
+        else:
+            query, coin = coins.index().candidates(self.pos[players], reach.max())
+            diff = coins.pos[coin] - self.pos[players[query]]
+            hits = np.einsum("ij,ij->i", diff, diff) < reach[query] ** 2
+            if not hits.any():
+                return
+
+            # pairs are grouped by player in row order, so the first player gets a coin both of them touch
+            coin, first = np.unique(coin[hits], return_index=True)
+            owner = query[hits][first]
+
+        for player in np.sort(owner):
+            self.bus.post(SimEvent(userevents.COIN_PICKUP, player=int(self.ids[players[player]])))
+
+        coins.remove_many(coin)
 
 class Body:
+    # thin view over one row of a PhysicsWorld
 
-    def __init__(self, id: int, is_player: bool, color: pygame.Color, pos: Vector2, velocity: Vector2, size: int = SIZE, mass: float = MASS, is_clone: int = 0, hidden: bool = False) -> None:
+    def __init__(self, id: int, is_player: bool, color: pygame.Color, pos: Vector2, velocity: Vector2, size: int = SIZE, mass: float = MASS, is_clone: int = 0, hidden: bool = False, *, world: PhysicsWorld) -> None:
 
-        self.id: int = id
+        self.world: PhysicsWorld = world
+        self.row: int = self.world.add(self)
 
-        self.is_player: bool = is_player
+        self.world.ids[self.row] = id
+        self.world.is_player[self.row] = is_player
         self.color: pygame.Color = color
         self.size: int = size
         self.mass: float = mass
-        self.pos: Vector2 = pos
+        self.pos = pos
 
-        self.velocity: Vector2 = velocity
-        self.acceleration: Vector2 = Vector2(0, 0)
+        self.velocity = velocity
+        self.acceleration = (0, 0)
 
         self.speed_limit: int = SPEED_LIMIT if is_player else BALL_SPEED_LIMIT
 
@@ -43,31 +519,122 @@ class Body:
 
         self.glow = False
 
+    @property
+    def id(self) -> int:
+        return int(self.world.ids[self.row])
+
+    @property
+    def is_player(self) -> bool:
+        return bool(self.world.is_player[self.row])
+
+    @property
+    def pos(self) -> RowVector:
+        return RowVector(self.world, "pos", self.row)
+
+    @pos.setter
+    def pos(self, val):
+        # assigning a position is a teleport, so there is nothing to interpolate from
+        self.world.pos[self.row] = self.world.prev_pos[self.row] = tuple(val)
+
+    @property
+    def velocity(self) -> RowVector:
+        return RowVector(self.world, "velocity", self.row)
+
+    @velocity.setter
+    def velocity(self, val):
+        self.world.velocity[self.row] = tuple(val)
+
+    @property
+    def acceleration(self) -> RowVector:
+        return RowVector(self.world, "acceleration", self.row)
+
+    @acceleration.setter
+    def acceleration(self, val):
+        self.world.acceleration[self.row] = tuple(val)
+
+    @property
+    def color(self) -> pygame.Color:
+        return pygame.Color(*self.world.color[self.row].tolist())
+
+    @color.setter
+    def color(self, val):
+        self.world.color[self.row] = tuple(pygame.Color(val))
+
+    @property
+    def size(self) -> float:
+        return float(self.world.size[self.row])
+
+    @size.setter
+    def size(self, val: float):
+        self.world.size[self.row] = val
+
+    @property
+    def mass(self) -> float:
+        return float(self.world.mass[self.row])
+
+    @mass.setter
+    def mass(self, val: float):
+        self.world.mass[self.row] = val
+
+    @property
+    def speed_limit(self) -> float:
+        return float(self.world.speed_limit[self.row])
+
+    @speed_limit.setter
+    def speed_limit(self, val: float):
+        self.world.speed_limit[self.row] = val
+
+    @property
+    def is_clone(self) -> int:
+        return int(self.world.is_clone[self.row])
+
+    @is_clone.setter
+    def is_clone(self, val: int):
+        self.world.is_clone[self.row] = val
+
+    @property
+    def hidden(self) -> bool:
+        return bool(self.world.hidden[self.row])
+
+    @hidden.setter
+    def hidden(self, val: bool):
+        self.world.hidden[self.row] = val
+        self.world.active = None
+
+    @property
+    def alive(self) -> bool:
+        return self.world.bodies[self.row] is self
+
+    def release(self):
+        # give the row back to the world, the body must not be used afterwards
+        self.world.remove(self.row)
+
     @staticmethod
-    def random_pos(pos_limit: tuple[float, float, float, float]) -> tuple[float, float]:
-        return random.randint(int(pos_limit[0]), int(pos_limit[2])), random.randint(int(pos_limit[3]), int(pos_limit[1]))
+    def random_pos(pos_limit: tuple[float, float, float, float], rng: random.Random) -> tuple[float, float]:
+        return rng.randint(int(pos_limit[0]), int(pos_limit[2])), rng.randint(int(pos_limit[3]), int(pos_limit[1]))
 
-    def create_clone(self, id: int, pos_limit: tuple[float, float, float, float]) -> 'Body':
+    def create_clone(self, id: int, pos_limit: tuple[float, float, float, float], rng: random.Random) -> 'Body':
         #pos_limit: (left, top, right, down)
 
         new_bod = Body(
                     id=id,
                     is_player=True,
                     color=self.color,
-                    pos=Vector2(self.random_pos(pos_limit)),
-                    velocity=Vector2(random.randint(-10, 10), random.randint(-10, 10)),
-                    size=random.randint(10, 30),
-                    mass=random.randint(50, 1500),
+                    pos=Vector2(self.random_pos(pos_limit, rng)),
+                    velocity=Vector2(rng.randint(-10, 10), rng.randint(-10, 10)),
+                    size=rng.randint(10, 30),
+                    mass=rng.randint(50, 1500),
                     is_clone=self.id,
-                    hidden=False
+                    hidden=False,
+                    world=self.world
                     )
         new_bod.speed_limit = 50
         return new_bod
 
     def reset(self, center: tuple[float, float]):
-        self.pos.x, self.pos.y = center
-        self.acceleration.x, self.acceleration.y = 0, 0
-        self.velocity.x, self.velocity.y = 0, 0
+        self.pos = center
+        self.acceleration = (0, 0)
+        self.velocity = (0, 0)
         self.hidden = False
         if self.is_player:
             self.size = SIZE
@@ -77,80 +644,7 @@ class Body:
             self.mass = abs(self.mass)
 
     def add_mouse_x(self, val: float):
-        self.acceleration.x += val
+        self.world.acceleration[self.row, 0] += val
 
     def add_mouse_y(self, val: float):
-        self.acceleration.y += val
-
-    def update(self, dt: float, void_dim: tuple[float, float, float, float], coins: list[Coin]):
-        # void dim: (self.top_void, self.bottom_void, self.left_void, self.right_void)
-
-        if self.hidden:
-            return
-        
-        if self.is_player and not self.is_clone:
-            coins_to_remove: list[Coin] = []
-            for coin in coins:
-                dist = self.pos.distance_to(coin.pos)
-                if dist < (self.size + 15):
-                    coins_to_remove.append(coin)
-                    pygame.event.post(pygame.event.Event(userevents.COIN_PICKUP, player=self.id))
-            
-            for coin in coins_to_remove:
-                if coin in coins:
-                    coins.remove(coin)
-
-        friction_factor = ((FRICTION ** (dt * 60 * 2)) * (not self.is_clone)) + bool(self.is_clone)
-
-        if (self.pos.y + self.size) > void_dim[0]:
-            self.velocity.y = abs(self.velocity.y) * -1
-        if (self.pos.y - self.size) < void_dim[1]:
-            self.velocity.y = abs(self.velocity.y)
-        if (self.pos.x - self.size) < void_dim[2]:
-            self.velocity.x = abs(self.velocity.x)
-        if (self.pos.x + self.size) > void_dim[3]:
-            self.velocity.x = abs(self.velocity.x) * -1
-
-        if not (self.velocity.x == 0 and self.velocity.y == 0):
-            self.pos += (self.velocity).clamp_magnitude(self.speed_limit) * (dt * 60 * 2)
-        
-        self.velocity += (self.acceleration) * (dt * 60 * 2)
-        self.velocity *= friction_factor
-
-        if self.velocity.magnitude() < 0.01:
-            self.velocity.x = 0
-            self.velocity.y = 0
-
-    def gravity_calc(self, all_bodies: list['Body']):
-
-        force: Vector2 = Vector2(0, 0)
-
-        for body in all_bodies:
-            if body.id == self.id:
-                continue
-            elif self.is_player or not body.is_player:
-                continue
-            elif body.hidden:
-                continue
-
-            # self is ball, body is player or clone
-
-            dist = self.pos.distance_to(body.pos)
-            if dist < (self.size + body.size):
-                # HANDLE COLLISION
-
-                dist = self.size + body.size
-
-                op_direction_norm = (-(body.pos - self.pos)).normalize()
-                self.pos = body.pos + (op_direction_norm * (dist))
-
-                self.velocity = self.velocity.reflect(op_direction_norm) * (1 - BOUNCE_DAMP)
-
-                if body.is_clone:
-                    pygame.event.post(pygame.event.Event(userevents.POWER_UP_QUANTUM_COLLAPSE, random_body=body))
-
-            elif dist > (self.size + body.size) :
-                # GRAVITY
-                force += ((G * self.mass * body.mass)/( (dist**2) )) * (body.pos - self.pos).normalize()
-
-        self.acceleration = ((1 - GRAV_DAMP) * force)/self.mass
\ No newline at end of file
+        self.world.acceleration[self.row, 1] += val
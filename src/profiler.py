@@ -0,0 +1,102 @@
+import pygame, json, time
+import numpy as np
+from pathlib import Path
+
+# frame phases in the order they happen, every lap() books the time since the previous one
+PHASES = ("events", "evaluate", "gravity", "integrate", "rules", "draw_world", "draw_minimap", "draw_hud", "draw_menu", "upload", "render", "flip", "wait")
+
+class FrameProfiler:
+    # per phase wall times of the last `capacity` frames, kept in a numpy ring buffer (ms, last column is the whole frame)
+
+    def __init__(self, phases: tuple[str, ...] = PHASES, capacity: int = 1024) -> None:
+        self.phases = phases
+        self.columns = {name: i for i, name in enumerate(phases)}
+        self.samples = np.zeros((capacity, len(phases) + 1))
+        self.current = np.zeros(len(phases) + 1)
+        self.frames = 0 # frames recorded since the session started, the ring holds the last `capacity` of them
+
+        self.frame_start = time.perf_counter()
+        self.last_lap = self.frame_start
+
+        self.show_overlay = False
+        self.overlay: pygame.Surface|None = None
+        self.overlay_age = 0.0
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.current[self.columns[phase]] += (now - self.last_lap) * 1000
+        self.last_lap = now
+
+    def end_frame(self):
+        now = time.perf_counter()
+        self.current[-1] = (now - self.frame_start) * 1000
+        self.samples[self.frames % len(self.samples)] = self.current
+        self.frames += 1
+
+        self.current[:] = 0
+        self.frame_start = self.last_lap = now
+
+    def recorded(self) -> np.ndarray:
+        # the rows in the ring, oldest first
+        if self.frames <= len(self.samples):
+            return self.samples[:self.frames]
+        return np.roll(self.samples, -(self.frames % len(self.samples)), axis=0)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        rows = self.recorded()
+        if len(rows) == 0:
+            return {}
+
+        p50, p95, p99 = np.percentile(rows, (50, 95, 99), axis=0)
+        mean = rows.mean(axis=0)
+        return {
+            name: {"mean": round(float(mean[i]), 3), "p50": round(float(p50[i]), 3), "p95": round(float(p95[i]), 3), "p99": round(float(p99[i]), 3)}
+            for i, name in enumerate(self.phases + ("frame",))
+        }
+
+    def export(self, path: Path):
+        # .json -> summary and every frame, anything else -> csv of every frame
+        rows = self.recorded()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.suffix == ".json":
+            with open(path, "w") as export:
+                export.write(json.dumps({"frames": self.frames, "summary": self.summary(), "columns": list(self.phases) + ["frame"], "samples": np.round(rows, 4).tolist()}))
+        else:
+            np.savetxt(path, rows, fmt="%.4f", delimiter=",", header=",".join(self.phases + ("frame",)), comments="")
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self.overlay = None
+
+    def draw_overlay(self, display: pygame.Surface, font: pygame.font.Font, dt: float):
+        if not self.show_overlay:
+            return
+
+        # percentiles over the whole ring are not free, the text is rebuilt a few times a second
+        self.overlay_age += dt
+        if self.overlay is None or self.overlay_age >= 0.25:
+            self.overlay_age = 0.0
+            self.overlay = self.render_overlay(font)
+
+        display.blit(self.overlay, (10, 10))
+
+    def render_overlay(self, font: pygame.font.Font) -> pygame.Surface:
+        stats = self.summary()
+        if not stats:
+            lines = ["no frames yet"]
+        else:
+            frame = stats["frame"]
+            lines = [f"frame  p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  p99 {frame['p99']:.2f} ms"]
+            lines += [f"{name:<13} {stats[name]['mean']:6.2f} ms" for name in self.phases]
+
+        texts = [font.render(line, True, (255, 255, 255)) for line in lines]
+        overlay = pygame.Surface((max(text.get_width() for text in texts) + 20, sum(text.get_height() for text in texts) + 20))
+        overlay.fill((0, 0, 0))
+        overlay.set_alpha(200)
+
+        y = 10
+        for text in texts:
+            overlay.blit(text, (10, y))
+            y += text.get_height()
+        return overlay
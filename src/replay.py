@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# Match recordings: the seed, the settings the match was made with and every key it got, stamped with the physics step.
+# A match only depends on those, so feeding the keys back in at the same steps plays the same match again.
+#   uv run src/replay.py match.gbr              headless, as fast as the CPU allows
+#   uv run src/main.py --replay match.gbr       in the game window, in real time
+import os
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+
+import pygame, json, struct, time, argparse
+from pathlib import Path
+from typing import NamedTuple
+from match import Match
+from gravity import THETA
+from stepper import FixedStepper, DEFAULT_HZ
+
+MAGIC = b"GBRP"
+VERSION = 2 # 2: gravity cubes distances by multiplying, version 1 recordings drift
+HEADER = struct.Struct("<4sBqI") # magic, version, seed, length of the json settings that follow
+
+# every key a match reacts to, an input is stored as one byte: index into KEYS, high bit set for down
+KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_LSHIFT, pygame.K_RSHIFT)
+KEY_INDEX = {key: i for i, key in enumerate(KEYS)}
+END = 0x7F # marks the last record, its step is where the recording stopped
+
+class ReplayInput(NamedTuple):
+    step: int # applied right before this physics step
+    key: int
+    down: bool
+
+class Replay:
+    def __init__(self, seed: int, config: dict[str, str|list[int]|int|float]) -> None:
+        # config: the settings the simulation depends on (game_time, physics_hz, gravity_solver, theta)
+        self.seed = seed
+        self.config = config
+        self.inputs: list[ReplayInput] = []
+        self.steps = 0 # length of the recording in physics steps, set when it stops
+
+    def record(self, step: int, key: int, down: bool):
+        if key in KEY_INDEX:
+            self.inputs.append(ReplayInput(step, key, down))
+
+    def to_bytes(self) -> bytes:
+        settings = json.dumps(self.config, separators=(",", ":")).encode()
+        data = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, len(settings)))
+        data += settings
+
+        # step deltas as varints, so a few inputs per second cost about two bytes each
+        last = 0
+        for step, key, down in self.inputs:
+            write_varint(data, step - last)
+            data.append(KEY_INDEX[key] | (0x80 if down else 0))
+            last = step
+        write_varint(data, self.steps - last)
+        data.append(END)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        magic, version, seed, length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} GravBall replay")
+
+        offset = HEADER.size
+        replay = cls(seed, json.loads(data[offset:offset + length]))
+        offset += length
+
+        step = 0
+        while True:
+            delta, offset = read_varint(data, offset)
+            step += delta
+            code = data[offset]
+            offset += 1
+            if code == END:
+                replay.steps = step
+                return replay
+            replay.inputs.append(ReplayInput(step, KEYS[code & 0x7F], bool(code & 0x80)))
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as replay:
+            replay.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Path) -> 'Replay':
+        with open(path, "rb") as replay:
+            return cls.from_bytes(replay.read())
+
+    def new_match(self, **colors: pygame.Color) -> Match:
+        # left_color / right_color can be passed, they are the only settings that don't change how the match plays out
+        return Match(self.config["game_time"], gravity_solver=self.config.get("gravity_solver", "direct"), theta=self.config.get("theta", THETA), seed=self.seed, **colors)
+
+class Playback:
+    # hands a match the recorded keys as its step count reaches them
+    def __init__(self, replay: Replay) -> None:
+        self.replay = replay
+        self.next_input = 0
+
+    def due(self, step: int) -> list[ReplayInput]:
+        inputs = self.replay.inputs
+        start = self.next_input
+        while self.next_input < len(inputs) and inputs[self.next_input].step <= step:
+            self.next_input += 1
+        return inputs[start:self.next_input]
+
+    @property
+    def finished(self) -> bool:
+        return self.next_input >= len(self.replay.inputs)
+
+def write_varint(data: bytearray, value: int):
+    while value >= 0x80:
+        data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    data.append(value)
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def play(replay: Replay) -> Match:
+    # the whole recording, headless and without waiting on anything
+    match = replay.new_match()
+    dt = FixedStepper(replay.config.get("physics_hz", DEFAULT_HZ)).dt
+    playback = Playback(replay)
+
+    while match.steps < replay.steps and not match.gameplay.winner:
+        for step, key, down in playback.due(match.steps):
+            if down:
+                match.key_down(key)
+            else:
+                match.key_up(key)
+        match.step(dt)
+
+    return match
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play a recorded GravBall match headless, faster than real time")
+    parser.add_argument("replay", type=Path)
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    start = time.perf_counter()
+    match = play(replay)
+    wall = time.perf_counter() - start
+
+    print(json.dumps({
+        "seed": replay.seed,
+        "inputs": len(replay.inputs),
+        "steps": match.steps,
+        "winner": match.gameplay.winner,
+        "left_score": match.gameplay.left_score,
+        "right_score": match.gameplay.right_score,
+        "wall_time": round(wall, 3),
+        "speedup": round(match.time / wall, 1)
+    }))
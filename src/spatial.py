@@ -0,0 +1,50 @@
+import numpy as np
+
+CELL_SIZE = 128
+
+class SpatialGrid:
+    # uniform grid over the arena, points are bucketed per cell with a counting sort so a lookup only visits
+    # the few cells around it instead of every point. points outside the bounds land in the edge cells
+
+    def __init__(self, bounds: tuple[float, float, float, float], cell_size: float = CELL_SIZE) -> None:
+        #bounds: (left, bottom, right, top)
+        self.left, self.bottom = bounds[0], bounds[1]
+        self.cell_size = cell_size
+        self.cols = max(1, int(np.ceil((bounds[2] - bounds[0]) / cell_size)))
+        self.rows = max(1, int(np.ceil((bounds[3] - bounds[1]) / cell_size)))
+
+        self.order = np.zeros(0, dtype=np.int64) # point indices sorted by cell
+        self.starts = np.zeros(self.cols * self.rows + 1, dtype=np.int64) # cell c holds order[starts[c]:starts[c + 1]]
+
+    def cells(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        col = ((points[:, 0] - self.left) // self.cell_size).astype(np.int64)
+        row = ((points[:, 1] - self.bottom) // self.cell_size).astype(np.int64)
+        return np.clip(col, 0, self.cols - 1), np.clip(row, 0, self.rows - 1)
+
+    def build(self, points: np.ndarray):
+        col, row = self.cells(points)
+        cell = row * self.cols + col
+        self.order = np.argsort(cell, kind="stable")
+        self.starts[1:] = np.cumsum(np.bincount(cell, minlength=self.cols * self.rows))
+
+    def candidates(self, points: np.ndarray, radius: float) -> tuple[np.ndarray, np.ndarray]:
+        # (query, point) index pairs for every indexed point in a cell within `radius` of a query point
+        # a superset of the real hits, callers still check the distance. pairs come out grouped by query, ascending
+        reach = int(np.ceil(radius / self.cell_size))
+        offsets = np.arange(-reach, reach + 1)
+        col, row = self.cells(points)
+
+        cols = col[:, None] + offsets
+        rows = row[:, None] + offsets
+        valid = ((rows >= 0) & (rows < self.rows))[:, :, None] & ((cols >= 0) & (cols < self.cols))[:, None, :]
+        cell = np.where(valid, rows[:, :, None] * self.cols + cols[:, None, :], 0).reshape(len(points), -1)
+
+        first = self.starts[cell]
+        count = np.where(valid.reshape(len(points), -1), self.starts[cell + 1] - first, 0)
+
+        # expand every (query, cell) run into one slot per point in that cell
+        count, first = count.ravel(), first.ravel()
+        total = int(count.sum())
+        query = np.repeat(np.repeat(np.arange(len(points)), cell.shape[1]), count)
+        slot = np.repeat(first - (np.cumsum(count) - count), count) + np.arange(total)
+        return query, self.order[slot]
@@ -0,0 +1,40 @@
+MIN_HZ = 60
+MAX_HZ = 240
+DEFAULT_HZ = 120
+
+class FixedStepper:
+    # accumulates real frame time and hands it out as whole physics steps of a fixed length
+    # alpha is how far the renderer is between the last two physics states (0 -> previous, 1 -> current)
+
+    def __init__(self, hz: int = DEFAULT_HZ, max_steps: int = 8) -> None:
+        self.hz: int = max(MIN_HZ, min(MAX_HZ, hz))
+        self.dt: float = 1 / self.hz
+        self.max_steps: int = max_steps
+
+        self.accumulator: float = 0.0
+        self.alpha: float = 0.0
+        self.steps: int = 0 # total steps taken, used as the simulation clock
+
+    def advance(self, frame_dt: float) -> int:
+        self.accumulator += frame_dt
+
+        steps = int(self.accumulator // self.dt)
+        if steps > self.max_steps:
+            # fell too far behind (window drag, breakpoint...), drop the backlog instead of spiralling
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+
+        self.alpha = self.accumulator / self.dt
+        self.steps += steps
+        return steps
+
+    @property
+    def time(self) -> float:
+        return self.steps * self.dt
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.steps = 0
@@ -7,4 +7,5 @@ POWER_UP_DESTROY_EVENT = pygame.USEREVENT + 4
 POWER_UP_QUANTUM_COLLAPSE = pygame.USEREVENT + 5
 POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_LEFT = pygame.USEREVENT + 6
 POWER_UP_QUANTUM_COLLAPSE_STOP_GLOW_RIGHT = pygame.USEREVENT + 7
-COIN_PICKUP = pygame.USEREVENT + 8
\ No newline at end of file
+COIN_PICKUP = pygame.USEREVENT + 8
+POWER_UP_QUANTUM_COLLAPSED = pygame.USEREVENT + 9
\ No newline at end of file